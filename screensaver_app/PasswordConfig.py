@@ -18,10 +18,14 @@ if parent_dir not in sys.path:
 from screensaver_app.central_logger import get_logger, log_startup, log_shutdown, log_exception
 logger = get_logger('PasswordConfig')
 
-from utils.config_utils import find_user_config_path, load_config, save_config
+from utils.config_utils import config_store, find_user_config_path, load_config, save_config
+from utils.playback_state import playback_state
 DEFAULT_PASSWORD = "1234"
 DEFAULT_USERNAME = "User" # Default for creating a new config if none exists
 from utils.wallpaper import set_windows_wallpaper
+from utils.image_export import image_exporter, export_extension, DEFAULT_FORMAT as DEFAULT_EXPORT_FORMAT
+from utils.keyframe_index import keyframe_at_or_before
+from utils.glass_blur import glass_blur
 
 def verify_password(username_attempt, password_attempt):
     """Verify if the given username and password are correct."""
@@ -266,38 +270,41 @@ def verify_password_dialog_macos(root, video_clock_screensaver=None):
             VideoClockScreenSaver.pause_video(video_clock_screensaver)
             # 2. Get current timestamp from the frame reader thread
             timestamp = VideoClockScreenSaver.get_current_time_seconds(video_clock_screensaver)
-            # 3. Save timestamp to config
-            config = load_config()
-            config['last_video_timestamp'] = timestamp if timestamp else 0
-            save_config(config)
+            # 3. Save timestamp to the playback state file (written by its flusher thread)
+            if timestamp and config_store.get_bool('snap_resume_to_keyframe', False):
+                timestamp = keyframe_at_or_before(video_clock_screensaver.video_path, timestamp)
+            playback_state.set('last_video_timestamp', timestamp if timestamp else 0, urgent=True)
 
             # 4. Take screenshot of the RAW frame (no UI) and set as lock screen
-            raw_frame_pil = getattr(video_clock_screensaver, 'last_raw_frame', None)
-            if raw_frame_pil:
-                from PIL import Image, ImageFilter, ImageTk
-                import tempfile
-                
-                # Save the clean raw frame to a temp file for the lock screen
-                temp_path = os.path.join(tempfile.gettempdir(), "screensaver_lock_screen.png")
-                # Save screenshot to temp file
-                # Determine the directory of PhotoEngine.py or PhotoEngine.exe
-                if getattr(sys, 'frozen', False):
-                    # Running as PyInstaller EXE
-                    engine_dir = os.path.dirname(sys.executable)
-                else:
-                    # Running as script
-                    engine_dir = os.path.dirname(os.path.abspath(__file__))
-                temp_path = os.path.join(engine_dir, "screensaver_lock_screen.png")
-                raw_frame_pil.save(temp_path, format="PNG")
-                set_windows_wallpaper(temp_path)
+            frame_ring = getattr(video_clock_screensaver, 'frame_ring', None)
+            raw_frame = frame_ring.borrow_latest() if frame_ring else None
+            if raw_frame:
+                handed_off = False
+                try:
+                    # Save the clean raw frame for the lock screen
+                    # Determine the directory of PhotoEngine.py or PhotoEngine.exe
+                    if getattr(sys, 'frozen', False):
+                        # Running as PyInstaller EXE
+                        engine_dir = os.path.dirname(sys.executable)
+                    else:
+                        # Running as script
+                        engine_dir = os.path.dirname(os.path.abspath(__file__))
+                    export_format = config_store.get_str('image_export_format', DEFAULT_EXPORT_FORMAT)
+                    temp_path = os.path.join(engine_dir, "screensaver_lock_screen" + export_extension(export_format))
+                    # Encoded on the export worker so the login dialog opens immediately
+                    # The lease keeps the ring slot from being overwritten until the export has read it
+                    image_exporter.save_image(raw_frame.image, temp_path, fmt=export_format,
+                                              on_done=set_windows_wallpaper, release=raw_frame.release)
+                    handed_off = True
+                finally:
+                    if not handed_off:
+                        raw_frame.release()  # Otherwise the exporter releases it
 
             # 5. Take screenshot of the PROCESSED frame (with UI), apply blur, and update display
             processed_frame_pil = getattr(video_clock_screensaver, 'last_processed_frame', None)
             if processed_frame_pil:
-                from PIL import Image, ImageFilter, ImageTk
-                
-                # Apply a glassy blur effect
-                blurred_frame = processed_frame_pil.filter(ImageFilter.GaussianBlur(radius=15))
+                # Apply a glassy blur effect (computed at reduced resolution)
+                blurred_frame = glass_blur(processed_frame_pil, radius=15)
                 
                 # Update the screensaver display with the blurred frame
                 if video_clock_screensaver.label.winfo_exists():
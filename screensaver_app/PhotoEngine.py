@@ -1,13 +1,5 @@
-import logging
-import signal
-import tkinter as tk
-import argparse
 import os
-import platform 
 import sys
-import subprocess # Added for service registration
-import threading
-import time
 
 # Ensure parent directory is in sys.path for package imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -15,12 +7,35 @@ parent_dir = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-from screensaver_app.central_logger import get_logger, log_startup, log_shutdown, log_exception
+# Installed first so that --import-report sees every import below
+from utils.import_report import profiler as import_profiler
+from utils.startup_trace import trace as startup_trace
+startup_trace.begin('imports')
+
+import logging
+import signal
+import tkinter as tk
+import argparse
+import platform 
+import subprocess # Added for service registration
+import threading
+import time
+
+from screensaver_app.central_logger import get_logger, log_startup, log_shutdown, log_exception, flush_logs
+from utils.lazy_import import lazy_import
+from utils.hot_standby import HotStandby, DEFAULT_MEMORY_BUDGET_MB, DEFAULT_MIN_AVAILABLE_MB
 
+# Heavy subsystems (VLC, PyQt5, widget dependencies, the GUI) are only loaded when first used,
+# so the tray process starts without them
+video_player = lazy_import('screensaver_app.video_player')
+password_config = lazy_import('screensaver_app.PasswordConfig')
+screensaver_service = lazy_import('screensaver_app.screensaver_service')
+gui = lazy_import('screensaver_app.gui')
   # --- Live Wallpaper Tray Actions ---
-from screensaver_app.live_wallpaper.live_wallpaper_pyqt import LiveWallpaperController
+live_wallpaper = lazy_import('screensaver_app.live_wallpaper.live_wallpaper_pyqt')
 
 logger = get_logger('PhotoEngine')
+poll_logger = get_logger('PhotoEngine.poll')  # Rate-limited: call sites that run in loops or timers
 
 from utils.app_utils import acquire_lock, force_acquire_lock, release_lock, handle_exit_signal
 
@@ -29,6 +44,8 @@ from utils.app_utils import acquire_lock, force_acquire_lock, release_lock, hand
 # Parse arguments safely
 parser = argparse.ArgumentParser(add_help=False)
 parser.add_argument('--mode', choices=['saver', 'gui'], default='saver')
+parser.add_argument('--trace-startup', action='store_true')
+parser.add_argument('--import-report', action='store_true')
 args, ukArgs = parser.parse_known_args()
 logger.info(f"Parsed arguments: {args}, Unknown arguments: {ukArgs}")
 restart = False
@@ -40,7 +57,9 @@ if len(ukArgs) != 0 and ukArgs[0] == "setup":
     setup = True
     logger.info("Setup mode detected, skipping lock acquisition")
 if not restart and not setup and args.mode != "gui":
-    if not acquire_lock():
+    with startup_trace.phase('acquire_lock'):
+        lock_acquired = acquire_lock()
+    if not lock_acquired:
         logger.warning("Another instance of PhotoEngine is already running. Exiting this instance.")
         sys.exit(1)
         
@@ -49,27 +68,33 @@ signal.signal(signal.SIGTERM, handle_exit_signal)
 
 logging.getLogger("PIL.Image").setLevel(logging.WARNING)
 
-from screensaver_app.video_player import VideoClockScreenSaver 
-from screensaver_app.PasswordConfig import verify_password_dialog_macos
-from screensaver_app.screensaver_service import launch_in_user_session
-# Try to import enhanced blocker first, fallback to basic blocker
-try:
-    from utils.enhanced_key_blocker import EnhancedKeyBlocker as KeyBlocker
-    logger.info("Using enhanced key blocker")
-except ImportError:
-    from utils.blockit import KeyBlocker # Assuming blockit.py contains a basic KeyBlocker
-    logger.info("Using basic key blocker from blockit.py")
-import screensaver_app.gui as gui
+_key_blocker_class = None
+
+def get_key_blocker_class():
+    """Import the key blocker on first use: enhanced blocker first, fallback to basic blocker."""
+    global _key_blocker_class
+    if _key_blocker_class is None:
+        try:
+            from utils.enhanced_key_blocker import EnhancedKeyBlocker as KeyBlocker
+            logger.info("Using enhanced key blocker")
+        except ImportError:
+            from utils.blockit import KeyBlocker # Assuming blockit.py contains a basic KeyBlocker
+            logger.info("Using basic key blocker from blockit.py")
+        _key_blocker_class = KeyBlocker
+    return _key_blocker_class
+
 import json
 from PIL import Image, ImageDraw # Added for system tray icon
 import pystray # Added for system tray functionality
-from utils.config_utils import find_user_config_path, update_config
+from utils.config_utils import config_store, update_config
+from utils.playback_state import playback_state
 from screensaver_app.ServiceReg import ServiceRegistrar
 from utils.multi_monitor import update_secondary_monitor_blackouts
+startup_trace.end('imports')
 # Custom UAC elevation functions to replace pyUAC
 def is_admin():
     """Check if the current process is running with admin privileges."""
-    logger.info("is_admin")
+    poll_logger.info("is_admin")
     if platform.system() != "Windows":
         return False
     try:
@@ -128,6 +153,9 @@ root_ref_for_hook = None # Global reference to the root window for the hook call
 tray_running = False
 win_s_blocker = None
 tray_icon_instance = None
+hot_standby = None
+WALLPAPER_START_TIMEOUT_S = 30.0  # How long the hot standby waits for the live wallpaper before building
+WALLPAPER_SETTLE_S = 5.0  # Time for the wallpaper's decoder to reach its steady memory use
 ctrl_alt_del_tracker = {"triggered": False, "timestamp": None}
 
 # Define missing Windows constants
@@ -203,21 +231,13 @@ def WinEventProcCallback(hWinEventHook, event, hwnd, idObject, idChild, dwEventT
             root_ref_for_hook.after(50, lambda: update_secondary_monitor_blackouts(root_ref_for_hook)) # Small delay
 
 
-def start_screensaver(video_path_override=None): 
-    """Launch the full-screen screen saver directly"""
-    logger.info("start_screensaver")
-    global secondary_screen_windows, hWinEventHook, root_ref_for_hook, callback_ref
-    secondary_screen_windows = [] 
-    hWinEventHook = None
-    config = load_config()
-    
+def start_key_blocking(config):
+    """Start the screensaver key blocker if admin mode is enabled; returns it or None."""
     key_blocker = None
-    ctrl_alt_del_detector = None
-    
-    # Initialize key blocker if admin mode is enabled
     if config.get("run_as_admin", False):
+        startup_trace.begin('key_blocker')
         logger.info("Initializing enhanced key blocking...")
-        key_blocker = KeyBlocker(debug_print=True)
+        key_blocker = get_key_blocker_class()(debug_print=True)
         # Check if this is the enhanced blocker or basic blocker
         if hasattr(key_blocker, 'start_blocking'):
             # Enhanced blocker
@@ -237,14 +257,11 @@ def start_screensaver(video_path_override=None):
                 logger.info("Basic key blocking enabled successfully with Esc and Alt+Shift+Tab blocking.")
             else:
                 logger.warning("Some key blocking methods failed. Check permissions.")
-    
-    root = tk.Tk()
-    root_ref_for_hook = root # Store root for the callback
-    root.attributes('-fullscreen', True)
-    TRANSPARENT_KEY_FOR_LOGIN_TOPLEVEL = '#123456'
-    root.attributes('-transparentcolor', TRANSPARENT_KEY_FOR_LOGIN_TOPLEVEL)
-    root.configure(bg='black')
+        startup_trace.end('key_blocker')
+    return key_blocker
 
+def show_screensaver_root(root):
+    """Make the full-screen root visible, on top and focused."""
     # --- Ensure main window is visible and on top ---
     root.deiconify()  # Make sure it's not minimized
     root.lift()       # Bring to front
@@ -263,7 +280,46 @@ def start_screensaver(video_path_override=None):
     except Exception as e:
         logger.warning(f"Could not enforce topmost/focus for single monitor: {e}")
 
-    app = VideoClockScreenSaver(root, video_path_override, key_blocker_instance=key_blocker)
+def start_screensaver(video_path_override=None, standby=None): 
+    """Launch the full-screen screen saver directly.
+
+    With `standby` (a utils.hot_standby.HotStandby) the windows and player are built
+    hidden and stopped, and are only shown when the tray requests activation.
+    """
+    logger.info("start_screensaver")
+    global secondary_screen_windows, hWinEventHook, root_ref_for_hook, callback_ref
+    secondary_screen_windows = [] 
+    hWinEventHook = None
+    config = load_config()
+    
+    key_blocker = None
+    ctrl_alt_del_detector = None
+    
+    if standby is None:
+        startup_trace.mark('screensaver_activation')
+        # Initialize key blocker if admin mode is enabled
+        key_blocker = start_key_blocking(config)
+    else:
+        standby.warming(config)
+    
+    startup_trace.begin('tk_root')
+    root = tk.Tk()
+    root_ref_for_hook = root # Store root for the callback
+    if standby is not None:
+        root.withdraw()
+    root.attributes('-fullscreen', True)
+    TRANSPARENT_KEY_FOR_LOGIN_TOPLEVEL = '#123456'
+    root.attributes('-transparentcolor', TRANSPARENT_KEY_FOR_LOGIN_TOPLEVEL)
+    root.configure(bg='black')
+    if standby is None:
+        show_screensaver_root(root)
+    startup_trace.end('tk_root')
+
+    with startup_trace.phase('video_player_init'):
+        app = video_player.VideoClockScreenSaver(root, video_path_override, key_blocker_instance=key_blocker,
+                                                 standby=standby is not None)
+    if standby is None:
+        import_profiler.report('screensaver_ready')
 
     def on_escape(event):
         logger.info("on_escape")
@@ -271,7 +327,7 @@ def start_screensaver(video_path_override=None):
         if event:
             logger.info(f"Password dialog triggered by: {event.keysym if hasattr(event, 'keysym') else 'mouse click'}")
         # Pass app to password dialog for pause/screenshot/lockscreen
-        success = verify_password_dialog_macos(root, video_clock_screensaver=app)
+        success = password_config.verify_password_dialog_macos(root, video_clock_screensaver=app)
         if success: 
             app.close()
             if hWinEventHook: # Unhook before destroying windows
@@ -350,6 +406,8 @@ def start_screensaver(video_path_override=None):
 
                 logger.info("New tray process started, exiting current process.")
                 # Add a small delay to ensure the new process starts before we exit
+                playback_state.flush(timeout=1.0)
+                flush_logs()
                 time.sleep(1)
                 os._exit(0)
             except Exception as e:
@@ -357,7 +415,7 @@ def start_screensaver(video_path_override=None):
         else:
             logger.info("Password verification failed, resuming video")
             try:
-                VideoClockScreenSaver.resume_video(app)
+                video_player.VideoClockScreenSaver.resume_video(app)
                 # Resume focus management and restore focus
                 if hasattr(app, 'focus_management_active'):
                     app.focus_management_active = True
@@ -366,36 +424,62 @@ def start_screensaver(video_path_override=None):
             except Exception as e:
                 logger.error(f"Error resuming video after failed password verification: {e}")
 
-    # Initial call to black out monitors, delayed slightly for fullscreen to establish
-    if WINDOWS_MULTI_MONITOR_SUPPORT:
-        root.after(200, lambda: update_secondary_monitor_blackouts(root))
-        
-        # Set up the Windows event hook for display changes using ctypes directly
-        try:
-            # Convert Python callback to C callback
-            callback_ref = WinEventProcType(WinEventProcCallback)
+    def setup_display_hooks():
+        global hWinEventHook, callback_ref
+        # Initial call to black out monitors, delayed slightly for fullscreen to establish
+        if WINDOWS_MULTI_MONITOR_SUPPORT:
+            def initial_blackouts():
+                with startup_trace.phase('blackout_windows'):
+                    update_secondary_monitor_blackouts(root)
+            root.after(200, initial_blackouts)
             
-            hWinEventHook = SetWinEventHook(
-                EVENT_SYSTEM_DISPLAYSETTINGSCHANGED, # Event Min - using our defined constant
-                EVENT_SYSTEM_DISPLAYSETTINGSCHANGED, # Event Max - using our defined constant
-                0, # hmodWinEventProc
-                callback_ref, # Callback function
-                0, # idProcess
-                0, # idThread
-                win32con.WINEVENT_OUTOFCONTEXT | win32con.WINEVENT_SKIPOWNPROCESS
-            )            
-            if not hWinEventHook:
-                logger.warning("Failed to set event hook")
-        except Exception as e:
-            logger.error(f"Error setting up display change event hook: {e}")
-            hWinEventHook = None
-    
-    # Remove the old key bindings since VideoClockScreenSaver now handles them internally
-    # The app now handles key events internally through _on_key_event and _on_click_event
-    
-    # Make sure the root window can receive focus for key events
-    root.focus_set()
-    root.focus_force()
+            # Set up the Windows event hook for display changes using ctypes directly
+            try:
+                # Convert Python callback to C callback
+                callback_ref = WinEventProcType(WinEventProcCallback)
+                
+                hWinEventHook = SetWinEventHook(
+                    EVENT_SYSTEM_DISPLAYSETTINGSCHANGED, # Event Min - using our defined constant
+                    EVENT_SYSTEM_DISPLAYSETTINGSCHANGED, # Event Max - using our defined constant
+                    0, # hmodWinEventProc
+                    callback_ref, # Callback function
+                    0, # idProcess
+                    0, # idThread
+                    win32con.WINEVENT_OUTOFCONTEXT | win32con.WINEVENT_SKIPOWNPROCESS
+                )            
+                if not hWinEventHook:
+                    logger.warning("Failed to set event hook")
+            except Exception as e:
+                logger.error(f"Error setting up display change event hook: {e}")
+                hWinEventHook = None
+        
+        # Remove the old key bindings since VideoClockScreenSaver now handles them internally
+        # The app now handles key events internally through _on_key_event and _on_click_event
+        
+        # Make sure the root window can receive focus for key events
+        root.focus_set()
+        root.focus_force()
+
+    def activate_standby():
+        nonlocal key_blocker
+        startup_trace.mark('screensaver_activation')
+        key_blocker = start_key_blocking(config)
+        app.key_blocker_instance = key_blocker
+        show_screensaver_root(root)
+        app.activate()
+        setup_display_hooks()
+
+    def teardown_standby(reason):
+        global root_ref_for_hook
+        app.close(release_app_lock=False)
+        root_ref_for_hook = None
+        if root.winfo_exists():
+            root.destroy()
+
+    if standby is None:
+        setup_display_hooks()
+    else:
+        standby.attach(root, activate_standby, teardown_standby)
     
     # Ensure hook is unhooked if window is closed by other means (though less likely for fullscreen)
     def on_closing_main_window():
@@ -403,7 +487,7 @@ def start_screensaver(video_path_override=None):
         global secondary_screen_windows, hWinEventHook, root_ref_for_hook # Ensure all globals used are listed
         
         # Attempt to verify password before closing
-        success = verify_password_dialog_macos(root) # 'root' is from the outer scope
+        success = password_config.verify_password_dialog_macos(root) # 'root' is from the outer scope
         
         if success:
             if app: # 'app' is from the outer scope
@@ -457,10 +541,41 @@ def start_screensaver(video_path_override=None):
         if ctrl_alt_del_detector:
             ctrl_alt_del_detector.restart_pending = True
 
+def start_hot_standby(config):
+    """Build a hidden, stopped screensaver on its own thread so activation only has to show it."""
+    global hot_standby
+    standby = HotStandby(
+        memory_budget_mb=config.get("hot_standby_memory_budget_mb", DEFAULT_MEMORY_BUDGET_MB),
+        min_available_mb=config.get("hot_standby_min_available_mb", DEFAULT_MIN_AVAILABLE_MB),
+    )
+
+    def run_standby():
+        # The live wallpaper shares this process; let it start first so its memory
+        # is not counted as the standby's build cost
+        if config.get('enable_livewallpaper', False) and config.get('video_path'):
+            if live_wallpaper.LiveWallpaperController.playback_started.wait(timeout=WALLPAPER_START_TIMEOUT_S):
+                time.sleep(WALLPAPER_SETTLE_S)
+            else:
+                logger.warning("Live wallpaper did not start in time, building hot standby anyway")
+        while True:
+            try:
+                start_screensaver(standby=standby)
+            except Exception as e:
+                logger.error(f"Hot standby screensaver failed: {e}", exc_info=True)
+            finally:
+                standby.finished()
+            if not standby.wait_for_rearm():
+                break
+        logger.info(f"Hot standby thread exited (state: {standby.state})")
+
+    hot_standby = standby
+    threading.Thread(target=run_standby, name="HotStandby", daemon=True).start()
+    logger.info("Hot standby screensaver is being prepared")
+
 def load_config():
     """Load configuration from userconfig.json (using unified search logic)"""
     logger.info("load_config")
-    config_path = find_user_config_path()
+    config_path = config_store.path
     default_config = {
         "run_as_admin": False,
         "video_path": None, # Ensure other relevant defaults are present
@@ -468,13 +583,12 @@ def load_config():
     }
     try:
         if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                config_data = json.load(f)
-                # Ensure all default keys are present in the loaded config
-                for key, value in default_config.items():
-                    if key not in config_data:
-                        config_data[key] = value
-                return config_data
+            config_data = config_store.snapshot(defaults=False)
+            # Ensure all default keys are present in the loaded config
+            for key, value in default_config.items():
+                if key not in config_data:
+                    config_data[key] = value
+            return config_data
         else:
             logger.info(f"[PhotoEngine] Config file not found at {config_path}. Using defaults.")
             return default_config
@@ -558,6 +672,8 @@ def restart_application():
         stop_application()
         
         # Add a small delay to ensure the new process starts before we exit
+        playback_state.flush(timeout=1.0)
+        flush_logs()
         time.sleep(1)
         os._exit(0)
         
@@ -651,8 +767,15 @@ def run_in_system_tray():
                 # EnhancedKeyBlocker with internal python_blocker
                 win_s_blocker.python_blocker.disable_all_blocking()
         
-        # Start the screensaver normally
-        start_screensaver()
+        # Show the hot-standby screensaver if one is ready, otherwise start one from scratch
+        if hot_standby is not None and hot_standby.request_activation(load_config()):
+            hot_standby.wait_until_finished()
+        else:
+            try:
+                start_screensaver()
+            finally:
+                if hot_standby is not None:
+                    hot_standby.cold_start_finished()
           # After screensaver exits, restart Win+S detection
         logger.info("Screensaver closed. Returning to minimized mode...")
         start_win_s_detection()
@@ -769,7 +892,7 @@ def run_in_system_tray():
             if video_path:
                 logger.info(f"Starting live wallpaper with video path: {video_path}")
                 # Start live wallpaper in a new thread to avoid blocking the tray icon
-                threading.Thread(target=LiveWallpaperController.start_live_wallpaper, args=(video_path,), daemon=True).start()
+                threading.Thread(target=live_wallpaper.LiveWallpaperController.start_live_wallpaper, args=(video_path,), daemon=True).start()
         else:
             logger.warning("No video_path found in config for live wallpaper/ or is disabled.")
     
@@ -781,12 +904,12 @@ def run_in_system_tray():
         if video_path:
             logger.info(f"Starting live wallpaper with video path: {video_path}")
             # Start live wallpaper in a new thread to avoid blocking the tray icon
-            threading.Thread(target=LiveWallpaperController.start_live_wallpaper, args=(video_path,), daemon=True).start()
+            threading.Thread(target=live_wallpaper.LiveWallpaperController.start_live_wallpaper, args=(video_path,), daemon=True).start()
         else:
             logger.warning("No video_path found in config for live wallpaper/ or is disabled.")
 
     def on_stop_live_wallpaper(icon, item):
-        threading.Thread(target=LiveWallpaperController.stop_live_wallpaper, daemon=True).start()
+        threading.Thread(target=live_wallpaper.LiveWallpaperController.stop_live_wallpaper, daemon=True).start()
 
     # Create system tray menu with GUI option and live wallpaper controls
     if getattr(sys, 'frozen', False):
@@ -813,7 +936,11 @@ def run_in_system_tray():
 
     # Start Win+S detection
     start_win_s_detection()
+    tray_config = load_config()
+    if tray_config.get("hot_standby_enabled", False):
+        start_hot_standby(tray_config)
     logger.info("System tray mode active. Press Win+S to activate screensaver/lockscreen.")
+    import_profiler.report('tray_ready')
     icon.run()
     logger.info("Tray icon.run() has finished.")
 
@@ -882,6 +1009,8 @@ def admin_main():
     parser.add_argument('--start-service', action='store_true', help='Start the tray app in the active user session (for service use)')
     parser.add_argument('--no-elevate', action='store_true', help='Skip elevation check (internal flag)')
     parser.add_argument('--restart', action='store_true', help='Restart the application (used internally)')
+    parser.add_argument('--trace-startup', action='store_true', help='Write a Chrome trace of startup up to the first composited frame to the logs folder')
+    parser.add_argument('--import-report', action='store_true', help='Write an -X importtime style import report to the logs folder')
     args = parser.parse_args()
     logger.info(f"args: {args}")
     # Hide console window when running in minimized mode
@@ -901,7 +1030,7 @@ def admin_main():
                 python_exe = sys.executable
                 command = f'"{python_exe}" "{script_path}" --min'
                 try:
-                    launch_in_user_session(command)
+                    screensaver_service.launch_in_user_session(command)
                 except Exception as e:
                     logger.error(f"Failed to launch in user session: {e}")
             else:
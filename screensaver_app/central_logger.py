@@ -4,14 +4,268 @@ Central Logging Module for PhotoEngine Screensaver Application
 This module provides a centralized logging configuration that can be used
 across all modules in the application. It ensures consistent logging format,
 level control, and output handling.
+
+Loggers do not write files themselves: records are put on a bounded queue and
+a single listener thread formats them and writes the rotating log files and
+the console, so a log call on a hook callback, VLC event or the overlay loop
+costs a few microseconds. When LOG_QUEUE_SIZE records are waiting, records
+below WARNING are dropped (and counted in a later warning); WARNING and above
+are always queued. The queue is drained at exit (atexit) and by flush_logs(),
+which exit paths that bypass atexit (os._exit) call first.
+
+Loggers listed in DEFAULT_LOG_RATE_LIMITS (or the `log_rate_limits` config
+key) get a RateLimitFilter: each call site may log `burst` records per
+`period_sec`, further records are counted and dropped before they are queued
+or formatted, and the next record that passes carries the count in
+`record.suppressed`, which the log formatters append to the line.
+
+photoengine.log is written at `disk_log_level` (INFO by default). Records below
+that level are kept, unformatted, in a DebugRingHandler of the last
+`debug_ring_size` records, which is written to photoengine_errors.log ahead
+of each ERROR or CRITICAL record. Unhandled exceptions (main and other
+threads) are logged as CRITICAL, so they come with the same context.
 """
 
+import atexit
+import collections
 import logging
 import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 
+LOG_QUEUE_SIZE = 10000
+DEFAULT_DISK_LOG_LEVEL = 'INFO'
+DEBUG_RING_SIZE = 2000
+SERVICE_ROUTE = 'service'  # Records from the service logger go only to service.log
+# Logger name (as passed to get_logger) -> rate limit. Only the '.poll' child loggers that
+# call sites in loops and timers log through are limited; the component loggers are not.
+# Override or extend with {"log_rate_limits": {"Name": {"burst": 5, "period_sec": 60}}} in
+# userconfig.json; null for a name removes its limit.
+DEFAULT_LOG_RATE_LIMITS = {
+    'PhotoEngine.poll': {'burst': 5, 'period_sec': 300},  # is_admin
+    'VideoPlayer.poll': {'burst': 5, 'period_sec': 300},  # is_admin
+    'EnhancedKeyBlocker.poll': {'burst': 5, 'period_sec': 60},  # get_status, is_blocking_active, process checks
+    'MediaWidget.poll': {'burst': 5, 'period_sec': 60},  # Media detection loop
+}
+
+
+class LogPipeline:
+    """Bounded record queue plus the listener thread that writes the handlers."""
+
+    def __init__(self, handlers, routes=None, maxsize=LOG_QUEUE_SIZE):
+        # SimpleQueue: put() takes no condition lock, so callers never wait on the writer
+        self.queue = queue.SimpleQueue()
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._drop_lock = threading.Lock()
+        self.listener = _PipelineListener(self, handlers, routes or {})
+
+    def handler(self, route=None):
+        """A logging handler that feeds this pipeline (records are tagged with `route`)."""
+        return _PipelineHandler(self, route)
+
+    def start(self):
+        self.listener.start()
+
+    def submit(self, record):
+        if record.levelno < logging.WARNING and self.queue.qsize() >= self.maxsize:
+            with self._drop_lock:
+                self.dropped += 1
+            return
+        self.queue.put(record)
+
+    def take_dropped(self):
+        with self._drop_lock:
+            dropped, self.dropped = self.dropped, 0
+        return dropped
+
+    def flush(self, timeout=None):
+        """Wait until every record queued so far has been written. Returns False on timeout."""
+        if self.listener._thread is None:
+            return True
+        marker = _FlushMarker()
+        self.queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def stop(self, timeout=2.0):
+        """Write everything still queued, then stop the listener thread."""
+        listener = self.listener
+        if listener._thread is None:
+            return
+        self.queue.put(listener._sentinel)
+        listener._thread.join(timeout)
+        listener._thread = None
+        for handler in list(listener.handlers) + [h for hs in listener.routes.values() for h in hs]:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+
+
+class _FlushMarker:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class _PipelineHandler(QueueHandler):
+    def __init__(self, pipeline, route=None):
+        super().__init__(pipeline.queue)
+        self.pipeline = pipeline
+        self.route = route
+
+    def prepare(self, record):
+        # Formatting is left to the listener thread. The queue stays in-process, so the
+        # record (including exc_info) is passed as is; the message is built with the
+        # args current at write time, which only matters for %-style calls with mutable args.
+        record.log_route = self.route
+        return record
+
+    def enqueue(self, record):
+        self.pipeline.submit(record)
+
+
+class _PipelineListener(QueueListener):
+    def __init__(self, pipeline, handlers, routes):
+        super().__init__(pipeline.queue, *handlers, respect_handler_level=True)
+        self.pipeline = pipeline
+        self.routes = routes  # route -> handlers
+
+    def handle(self, record):
+        if isinstance(record, _FlushMarker):
+            record.done.set()
+            return
+        dropped = self.pipeline.take_dropped()
+        if dropped:
+            self._dispatch(logging.makeLogRecord({
+                'name': 'PhotoEngine.Central', 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                'msg': f"Log queue full: {dropped} log records were dropped",
+            }))
+        self._dispatch(record)
+
+    def _dispatch(self, record):
+        handlers = self.routes.get(getattr(record, 'log_route', None), self.handlers)
+        for handler in handlers:
+            if record.levelno >= handler.level:
+                try:
+                    handler.handle(record)
+                except Exception:
+                    pass  # Handler.handle reports its own errors; keep the listener alive
+
+
+class DebugRingHandler(logging.Handler):
+    """
+    Keeps the last `capacity` records below `disk_level` (the ones the main log
+    does not write) without formatting them, and writes them to `target` just
+    before an ERROR or CRITICAL record reaches it. Runs on the listener thread.
+    """
+
+    def __init__(self, target, capacity=DEBUG_RING_SIZE, disk_level=logging.INFO):
+        super().__init__(logging.DEBUG)
+        self.target = target
+        self.disk_level = disk_level
+        self.records = collections.deque(maxlen=capacity)
+
+    def emit(self, record):
+        if record.levelno < self.disk_level:
+            self.records.append(record)
+        elif record.levelno >= logging.ERROR and self.records:
+            self.dump(f"{record.levelname} at {record.name} [{record.filename}:{record.lineno}]")
+
+    def dump(self, reason):
+        records = list(self.records)
+        self.records.clear()
+        self.target.handle(self._marker(f"--- {len(records)} debug records before {reason} ---"))
+        for record in records:
+            self.target.handle(record)
+        self.target.handle(self._marker("--- end of debug records ---"))
+
+    @staticmethod
+    def _marker(msg):
+        return logging.makeLogRecord({'name': 'PhotoEngine.Central', 'levelno': logging.INFO,
+                                      'levelname': 'INFO', 'msg': msg})
+
+
+def _log_unhandled_exception(exc_type, exc_value, exc_traceback):
+    if issubclass(exc_type, KeyboardInterrupt):
+        sys.__excepthook__(exc_type, exc_value, exc_traceback)
+        return
+    logging.getLogger('PhotoEngine.Central').critical(
+        "Unhandled exception", exc_info=(exc_type, exc_value, exc_traceback))
+    flush_logs()
+
+
+def _log_unhandled_thread_exception(args):
+    if issubclass(args.exc_type, SystemExit):
+        return
+    logging.getLogger('PhotoEngine.Central').critical(
+        f"Unhandled exception in thread {args.thread.name if args.thread else '?'}",
+        exc_info=(args.exc_type, args.exc_value, args.exc_traceback))
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets each call site (file and line) log `burst` records per `period_sec`;
+    with `sample_every` > 0, every Nth record past the burst is still let through.
+    Only records below `max_level` are limited. Dropped records are never
+    formatted; the count is set as `suppressed` on the next record from that
+    call site that passes (the message is left alone), or logged by
+    flush_suppressed() at exit.
+    """
+
+    def __init__(self, burst=5, period_sec=60.0, sample_every=0, max_level=logging.WARNING):
+        super().__init__()
+        self.burst = int(burst)
+        self.period_sec = float(period_sec)
+        self.sample_every = int(sample_every)
+        self.max_level = max_level
+        self._sites = {}  # (pathname, lineno) -> [window_start, passed, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= self.max_level or getattr(record, 'rate_limit_summary', False):
+            return True
+        key = (record.pathname, record.lineno)
+        now = record.created
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                site = self._sites[key] = [now, 0, 0]
+            elif now - site[0] >= self.period_sec:
+                site[0], site[1] = now, 0
+            site[1] += 1
+            if site[1] > self.burst and not (self.sample_every and (site[1] - self.burst) % self.sample_every == 0):
+                site[2] += 1
+                return False
+            suppressed, site[2] = site[2], 0
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+    def flush_suppressed(self, logger):
+        """Log one summary per call site that still has suppressed records."""
+        with self._lock:
+            pending = [(key, site[2]) for key, site in self._sites.items() if site[2]]
+            for key, _count in pending:
+                self._sites[key][2] = 0
+        for (pathname, lineno), count in pending:
+            logger.info(f"{count} similar messages suppressed from {os.path.basename(pathname)}:{lineno}",
+                        extra={'rate_limit_summary': True})
+
+
+class LogFormatter(logging.Formatter):
+    """logging.Formatter that notes how many similar records a RateLimitFilter suppressed."""
+
+    def formatMessage(self, record):
+        text = super().formatMessage(record)
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            text = f"{text} ({suppressed} similar messages suppressed)"
+        return text
+
+
 class CentralLogger:
     """Central logging configuration for the PhotoEngine application."""
     
@@ -33,14 +287,18 @@ class CentralLogger:
         """Setup centralized logging configuration."""
         # Try to load logs_path from config if available, using unified config search
         logs_path = None
+        rate_limits = dict(DEFAULT_LOG_RATE_LIMITS)
+        disk_log_level = DEFAULT_DISK_LOG_LEVEL
+        debug_ring_size = DEBUG_RING_SIZE
         try:
-            import json
-            from utils.config_utils import find_user_config_path
-            config_path = find_user_config_path()
-            if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
-                    logs_path = config.get('logs_path', None)
+            from utils.config_utils import config_store
+            if os.path.exists(config_store.path):
+                logs_path = config_store.get('logs_path', None)
+                disk_log_level = config_store.get_str('disk_log_level', DEFAULT_DISK_LOG_LEVEL)
+                debug_ring_size = config_store.get_int('debug_ring_size', DEBUG_RING_SIZE)
+                configured_limits = config_store.get('log_rate_limits', None)
+                if isinstance(configured_limits, dict):
+                    rate_limits.update(configured_limits)
         except Exception:
             logs_path = None
 
@@ -70,12 +328,13 @@ class CentralLogger:
         # Clear any existing handlers
         for handler in root_logger.handlers[:]:
             root_logger.removeHandler(handler)
+        file_handlers = []
         
         # Create formatters
-        detailed_formatter = logging.Formatter(
+        detailed_formatter = LogFormatter(
             '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
         )
-        simple_formatter = logging.Formatter(
+        simple_formatter = LogFormatter(
             '%(asctime)s - %(levelname)s - %(message)s'
         )
         
@@ -86,9 +345,10 @@ class CentralLogger:
             backupCount=5,
             encoding='utf-8'
         )
-        main_handler.setLevel(logging.DEBUG)
+        disk_level = logging.getLevelName(str(disk_log_level).upper())
+        main_handler.setLevel(disk_level if isinstance(disk_level, int) else logging.INFO)
         main_handler.setFormatter(detailed_formatter)
-        root_logger.addHandler(main_handler)
+        file_handlers.append(main_handler)
         
         # Error log file handler (errors and critical only)
         error_handler = RotatingFileHandler(
@@ -99,14 +359,20 @@ class CentralLogger:
         )
         error_handler.setLevel(logging.ERROR)
         error_handler.setFormatter(detailed_formatter)
-        root_logger.addHandler(error_handler)
+        if debug_ring_size > 0:
+            # Ahead of the error handler, so the context is written before the error itself
+            self.debug_ring = DebugRingHandler(error_handler, debug_ring_size, main_handler.level)
+            file_handlers.append(self.debug_ring)
+        else:
+            self.debug_ring = None
+        file_handlers.append(error_handler)
         
         # Console handler (only if not running as service)
         if not self._is_service_context():
             console_handler = logging.StreamHandler(sys.stdout)
             console_handler.setLevel(logging.INFO)
             console_handler.setFormatter(simple_formatter)
-            root_logger.addHandler(console_handler)
+            file_handlers.append(console_handler)
         
         # Service-specific handler
         service_handler = RotatingFileHandler(
@@ -118,10 +384,27 @@ class CentralLogger:
         service_handler.setLevel(logging.DEBUG)
         service_handler.setFormatter(detailed_formatter)
         
+        # All handlers are written by one listener thread; loggers only enqueue
+        previous = getattr(self, 'pipeline', None)
+        if previous is not None:  # Set up again (re-entered while importing config_utils)
+            previous.stop()
+        self.pipeline = LogPipeline(file_handlers, routes={SERVICE_ROUTE: [service_handler]})
+        self.pipeline.start()
+        atexit.register(self.pipeline.stop)
+        root_logger.addHandler(self.pipeline.handler())
+
         # Add service handler to service logger
         service_logger = logging.getLogger('PhotoEngine.Service')
-        service_logger.addHandler(service_handler)
+        for handler in service_logger.handlers[:]:
+            if isinstance(handler, _PipelineHandler):
+                service_logger.removeHandler(handler)
+        service_logger.addHandler(self.pipeline.handler(SERVICE_ROUTE))
         service_logger.propagate = False  # Don't propagate to root logger
+
+        self._setup_rate_limits(rate_limits)
+
+        sys.excepthook = _log_unhandled_exception
+        threading.excepthook = _log_unhandled_thread_exception
         
         # Log initial setup
         logger = logging.getLogger('PhotoEngine.Central')
@@ -131,6 +414,23 @@ class CentralLogger:
         logger.info(f"Service log: {self.service_log_path}")
         logger.info(f"Console logging: {'Disabled (Service)' if self._is_service_context() else 'Enabled'}")
     
+    def _setup_rate_limits(self, rate_limits):
+        """Attach a RateLimitFilter to each configured logger, replacing filters from an earlier setup."""
+        for name, limit in rate_limits.items():
+            logger = self.get_logger(name)
+            for existing in [f for f in logger.filters if isinstance(f, RateLimitFilter)]:
+                logger.removeFilter(existing)
+            if not limit:
+                continue
+            try:
+                rate_filter = RateLimitFilter(**limit)
+            except (TypeError, ValueError) as e:
+                logging.getLogger('PhotoEngine.Central').warning(f"Ignoring log rate limit for '{name}': {e}")
+                continue
+            logger.addFilter(rate_filter)
+            # Runs before the pipeline is stopped (atexit is last in, first out)
+            atexit.register(rate_filter.flush_suppressed, logger)
+
     def _is_service_context(self):
         """Determine if running in a service context."""
         # Check for service-specific indicators
@@ -158,7 +458,7 @@ class CentralLogger:
             encoding='utf-8'
         )
         handler.setLevel(level)
-        formatter = logging.Formatter(
+        formatter = LogFormatter(
             '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
         )
         handler.setFormatter(formatter)
@@ -205,6 +505,19 @@ def setup_component_logger(component_name, additional_file=None):
     
     return logger
 
+def get_logs_dir():
+    """Return the directory the log files are written to."""
+    global _central_logger
+    if _central_logger is None:
+        _central_logger = CentralLogger()
+    return _central_logger.logs_dir
+
+def flush_logs(timeout=1.0):
+    """Wait until queued log records are written (call before os._exit, which skips atexit)."""
+    if _central_logger is None:
+        return True
+    return _central_logger.pipeline.flush(timeout)
+
 def log_startup(component_name, version=None):
     """Log component startup information."""
     logger = get_logger(component_name)
@@ -234,3 +547,43 @@ def setup_logging():
     if _central_logger is None:
         _central_logger = CentralLogger()
     return get_logger('Main')
+
+
+def _benchmark(calls=20000):
+    """Caller-side cost of logger.info through the queue versus a direct rotating file handler."""
+    import tempfile
+    import time
+    get_logger('Benchmark')  # Set up the pipeline (this writes to the real logs directory)
+    with tempfile.TemporaryDirectory() as tmp:
+        direct = logging.getLogger('Benchmark.Direct')
+        direct.propagate = False
+        handler = RotatingFileHandler(os.path.join(tmp, 'direct.log'), maxBytes=10*1024*1024, backupCount=5, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'))
+        direct.addHandler(handler)
+        queued = logging.getLogger('Benchmark.Queued')
+        queued.propagate = False
+        pipeline = LogPipeline([RotatingFileHandler(os.path.join(tmp, 'queued.log'), maxBytes=10*1024*1024,
+                                                    backupCount=5, encoding='utf-8')])
+        pipeline.listener.handlers[0].setFormatter(handler.formatter)
+        pipeline.start()
+        queued.addHandler(pipeline.handler())
+
+        for name, log in (('direct', direct), ('queued', queued)):
+            samples = []
+            for i in range(calls):
+                start = time.perf_counter()
+                log.info(f"Overlay tick {i} finished")
+                samples.append(time.perf_counter() - start)
+            samples.sort()
+            print(f"{name:>6}: p50 {samples[len(samples) // 2] * 1e6:.1f} us, "
+                  f"p99 {samples[int(len(samples) * 0.99)] * 1e6:.1f} us per call")
+        start = time.perf_counter()
+        pipeline.stop()
+        print(f"queued: drained in {(time.perf_counter() - start) * 1000:.0f} ms, {pipeline.take_dropped()} dropped")
+        handler.close()
+        for h in pipeline.listener.handlers:
+            h.close()
+
+
+if __name__ == '__main__':
+    _benchmark()
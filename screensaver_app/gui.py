@@ -5,6 +5,7 @@ import os
 import json
 import sys # Import sys
 import time # Import time for typeahead timeout
+import threading
 import subprocess
 import win32serviceutil
 import win32service
@@ -18,6 +19,7 @@ if parent_dir not in sys.path:
 # Add GPU utilities import
 sys.path.insert(0, parent_dir)
 from utils.gpu_utils import get_gpu_manager
+from utils.font_catalog import get_font_catalog
 
 # Initialize central logging
 from screensaver_app.central_logger import get_logger, log_startup, log_shutdown, log_exception
@@ -308,6 +310,9 @@ class ScreenSaverApp:
 
         ttk.Label(font_frame, text="Font Family:").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
         self.font_families = sorted(list(tkfont.families(root=self.master))) 
+        # Refresh the persistent font catalog in the background so the screensaver resolves
+        # the picked family to a file without walking the font directories at startup
+        threading.Thread(target=self._warm_font_catalog, daemon=True).start()
         self.font_combo = ttk.Combobox(font_frame, textvariable=self.selected_clock_font_family, values=self.font_families, width=37, state="readonly")
         self.font_combo.grid(row=0, column=1, padx=5, pady=5, sticky=tk.EW)
         self.style.configure('FontCombo.TCombobox', background="#222222", foreground="#FFFFFF", fieldbackground="#222222", selectbackground="#222222")
@@ -339,7 +344,7 @@ class ScreenSaverApp:
         current_row += 1
 
         ttk.Label(ui_font_frame, text="Font Family:").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-        self.ui_font_families = sorted(list(tkfont.families(root=self.master))) 
+        self.ui_font_families = self.font_families  # Same list; avoid enumerating system fonts twice
         self.ui_font_combo = ttk.Combobox(ui_font_frame, textvariable=self.selected_ui_font_family, values=self.ui_font_families, width=37, state="readonly")
         self.ui_font_combo.grid(row=0, column=1, padx=5, pady=5, sticky=tk.EW)
         self.style.configure('UIFontCombo.TCombobox', background="#222222", foreground="#FFFFFF", fieldbackground="#222222", selectbackground="#222222")
@@ -1280,9 +1285,27 @@ class ScreenSaverApp:
         else:
             messagebox.showerror("Error", "Failed to save settings.")
 
+    def _warm_font_catalog(self):
+        try:
+            get_font_catalog()
+        except Exception as e:
+            logger.warning(f"Could not refresh font catalog: {e}")
+
+    def _log_font_resolution(self, family):
+        try:
+            font_path = get_font_catalog().lookup(family)
+            if font_path:
+                logger.debug(f"Font '{family}' resolves to {font_path}")
+            else:
+                logger.warning(f"No font file found for '{family}'; the screensaver will fall back to the default font")
+        except Exception as e:
+            logger.warning(f"Font catalog lookup failed for '{family}': {e}")
+
     def update_font_preview(self, event=None):
         """Updates the font preview label with the selected font."""
         selected_font = self.selected_clock_font_family.get()
+        if event is not None:
+            self._log_font_resolution(selected_font)
         try:
             self.font_preview_label.configure(font=(selected_font, 12))
         except Exception as e:
@@ -1292,6 +1315,8 @@ class ScreenSaverApp:
     def update_ui_font_preview(self, event=None):
         """Updates the UI font preview label with the selected font."""
         selected_font = self.selected_ui_font_family.get()
+        if event is not None:
+            self._log_font_resolution(selected_font)
         try:
             self.ui_font_preview_label.configure(font=(selected_font, 12))
         except Exception as e:
@@ -10,11 +10,10 @@ import vlc
 
 # --- PyQt5 and Win32 Imports ---
 from PyQt5.QtWidgets import QApplication, QWidget
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, pyqtSignal
 
 import win32gui
 import win32con
-import cv2
 
 # Ensure parent directory is in sys.path for package imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -23,6 +22,12 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 from screensaver_app.central_logger import get_logger, log_startup, log_shutdown, log_exception
 logger = get_logger('LiveWallpaperQt_VLC')
+from utils.video_probe import get_video_metadata, within_resume_limits
+from utils.keyframe_index import ensure_keyframe_index, resume_media, replace_loop_media, keyframe_at_or_before
+from utils.video_proxy import resolve_playback_path
+from utils.power_governor import PowerGovernor, apply_vlc_profile, DEFAULT_INTERVAL_SEC as POWER_GOVERNOR_INTERVAL_SEC
+from utils.playback_state import playback_state
+from utils.config_watcher import config_watcher
 
 
 try:
@@ -47,6 +52,9 @@ class VlcPlayer:
         self.config = config
         self.video_path = video_path
         self.last_save_time = 0
+        self.power_governor = None
+        self.media_list = None
+        self.media_list_player = None
 
 
         # Create a VLC instance with options for better performance and no extra windows.
@@ -73,6 +81,8 @@ class VlcPlayer:
             logger.error("VLC MediaPlayer not initialized.")
             return
 
+        # Play the screen-resolution proxy instead once it has been transcoded (opt-in)
+        self.video_path = resolve_playback_path(self.video_path, self.config, width, height)
         media = self.instance.media_new(self.video_path)
         
         self.media_player.set_media(media)
@@ -94,28 +104,41 @@ class VlcPlayer:
         media_list_player.set_media_list(media_list)
         media_list_player.set_media_player(self.media_player)
         media_list_player.set_playback_mode(vlc.PlaybackMode.loop)
+        self.media_list = media_list
         self.media_list_player = media_list_player  # Store reference
-        self.media_list_player.play()
-        # Resume from the last saved timestamp
 
-    
-        width, height = self.media_player.video_get_size()
-        cap = cv2.VideoCapture(self.video_path)
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        cap.release()
+        # VLC reports 0x0 until decoding starts, so read size/FPS from the shared metadata index
+        video_meta = get_video_metadata(self.video_path)
         logger.info(f"Video loaded: {self.video_path}")
-        logger.info(f"Video Size: {width}x{height} pixels")
-        logger.info(f"Video FPS: {fps} frames per second")
+        if video_meta:
+            logger.info(f"Video Size: {video_meta['width']}x{video_meta['height']} pixels")
+            logger.info(f"Video FPS: {video_meta['fps']} frames per second")
+
+        # Resume from the last saved timestamp: the first pass opens at the keyframe at or
+        # before it, later loops start from the beginning
+        resumed = False
+        if within_resume_limits(video_meta):
+            # Load the keyframes into memory now; resume and the timestamp callback only read them
+            ensure_keyframe_index(self.video_path)
+            start_timestamp_sec = playback_state.get_float('last_video_timestamp', 0.0)
+            if start_timestamp_sec > 0:
+                start_media, start_at = resume_media(self.instance, self.video_path, start_timestamp_sec)
+                replace_loop_media(media_list, start_media)
+                resumed = True
+                logger.info(f"Resuming video from {start_at:.2f} seconds (saved {start_timestamp_sec:.2f}).")
+        self.media_list_player.play()
+        if resumed:
+            replace_loop_media(media_list, self.instance.media_new(self.video_path))
 
-        if width <= 1920 and height <= 1080 and fps <= 30:
+        if self.config.get('power_governor_enabled', False):
+            self.power_governor = PowerGovernor(
+                self.apply_power_profile,
+                interval=self.config.get('power_governor_interval_sec', POWER_GOVERNOR_INTERVAL_SEC),
+            ).start()
+
+        if within_resume_limits(video_meta):
             event_manager = self.media_player.event_manager()
             event_manager.event_attach(vlc.EventType.MediaPlayerTimeChanged, self._save_timestamp_callback)
-
-            start_timestamp_sec = self.config.get('last_video_timestamp', 0)
-            if start_timestamp_sec > 0:
-                logger.info(f"Resuming video from {start_timestamp_sec:.2f} seconds.")
-                # VLC set_time expects milliseconds
-                self.media_player.set_time(int(start_timestamp_sec * 1000))
         
         # if the video is larger than 1080p, we don't set a start time
         # also we will set the starting frame as the wallpaper
@@ -125,6 +148,21 @@ class VlcPlayer:
                 logger.error("Failed to set wallpaper using VLC media player.")
         logger.info("VLC playback started.")
 
+    def apply_power_profile(self, profile):
+        """Switch playback to a governor profile ('full', 'reduced_fps', 'downscaled', 'poster') while running."""
+        try:
+            if self.media_player:
+                apply_vlc_profile(profile, self.instance, self.media_list, self.media_list_player,
+                                  self.media_player, self.video_path)
+        except Exception as e:
+            logger.error(f"Could not apply power profile '{profile}': {e}")
+
+    def _resume_timestamp(self, seconds):
+        """The position to save for resume, snapped to a keyframe if snap_resume_to_keyframe is set."""
+        if self.config.get('snap_resume_to_keyframe', False):
+            return keyframe_at_or_before(self.video_path, seconds)
+        return seconds
+
     def _save_timestamp_callback(self, event):
         """Callback triggered by VLC when the playback time changes."""
         current_time = time.time()
@@ -132,28 +170,46 @@ class VlcPlayer:
             # get_time returns milliseconds
             timestamp_ms = self.media_player.get_time()
             if timestamp_ms > 0:
-                timestamp_sec = timestamp_ms / 1000.0
-                self.config['last_video_timestamp'] = timestamp_sec
-                save_config(self.config)
+                timestamp_sec = self._resume_timestamp(timestamp_ms / 1000.0)
+                # In memory only; the playback state flusher writes it to disk
+                playback_state.set('last_video_timestamp', timestamp_sec)
                 self.last_save_time = current_time
 
     def stop_playback(self):
         """Stops playback and saves the final timestamp."""
+        if self.power_governor:
+            self.power_governor.stop()
+            self.power_governor = None
         if self.media_player and self.media_player.is_playing():
             # Save final position before stopping
             timestamp_ms = self.media_player.get_time()
             if timestamp_ms > 0:
-                self.config['last_video_timestamp'] = timestamp_ms / 1000.0
-                save_config(self.config)
-                logger.info(f"Saved final video timestamp: {self.config['last_video_timestamp']:.2f}s")
+                timestamp_sec = self._resume_timestamp(timestamp_ms / 1000.0)
+                playback_state.set('last_video_timestamp', timestamp_sec)
+                playback_state.flush(timeout=1.0)
+                logger.info(f"Saved final video timestamp: {timestamp_sec:.2f}s")
 
             self.media_player.stop()
         
+        # Release everything this player created, so a restart for changed settings
+        # does not leave a libvlc instance and its decoder threads behind
+        if self.media_list_player:
+            self.media_list_player.stop()
+            self.media_list_player.release()
+            self.media_list_player = None
+        if self.media_list:
+            self.media_list.release()
+            self.media_list = None
+
         if self.media_player:
             self.media_player.release()
             self.media_player = None
             logger.info("VLC playback stopped and resources released.")
 
+        if self.instance:
+            self.instance.release()
+            self.instance = None
+
 
 class WallpaperWindow(QWidget):
     """
@@ -207,12 +263,22 @@ class WallpaperWindow(QWidget):
         super().showEvent(event)
 
 
+class ConfigChangeRelay(QObject):
+    """Carries config watcher callbacks (watcher thread) to the Qt thread as a queued signal."""
+    changed = pyqtSignal(dict)
+
+
 # --- Application Entry Point (Refactored) ---
 
 class LiveWallpaperController:
     app = None
     vlc_player = None
     windows = []
+    config_relay = None
+    config_subscription = None
+    playback_started = threading.Event()  # Set while the wallpaper is playing (the hot standby waits for it)
+    # userconfig.json keys applied while running; all but snap_resume_to_keyframe restart playback
+    LIVE_CONFIG_KEYS = ('video_path', 'snap_resume_to_keyframe', 'power_governor_enabled', 'power_governor_interval_sec')
 
     @staticmethod
     def start_live_wallpaper(video_path):
@@ -273,9 +339,17 @@ class LiveWallpaperController:
             LiveWallpaperController.vlc_player = VlcPlayer(video_path, config)
             hwnd = win.winId().__int__()
             LiveWallpaperController.vlc_player.start_playback(hwnd,win.width(),win.height())
+            LiveWallpaperController.playback_started.set()
 
             LiveWallpaperController.app.aboutToQuit.connect(LiveWallpaperController.stop_live_wallpaper)
 
+            # Apply settings saved from the GUI without restarting the application
+            relay = ConfigChangeRelay()
+            relay.changed.connect(LiveWallpaperController.apply_config_changes)
+            LiveWallpaperController.config_relay = relay
+            LiveWallpaperController.config_subscription = config_watcher.subscribe(
+                relay.changed.emit, keys=LiveWallpaperController.LIVE_CONFIG_KEYS)
+
             # Set up signal handler for Ctrl+C
             def handle_sigint(signum, frame):
                 logger.info("SIGINT received. Stopping live wallpaper...")
@@ -290,10 +364,39 @@ class LiveWallpaperController:
         except Exception as e:
             logger.error(f"Exception in start_live_wallpaper: {e}", exc_info=True)
 
+    @staticmethod
+    def apply_config_changes(changes):
+        """Apply changed userconfig.json keys to the running wallpaper (Qt thread)."""
+        player = LiveWallpaperController.vlc_player
+        if not player or not LiveWallpaperController.windows:
+            return
+        try:
+            player.config.update(changes)
+            if set(changes) == {'snap_resume_to_keyframe'}:
+                return  # Read on every save, nothing to restart
+            video_path = player.config.get('video_path')
+            if not video_path or not os.path.exists(video_path):
+                logger.error(f"Error: Video file not found at '{video_path}', keeping the current video")
+                return
+            logger.info(f"Restarting live wallpaper playback for changed settings: {', '.join(sorted(changes))}")
+            player.stop_playback()
+            if 'video_path' in changes:
+                playback_state.set('last_video_timestamp', 0)  # The saved position belonged to the previous video
+            win = LiveWallpaperController.windows[0]
+            LiveWallpaperController.vlc_player = VlcPlayer(video_path, player.config)
+            LiveWallpaperController.vlc_player.start_playback(win.winId().__int__(), win.width(), win.height())
+        except Exception as e:
+            logger.error(f"Exception in apply_config_changes: {e}", exc_info=True)
+
     @staticmethod
     def stop_live_wallpaper():
         logger.info("Entered stop_live_wallpaper function.")
+        LiveWallpaperController.playback_started.clear()
         try:
+            if LiveWallpaperController.config_subscription:
+                LiveWallpaperController.config_subscription.unsubscribe()
+                LiveWallpaperController.config_subscription = None
+                LiveWallpaperController.config_relay = None
             if LiveWallpaperController.vlc_player:
                 logger.info("Stopping VLC player.")
                 LiveWallpaperController.vlc_player.stop_playback()
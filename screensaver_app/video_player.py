@@ -1,9 +1,9 @@
 import logging
 import tkinter as tk
-from turtle import width
 import vlc
 from PIL import Image, ImageTk, ImageDraw, ImageFont
 import time
+import math
 import os
 import json
 import threading
@@ -12,23 +12,39 @@ import tkinter.font as tkfont
 import platform
 from concurrent.futures import ThreadPoolExecutor
 import collections
+import importlib
 import getpass  # Added import
-from utils.config_utils import find_user_config_path, load_config, save_config
+from utils.config_utils import config_store, find_user_config_path, load_config, save_config
+from utils.playback_state import playback_state
+from utils.config_watcher import config_watcher
 # Add central logging
 import sys
 import subprocess
 from utils.multi_monitor import update_secondary_monitor_blackouts
 from utils.wallpaper import set_windows_wallpaper
+from utils.image_export import image_exporter
+from utils.frame_ring import FrameRing
+from utils.frame_timing import TickTimer, DEFAULT_BUDGET_MS as OVERLAY_TIMING_BUDGET_MS, DEFAULT_LOG_INTERVAL_S as OVERLAY_TIMING_LOG_INTERVAL_S
 from utils.app_utils import  release_lock
-import cv2
+from utils.overlay_layer import OverlayLayer
+from utils.glyph_atlas import get_clock_atlas
+from utils.avatar_cache import load_avatar_frames
+from utils.avatar_stream import AvatarFrameStream, probe_avatar, DEFAULT_FRAME_BUDGET
+from utils.video_probe import get_video_metadata, within_resume_limits
+from utils.keyframe_index import ensure_keyframe_index, resume_media, replace_loop_media
+from utils.video_proxy import resolve_playback_path
+from utils.power_governor import PowerGovernor, apply_vlc_profile, DEFAULT_INTERVAL_SEC as POWER_GOVERNOR_INTERVAL_SEC
+from utils.font_catalog import get_font_catalog
+from utils.startup_trace import trace as startup_trace
 # Ensure parent directory is in sys.path for package imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
     
-from screensaver_app.central_logger import get_logger, log_startup, log_shutdown, log_exception
+from screensaver_app.central_logger import get_logger, log_startup, log_shutdown, log_exception, flush_logs
 logger = get_logger('VideoPlayer')
+poll_logger = get_logger('VideoPlayer.poll')  # Rate-limited: call sites that run in loops or timers
 logger.setLevel(logging.INFO)  # Set to INFO for general logs
 # Try to import enhanced blocker first, fallback to basic blocker
 try:
@@ -41,7 +57,7 @@ except ImportError:
 # Custom UAC elevation functions to replace pyUAC
 def is_admin():
     """Check if the current process is running with admin privileges."""
-    logger.info("is_admin")
+    poll_logger.info("is_admin")
     if platform.system() != "Windows":
         return False
     try:
@@ -173,8 +189,7 @@ else:
     logger.info("Non-Windows OS detected, session monitoring not available")
 
 def get_username_from_config():
-    config = load_config()
-    return config.get('default_user_for_display', 'User')
+    return config_store.get_str('default_user_for_display', 'User')
 
 def get_user_config():
     return load_config()
@@ -205,51 +220,13 @@ def draw_rounded_rectangle(draw, xy, radius, fill=None, outline=None, width=2):
 
 def find_font_path(font_family):
     """Try to find the font file path for a given font family name."""
-    import glob
-
-    font_dirs = []
-    system = platform.system()
-    if system == "Windows":
-        font_dirs = [os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts")]
-        # Also check user fonts directory (Windows 10+)
-        user_fonts = os.path.expandvars(r"%LOCALAPPDATA%\Microsoft\Windows\Fonts")
-        if os.path.isdir(user_fonts):
-            font_dirs.append(user_fonts)
-    elif system == "Darwin":
-        font_dirs = ["/System/Library/Fonts", "/Library/Fonts", os.path.expanduser("~/Library/Fonts")]
-    else:  # Linux/Unix
-        font_dirs = ["/usr/share/fonts", "/usr/local/share/fonts", os.path.expanduser("~/.fonts")]
-
-    # Normalize font family for matching
-    normalized_family = font_family.replace(" ", "").replace("-", "").replace("_", "").lower()
-
-    # Try to find .ttf or .otf file matching the font family (exact and partial match, case-insensitive)
-    for font_dir in font_dirs:
-        if not os.path.isdir(font_dir):
-            continue
-        for root, dirs, files in os.walk(font_dir):
-            for file in files:
-                if file.lower().endswith((".ttf", ".otf")):
-                    file_no_ext = os.path.splitext(file)[0].replace(" ", "").replace("-", "").replace("_", "").lower()
-                    # Try exact match first (case-insensitive)
-                    if normalized_family == file_no_ext:
-                        return os.path.join(root, file)
-                    # Then try partial match
-                    if normalized_family in file_no_ext:
-                        return os.path.join(root, file)
-                    # Try matching with original font_family (for fonts with spaces/case)
-                    if font_family.lower() in file.lower():
-                        return os.path.join(root, file)
-    # Try glob for fonts with spaces or special chars in filename
-    for font_dir in font_dirs:
-        if not os.path.isdir(font_dir):
-            continue
-        for ext in ("*.ttf", "*.otf"):
-            for font_path in glob.glob(os.path.join(font_dir, ext)):
-                base = os.path.splitext(os.path.basename(font_path))[0]
-                base_norm = base.replace(" ", "").replace("-", "").replace("_", "").lower()
-                if normalized_family == base_norm or normalized_family in base_norm or font_family.lower() in base.lower():
-                    return font_path
+    # Resolved through the persistent font catalog (no directory walk unless fonts changed)
+    try:
+        font_path = get_font_catalog().lookup(font_family)
+        if font_path:
+            return font_path
+    except Exception as e:
+        logger.warning(f"Font catalog lookup failed for '{font_family}': {e}")
     # Try to use tkinter's font actual() to get the font file (works on some systems)
     try:
         import tkinter.font as tkfont
@@ -265,15 +242,28 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-try:
-    from widgets.stock_widget import StockWidget
-    from widgets.media_widget import MediaWidget
-    from widgets.weather_widget import WeatherWidget
-except ImportError as e:
-    logger.error(f"Widget import error: {e}")
-    StockWidget = None
-    MediaWidget = None
-    WeatherWidget = None
+# Widget modules pull in matplotlib, pandas, pgeocode, pygame and requests_cache, so they are
+# imported by the widget thread, and only for the widgets that are enabled
+_WIDGET_CLASSES = {
+    "weather": ("widgets.weather_widget", "WeatherWidget"),
+    "stock": ("widgets.stock_widget", "StockWidget"),
+    "media": ("widgets.media_widget", "MediaWidget"),
+}
+_loaded_widget_classes = {}
+
+def load_widget_class(widget_type):
+    """Import and return the widget class for `widget_type`, or None if its module cannot be imported."""
+    if widget_type not in _loaded_widget_classes:
+        module_name, class_name = _WIDGET_CLASSES[widget_type]
+        try:
+            start = time.perf_counter()
+            widget_class = getattr(importlib.import_module(module_name), class_name)
+            logger.info(f"Imported {class_name} in {(time.perf_counter() - start) * 1000:.0f} ms")
+        except ImportError as e:
+            logger.error(f"Widget import error: {e}")
+            widget_class = None
+        _loaded_widget_classes[widget_type] = widget_class
+    return _loaded_widget_classes[widget_type]
 
 # This function will be called whenever the VLC player enters the paused state.
 def handle_media_player_paused(event, player):
@@ -303,20 +293,10 @@ def handle_media_player_paused(event, player):
                 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__)))
 
             snapshot_path = os.path.join(project_root, "vlc_snapshot_temp.png")
-            logger.info(f"Resolution is within limits. Attempting to take snapshot to: {snapshot_path}")
+            logger.info(f"Resolution is within limits. Queueing snapshot to: {snapshot_path}")
 
-            player.video_take_snapshot(0, snapshot_path, 0, 0)
-            logger.info("Snapshot command issued. Waiting for file to be written...")
-
-            # Verify if the snapshot file was successfully created
-            if os.path.exists(snapshot_path):
-                try:
-                    set_windows_wallpaper(snapshot_path)  # Set the captured image as wallpaper
-                    logger.info("Successfully set snapshot as wallpaper")
-                except Exception as e:
-                    logger.error(f"Error setting wallpaper from snapshot: {e}")
-            else:
-                logger.warning("Snapshot file was not found. There might be an issue with VLC or permissions.")
+            # Snapshot and wallpaper change run on the export worker, not on VLC's event thread
+            image_exporter.take_snapshot(player, snapshot_path, on_done=set_windows_wallpaper)
         else:
             # This 'else' corresponds to the resolution check
             logger.info(f"Video resolution ({width}x{height}) is larger than 1920x1080. Skipping snapshot.")
@@ -324,12 +304,28 @@ def handle_media_player_paused(event, player):
         # This 'else' corresponds to the check for valid dimensions
         logger.warning("Could not determine video dimensions. Skipping snapshot.")
 class VideoClockScreenSaver:
-
-    def __init__(self, master, video_path_arg=None, key_blocker_instance=None):
+    # Overlay scheduling: wake only for the next clock second, GIF frame or focus check
+    OVERLAY_FOCUS_CHECK_INTERVAL_MS = 1000
+    OVERLAY_SECOND_GUARD_MS = 2  # Land just after the second boundary so strftime has flipped
+    OVERLAY_MIN_DELAY_MS = 1
+    COMPOSITOR_BACKEND = 'compositor'
+    COMPOSITOR_POLL_INTERVAL_MS = 8  # Check for a new decoded frame about twice per 60 Hz refresh
+    # userconfig.json keys applied in place while running (see _apply_config_changes)
+    LIVE_FONT_KEYS = ('clock_font_family', 'clock_font_size', 'ui_font_family', 'ui_font_size')
+    LIVE_PROFILE_KEYS = ('profile_pic_path', 'profile_pic_path_crop')
+    LIVE_WIDGET_KEYS = ('enable_weather_widget', 'weather_pincode', 'weather_country',
+                        'enable_stock_widget', 'stock_market', 'enable_media_widget')
+    # Keys that need a new VLC instance; an idle hot standby is rebuilt for them on activation
+    NEXT_START_KEYS = ('video_path', 'preferred_gpu', 'gpu_acceleration', 'video_backend')
+
+    def __init__(self, master, video_path_arg=None, key_blocker_instance=None, standby=False):
+        """With `standby`, everything is built but the overlay stays withdrawn and playback
+        does not start until activate() is called (tray hot standby)."""
         logger.debug("Initializing VideoClockScreenSaver")
         try:
             self.master = master
             self.key_blocker_instance = key_blocker_instance  # Store the actual blocker instance
+            self.standby = standby
             master.attributes('-fullscreen', True)
             master.configure(bg='black')
             
@@ -351,6 +347,8 @@ class VideoClockScreenSaver:
                 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
                 actual_video_path = os.path.join(project_root, actual_video_path)
                 logger.debug(f"Resolved relative video path to: {actual_video_path}")
+            # Play the screen-resolution proxy instead once it has been transcoded (opt-in)
+            actual_video_path = resolve_playback_path(actual_video_path, self.user_config, self.screen_width, self.screen_height)
 
             self.width = master.winfo_screenwidth() 
             self.height = master.winfo_screenheight()
@@ -363,25 +361,17 @@ class VideoClockScreenSaver:
             self.label = tk.Label(self.video_frame, bg='black', borderwidth=0, highlightthickness=0)
             self.label.place(x=0, y=0, width=self.width, height=self.height)
 
-            # Overlay Toplevel window (transparent, always on top)
-            self.overlay_win = tk.Toplevel(master)
-            self.overlay_win.overrideredirect(True)
-            self.overlay_win.attributes('-topmost', True)
-            self.overlay_win.geometry(f'{self.width}x{self.height}+0+0')
-            # Windows transparency
-            if platform.system() == 'Windows':
-                self.overlay_win.attributes('-transparentcolor', self.TRANSPARENT_KEY)
-                self.overlay_win.config(bg=self.TRANSPARENT_KEY)
-                self.overlay_canvas = tk.Canvas(self.overlay_win, bg=self.TRANSPARENT_KEY, highlightthickness=0, borderwidth=0)
-            else:
-                self.overlay_win.config(bg='black')
-                self.overlay_canvas = tk.Canvas(self.overlay_win, bg='black', highlightthickness=0, borderwidth=0)
-            self.overlay_canvas.place(x=0, y=0, width=self.width, height=self.height)
-
-            # Make overlay window non-interactive but keep it visible
-            # Remove the -disabled attribute as we're using WS_EX_TRANSPARENT instead
-            if platform.system() == 'Windows':
-                self.overlay_win.wm_attributes("-disabled", False)
+            # Overlays sit in a transparent Toplevel over the VLC window, or are blended
+            # into the decoded frames in-process with video_backend 'compositor'
+            self.video_backend = self.user_config.get('video_backend', 'auto')
+            self.overlay_win = None
+            self.overlay_canvas = None
+            self.compositor = None
+            self.compositor_surface = None
+            self.vlc_video_callbacks = None
+            self._present_after_id = None
+            if self.video_backend != self.COMPOSITOR_BACKEND:
+                self._create_overlay_window(standby)
             
             # Ensure main window can receive all key events
             master.focus_force()
@@ -399,45 +389,12 @@ class VideoClockScreenSaver:
             self.label.bind("<KeyPress>", self._on_key_event)
             self.label.bind("<Button-1>", self._on_click_event)
 
-            self.overlay_canvas.bind("<Button-1>", self._on_click_event)
-            self.overlay_canvas.focus_force()
-            # Load clock font settings from config
-            self.clock_font_family = self.user_config.get("clock_font_family", "Segoe UI Emoji")
-            self.clock_font_size = self.user_config.get("clock_font_size", 64)
-
-            # Load UI font settings from config
-            self.ui_font_family = self.user_config.get("ui_font_family", "Arial")
-            self.ui_font_size = self.user_config.get("ui_font_size", 30)
-
-            font_path_used = None
-            try:
-                font_path = find_font_path(self.clock_font_family)
-                if font_path:
-                    self.clock_font = ImageFont.truetype(font_path, self.clock_font_size)
-                    font_path_used = font_path
-                    logger.debug(f"Using clock font file: {font_path}")
-                else:
-                    self.clock_font = ImageFont.truetype(self.clock_font_family, self.clock_font_size)
-                    font_path_used = self.clock_font_family
-                    logger.debug(f"Using clock font family: {self.clock_font_family}")
-            except Exception as e:
-                logger.warning(f"Warning: Clock font '{self.clock_font_family}' not found. Using PIL default. ({e})")
-                self.clock_font = ImageFont.load_default()
-
-            try:
-                ui_font_path = find_font_path(self.ui_font_family)
-                if ui_font_path:
-                    self.profile_name_font = ImageFont.truetype(ui_font_path, self.ui_font_size)
-                    self.profile_initial_font = ImageFont.truetype(ui_font_path, self.ui_font_size * 2)
-                    logger.debug(f"Using UI font file: {ui_font_path}")
-                else:
-                    self.profile_name_font = ImageFont.truetype(self.ui_font_family, self.ui_font_size)
-                    self.profile_initial_font = ImageFont.truetype(self.ui_font_family, self.ui_font_size * 2)
-                    logger.debug(f"Using UI font family: {self.ui_font_family}")
-            except Exception as e:
-                logger.warning(f"Warning: UI font '{self.ui_font_family}' not found. Using PIL default. ({e})")
-                self.profile_name_font = ImageFont.load_default()
-                self.profile_initial_font = ImageFont.load_default()
+            if self.overlay_canvas is not None:
+                self.overlay_canvas.bind("<Button-1>", self._on_click_event)
+                self.overlay_canvas.focus_force()
+            startup_trace.begin('font_lookup')
+            self._load_fonts()
+            startup_trace.end('font_lookup')
 
             self.profile_pic_size = 80
             self.pre_rendered_profile_pic = None
@@ -449,20 +406,40 @@ class VideoClockScreenSaver:
             self.profile_pic_gif_frame_index = 0
             self.profile_pic_gif_last_update = 0
             self.profile_pic_gif_duration = 100
+            self.profile_pic_stream = None  # Bounded decoder for avatars longer than the frame budget
+            self.profile_pic_current_frame = None
+            self.power_governor = None
+            self.power_profile = 'full'  # Profile requested by the power governor
+            self.applied_power_profile = 'full'  # Profile the VLC input is currently running with
+            self.playback_paused = False  # Paused for the password dialog
+            self.frame_ring = FrameRing()  # Clean frames (no UI) for the lock screen, borrowed via borrow_latest()
 
             self.current_time_text = time.strftime('%I:%M:%S %p')
             self.last_clock_update = 0
+            self.last_clock_second = None
+            self._next_focus_check_ms = 0
+            self._overlay_after_id = None
             self.clock_x = 0
             self.clock_y = 0
             self.clock_text_width = 0
+            self.overlay_layer = None  # Retained canvas items, created on first overlay tick
+            self.clock_atlas = None  # Pre-shadowed clock glyph sprites, built on first use
+            # Lateness/duration histograms for overlay ticks; see get_overlay_timing()
+            self.overlay_timing = TickTimer(
+                'Overlay loop',
+                budget_ms=self.user_config.get('overlay_timing_budget_ms', OVERLAY_TIMING_BUDGET_MS),
+                log_interval_s=self.user_config.get('overlay_timing_log_interval_sec', OVERLAY_TIMING_LOG_INTERVAL_S),
+            )
+            self._overlay_deadline = None  # perf_counter() time the next overlay tick was scheduled for
 
             self.first_frame_received = False
             self.widgets = []
+            self.config_subscription = config_watcher.subscribe(
+                self._on_config_changed,
+                keys=self.LIVE_FONT_KEYS + self.LIVE_PROFILE_KEYS + self.LIVE_WIDGET_KEYS + self.NEXT_START_KEYS)
             
             # Add flag to control focus management
             self.focus_management_active = True
-      
-            self.master.after(100, self.init_widgets)
 
             # VLC setup
             vlc_options = [
@@ -470,20 +447,24 @@ class VideoClockScreenSaver:
                 '--no-snapshot-preview'  # Disable the snapshot preview thumbnail
             ]
 
-            self.vlc_instance = vlc.Instance(vlc_options)
-            self.vlc_player = self.vlc_instance.media_player_new()
-            self.media = self.vlc_instance.media_new(actual_video_path)
+            self.video_path = actual_video_path
+            with startup_trace.phase('vlc_instance'):
+                self.vlc_instance = vlc.Instance(vlc_options)
+                self.vlc_player = self.vlc_instance.media_player_new()
+                self.media = self.vlc_instance.media_new(actual_video_path)
             self.vlc_player.set_media(self.media)
-            # Embed VLC video output into Tkinter Label
-            self.vlc_player.set_hwnd(self.label.winfo_id())
+            if self.video_backend == self.COMPOSITOR_BACKEND:
+                self._setup_compositor()
+            else:
+                # Embed VLC video output into Tkinter Label
+                self.vlc_player.set_hwnd(self.label.winfo_id())
             # Mute VLC player to remove sound
             self.vlc_player.audio_set_mute(True)
             
             # Configure video scaling to fill entire screen (removes black bars)
             # Set aspect ratio to match screen dimensions to stretch video
-            screen_aspect = f"{self.screen_width}:{self.screen_height}"
-            self.vlc_player.video_set_aspect_ratio(screen_aspect.encode('utf-8'))
-            vwidth, vheight = self.vlc_player.video_get_size()
+            self.screen_aspect = f"{self.screen_width}:{self.screen_height}"
+            self.vlc_player.video_set_aspect_ratio(self.screen_aspect.encode('utf-8'))
             # Set video to stretch to fill the window completely
             self.vlc_player.video_set_scale(0)  # 0 = fit to window, stretching if necessary
             
@@ -493,37 +474,199 @@ class VideoClockScreenSaver:
             media_list_player.set_media_list(media_list)
             media_list_player.set_media_player(self.vlc_player)
             media_list_player.set_playback_mode(vlc.PlaybackMode.loop)
+            self.media_list = media_list
             self.media_list_player = media_list_player  # Store reference
             
             # Initialize UI elements immediately for VLC playback
             self._initialize_ui_elements_immediately()
 
+            # Get the event manager for the media player. This allows us to subscribe to events.
+            event_manager = self.vlc_player.event_manager()
+      
+            event_manager.event_attach(vlc.EventType.MediaPlayerPaused, self._on_media_player_paused)
+
+            if standby:
+                # Demux the header now so activation does not have to
+                self.media.parse_with_options(vlc.MediaParseFlag.local, 0)
+                logger.info("VideoClockScreenSaver prepared in standby")
+            else:
+                self._start_playback()
+    
+        except Exception as e:
+            logger.error(f"Exception in __init__: {e}")
+
+    def _load_fonts(self):
+        """Load the clock and UI fonts named in user_config."""
+        # Load clock font settings from config
+        self.clock_font_family = self.user_config.get("clock_font_family", "Segoe UI Emoji")
+        self.clock_font_size = self.user_config.get("clock_font_size", 64)
+
+        # Load UI font settings from config
+        self.ui_font_family = self.user_config.get("ui_font_family", "Arial")
+        self.ui_font_size = self.user_config.get("ui_font_size", 30)
+
+        try:
+            font_path = find_font_path(self.clock_font_family)
+            if font_path:
+                self.clock_font = ImageFont.truetype(font_path, self.clock_font_size)
+                logger.debug(f"Using clock font file: {font_path}")
+            else:
+                self.clock_font = ImageFont.truetype(self.clock_font_family, self.clock_font_size)
+                logger.debug(f"Using clock font family: {self.clock_font_family}")
+        except Exception as e:
+            logger.warning(f"Warning: Clock font '{self.clock_font_family}' not found. Using PIL default. ({e})")
+            self.clock_font = ImageFont.load_default()
+
+        try:
+            ui_font_path = find_font_path(self.ui_font_family)
+            if ui_font_path:
+                self.profile_name_font = ImageFont.truetype(ui_font_path, self.ui_font_size)
+                self.profile_initial_font = ImageFont.truetype(ui_font_path, self.ui_font_size * 2)
+                logger.debug(f"Using UI font file: {ui_font_path}")
+            else:
+                self.profile_name_font = ImageFont.truetype(self.ui_font_family, self.ui_font_size)
+                self.profile_initial_font = ImageFont.truetype(self.ui_font_family, self.ui_font_size * 2)
+                logger.debug(f"Using UI font family: {self.ui_font_family}")
+        except Exception as e:
+            logger.warning(f"Warning: UI font '{self.ui_font_family}' not found. Using PIL default. ({e})")
+            self.profile_name_font = ImageFont.load_default()
+            self.profile_initial_font = ImageFont.load_default()
+
+    def _on_config_changed(self, changes):
+        """Config watcher callback (watcher thread): apply the changes on the Tk thread."""
+        try:
+            self.master.after(0, lambda: self._apply_config_changes(changes))
+        except Exception as e:
+            logger.warning(f"Could not schedule config changes: {e}")
+
+    def _apply_config_changes(self, changes):
+        """Apply changed userconfig.json keys without restarting."""
+        logger.info(f"Applying config changes: {', '.join(sorted(changes))}")
+        try:
+            self.user_config.update(changes)
+            fonts_changed = any(k in changes for k in self.LIVE_FONT_KEYS)
+            if fonts_changed:
+                self._load_fonts()
+                self.clock_atlas = None  # Built for the old clock font
+            if fonts_changed or any(k in changes for k in self.LIVE_PROFILE_KEYS):
+                if any(k in changes for k in self.LIVE_PROFILE_KEYS):
+                    self._stop_profile_pic_stream()
+                    self.profile_pic_gif_frames = []
+                    self.profile_pic_is_gif = False
+                if self.first_frame_received:
+                    # Re-render the avatar, username label and clock metrics, then redraw every sprite
+                    self._initialize_ui_elements_after_first_frame(self.width, self.height)
+                    if self.overlay_layer is not None:
+                        self.overlay_layer.clear()
+            if any(k in changes for k in self.LIVE_WIDGET_KEYS):
+                for widget in self.widgets:
+                    if hasattr(widget, 'destroy') and callable(widget.destroy):
+                        widget.destroy()
+                self.widgets.clear()
+                if not self.standby:  # A standby creates its widgets when playback starts
+                    self.init_widgets()
+            pending = [k for k in self.NEXT_START_KEYS if k in changes]
+            if pending:
+                logger.info(f"{', '.join(pending)} will take effect the next time the screensaver starts")
+        except Exception as e:
+            logger.error(f"Exception in _apply_config_changes: {e}")
+
+    def _create_overlay_window(self, standby):
+        # Overlay Toplevel window (transparent, always on top)
+        self.overlay_win = tk.Toplevel(self.master)
+        self.overlay_win.overrideredirect(True)
+        self.overlay_win.attributes('-topmost', True)
+        self.overlay_win.geometry(f'{self.width}x{self.height}+0+0')
+        # Windows transparency
+        if platform.system() == 'Windows':
+            self.overlay_win.attributes('-transparentcolor', self.TRANSPARENT_KEY)
+            self.overlay_win.config(bg=self.TRANSPARENT_KEY)
+            self.overlay_canvas = tk.Canvas(self.overlay_win, bg=self.TRANSPARENT_KEY, highlightthickness=0, borderwidth=0)
+        else:
+            self.overlay_win.config(bg='black')
+            self.overlay_canvas = tk.Canvas(self.overlay_win, bg='black', highlightthickness=0, borderwidth=0)
+        self.overlay_canvas.place(x=0, y=0, width=self.width, height=self.height)
+        if standby:
+            self.overlay_win.withdraw()
+
+        # Make overlay window non-interactive but keep it visible
+        # Remove the -disabled attribute as we're using WS_EX_TRANSPARENT instead
+        if platform.system() == 'Windows':
+            self.overlay_win.wm_attributes("-disabled", False)
+
+    def _setup_compositor(self):
+        """Decode into NumPy buffers through libvlc callbacks and show frame + overlays through self.label."""
+        from utils.compositor import FrameCompositor, TkSurface, VlcVideoCallbacks
+        self.compositor = FrameCompositor(self.width, self.height)
+        self.vlc_video_callbacks = VlcVideoCallbacks(self.vlc_player, self.compositor)
+        self.compositor_surface = TkSurface(self.label, self.compositor)
+        logger.info(f"Using in-process compositor at {self.width}x{self.height}")
+
+    def _present_compositor_frame(self):
+        """Composite and show the newest decoded frame; overlay changes are picked up on the next poll."""
+        try:
+            # While paused the label shows the password dialog's blurred background instead
+            if not self.playback_paused and self.compositor.compose():
+                self.compositor_surface.present()
+        except Exception as e:
+            logger.error(f"Exception in _present_compositor_frame: {e}")
+        self._present_after_id = self.master.after(self.COMPOSITOR_POLL_INTERVAL_MS, self._present_compositor_frame)
+
+    def activate(self):
+        """Show a standby screensaver and start playback."""
+        if not self.standby:
+            return
+        self.standby = False
+        try:
+            # Re-read settings that may have changed while waiting
+            self.user_config = load_config()
+            if self.overlay_win is not None:
+                self.overlay_win.deiconify()
+            self.master.attributes('-fullscreen', True)
+            self._start_playback()
+        except Exception as e:
+            logger.error(f"Exception in activate: {e}")
+
+    def _start_playback(self):
+        """Start looping playback, overlays, widgets and focus handling."""
+        try:
+            actual_video_path = self.video_path
+            screen_aspect = self.screen_aspect
+            self.master.after(100, self.init_widgets)
+
             # Start playback with looping
-            # Read last_video_timestamp from config (default to 0.0 if not present)
-            cap = cv2.VideoCapture(actual_video_path)
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            cap.release()
-            logger.info(f"vwidth & vheight: {vwidth}, {vheight}")
-            if vwidth <= 1920 and vheight <= 1080 and fps <= 30:
+            # Size/FPS come from the shared metadata index rather than a fresh demux or VLC (0x0 before decoding)
+            video_meta = get_video_metadata(actual_video_path)
+            if video_meta:
+                logger.info(f"vwidth & vheight: {video_meta['width']}, {video_meta['height']} @ {video_meta['fps']:.2f} fps")
+            # Read last_video_timestamp from the playback state file (default to 0.0 if not present)
+            resumed = False
+            if within_resume_limits(video_meta):
+                # Load the keyframes into memory now; resume and the password dialog only read them
+                ensure_keyframe_index(actual_video_path)
                 last_video_timestamp = 0.0
                 try:
-                    last_video_timestamp = float(self.user_config.get("last_video_timestamp", 0.0))
+                    last_video_timestamp = playback_state.get_float("last_video_timestamp", 0.0)
                 except Exception as e:
-                    logger.warning(f"Could not parse last_video_timestamp from config: {e}")
+                    logger.warning(f"Could not parse last_video_timestamp from playback state: {e}")
 
                
                 # Start video from last_video_timestamp (skip initial video)
                 if last_video_timestamp > 0:
-                    # Wait briefly to ensure playback has started before seeking
-                    def seek_to_last_timestamp():
-                        try:
-                            if hasattr(self, 'vlc_player') and self.vlc_player:
-                                self.vlc_player.set_time(int(last_video_timestamp * 1000))
-                                logger.info(f"Seeked video to {last_video_timestamp} seconds")
-                        except Exception as e:
-                            logger.error(f"Error seeking to last_video_timestamp: {e}")
-                    self.master.after(0, seek_to_last_timestamp)
+                    # Open the first pass at the keyframe at or before the saved position, so the first
+                    # frame shown is the resume frame (set_time() after play() flashed frame 0 and stalled)
+                    try:
+                        start_media, start_at = resume_media(self.vlc_instance, actual_video_path, last_video_timestamp)
+                        replace_loop_media(self.media_list, start_media)
+                        resumed = True
+                        logger.info(f"Resuming video at {start_at:.2f} seconds (saved {last_video_timestamp:.2f})")
+                    except Exception as e:
+                        logger.error(f"Error seeking to last_video_timestamp: {e}")
             self.media_list_player.play()
+            if resumed:
+                # Later loops start from the beginning
+                replace_loop_media(self.media_list, self.vlc_instance.media_new(actual_video_path))
+            startup_trace.mark('vlc_play_requested')
 
             # Additional video scaling configuration after playback starts
             def configure_video_after_start():
@@ -537,14 +680,17 @@ class VideoClockScreenSaver:
             
             # Schedule video configuration after a short delay to ensure video has started
             self.master.after(500, configure_video_after_start)
-            
-            # Get the event manager for the media player. This allows us to subscribe to events.
-            event_manager = self.vlc_player.event_manager()
-      
-            event_manager.event_attach(vlc.EventType.MediaPlayerPaused, handle_media_player_paused, self.vlc_player)
+
+            if self.user_config.get("power_governor_enabled", False):
+                self.power_governor = PowerGovernor(
+                    self.apply_power_profile,
+                    interval=self.user_config.get("power_governor_interval_sec", POWER_GOVERNOR_INTERVAL_SEC),
+                ).start()
 
             # Schedule overlays and ensure focus
-            self.master.after(0, self.update_overlays)
+            self._schedule_overlay_tick(0)
+            if self.compositor is not None:
+                self._present_after_id = self.master.after(0, self._present_compositor_frame)
             # Use a different approach - schedule periodic focus checks through update_overlays instead
             # Initial call to black out monitors, delayed slightly for fullscreen to establish
             if WINDOWS_MULTI_MONITOR_SUPPORT:
@@ -583,7 +729,32 @@ class VideoClockScreenSaver:
             self.master.after(0, self._check_and_restore_focus)
     
         except Exception as e:
-            logger.error(f"Exception in __init__: {e}")
+            logger.error(f"Exception in _start_playback: {e}")
+
+    def _on_media_player_paused(self, event):
+        if self.compositor is not None:
+            # No video output window to snapshot; pause_video keeps the composited clean frame instead
+            return
+        # The poster profile pauses on purpose; only a user-visible pause snapshots the wallpaper
+        if self.power_profile == 'poster' and not self.playback_paused:
+            return
+        handle_media_player_paused(event, self.vlc_player)
+
+    def apply_power_profile(self, profile):
+        """Switch playback to a governor profile ('full', 'reduced_fps', 'downscaled', 'poster') while running."""
+        self.power_profile = profile
+        if self.playback_paused:
+            return  # Applied by resume_video once the password dialog is gone
+        self._apply_power_profile_now()
+
+    def _apply_power_profile_now(self):
+        try:
+            if self.vlc_player:
+                apply_vlc_profile(self.power_profile, self.vlc_instance, self.media_list,
+                                  self.media_list_player, self.vlc_player, self.video_path)
+                self.applied_power_profile = self.power_profile
+        except Exception as e:
+            logger.error(f"Could not apply power profile '{self.power_profile}': {e}")
 
     def _check_and_restore_focus(self):
         """Check and restore focus if needed - called from update_overlays"""
@@ -755,6 +926,8 @@ class VideoClockScreenSaver:
 
                     logger.info("New tray process started, exiting current process.")
                     # Add a small delay to ensure the new process starts before we exit
+                    playback_state.flush(timeout=1.0)
+                    flush_logs()
                     time.sleep(1)
                     os._exit(0)
                 except Exception as e:
@@ -783,11 +956,12 @@ class VideoClockScreenSaver:
             self.profile_name_y_base = int(self.height * 0.85) 
             self.profile_pic_y_base = self.profile_name_y_base - self.profile_pic_size - 10
 
-            self.pre_rendered_profile_pic = self._create_pre_rendered_profile_pic()
+            with startup_trace.phase('avatar_processing'):
+                self.pre_rendered_profile_pic = self._create_pre_rendered_profile_pic()
             self.pre_rendered_username_label = self._create_pre_rendered_username_label()
             
             # GIF setup: if GIF frames exist, initialize timing
-            if self.profile_pic_is_gif and self.profile_pic_gif_frames:
+            if self._profile_pic_is_animated():
                 self.profile_pic_gif_frame_index = 0
                 self.profile_pic_gif_last_update = int(time.time() * 1000)
             
@@ -796,11 +970,7 @@ class VideoClockScreenSaver:
             self.username_label_pos = (self.profile_center_x - label_width // 2, self.profile_name_y_base)
             
             # Calculate initial clock position
-            try: 
-                clock_bbox = self.clock_font.getbbox(self.current_time_text)
-                self.clock_text_width = clock_bbox[2] - clock_bbox[0]
-            except AttributeError: 
-                self.clock_text_width, _ = self.clock_font.getsize(self.current_time_text)
+            self.clock_text_width = self._measure_clock_text(self.current_time_text)
             
             self.clock_x = (self.width - self.clock_text_width) // 2
             self.clock_y = int(self.height * 0.1)
@@ -827,17 +997,17 @@ class VideoClockScreenSaver:
                     widgets_to_create = []
                     
                     # Prepare weather widget creation (highest priority - lightweight)
-                    if config.get("enable_weather_widget", True) and WeatherWidget:
+                    if config.get("enable_weather_widget", True) and load_widget_class("weather"):
                         pincode = config.get("weather_pincode", "400068")
                         country = config.get("weather_country", "IN")
                         widgets_to_create.append(("weather", (pincode, country)))
                     
                     # Prepare stock widget creation (medium priority)
-                    if config.get("enable_stock_widget", False) and StockWidget:
+                    if config.get("enable_stock_widget", False) and load_widget_class("stock"):
                         widgets_to_create.append(("stock", config.get("stock_market", "NASDAQ")))
                     
                     # Prepare media widget creation (lower priority - more resource intensive)
-                    if config.get("enable_media_widget", False) and MediaWidget:
+                    if config.get("enable_media_widget", False) and load_widget_class("media"):
                         widgets_to_create.append(("media", None))
                     
                     # Create widgets with minimal staggering for faster startup
@@ -861,6 +1031,7 @@ class VideoClockScreenSaver:
             # Start widget creation in separate thread
             widget_thread = threading.Thread(target=create_widgets_async, daemon=True)
             widget_thread.start()
+            startup_trace.mark('widget_thread_started')
         except Exception as e:
             logger.error(f"Exception in init_widgets: {e}")
 
@@ -868,7 +1039,7 @@ class VideoClockScreenSaver:
         logger.debug(f"Called _create_weather_widget with pincode={pincode}, country={country}")
         try:
             """Create weather widget on main thread and make it sticky"""
-            weather_widget_toplevel = WeatherWidget(
+            weather_widget_toplevel = load_widget_class("weather")(
                 self.master, 
                 self.TRANSPARENT_KEY, 
                 screen_width=screen_w,
@@ -895,6 +1066,7 @@ class VideoClockScreenSaver:
         logger.debug(f"Called _create_stock_widget with market={market}")
         try:
             """Create stock widget on main thread and make it sticky"""
+            StockWidget = load_widget_class("stock")
             if StockWidget is None:
                 logger.error("StockWidget class is None - import may have failed")
                 return
@@ -923,6 +1095,7 @@ class VideoClockScreenSaver:
             logger.info(f"Stock widget (Toplevel) for {market_from_config} created.")
         except Exception as e:
             logger.error(f"Exception in _create_stock_widget: {e}")
+            StockWidget = load_widget_class("stock")
             logger.error(f"StockWidget class: {StockWidget}")
             logger.error(f"Available attributes: {dir(StockWidget) if StockWidget else 'None'}")
         
@@ -930,7 +1103,7 @@ class VideoClockScreenSaver:
         logger.debug("Called _create_media_widget")
         try:
             """Create media widget on main thread and make it sticky"""
-            media_widget_toplevel = MediaWidget(
+            media_widget_toplevel = load_widget_class("media")(
                 self.master, 
                 self.TRANSPARENT_KEY,
                 screen_width=screen_w,
@@ -963,7 +1136,7 @@ class VideoClockScreenSaver:
             self.pre_rendered_profile_pic = self._create_pre_rendered_profile_pic()
             self.pre_rendered_username_label = self._create_pre_rendered_username_label()
             # GIF setup: if GIF frames exist, initialize timing
-            if self.profile_pic_is_gif and self.profile_pic_gif_frames:
+            if self._profile_pic_is_animated():
                 self.profile_pic_gif_frame_index = 0
                 self.profile_pic_gif_last_update = int(time.time() * 1000)
             
@@ -972,11 +1145,7 @@ class VideoClockScreenSaver:
             self.username_label_pos = (self.profile_center_x - label_width // 2, self.profile_name_y_base)
             
             # Calculate initial clock position
-            try: 
-                clock_bbox = self.clock_font.getbbox(self.current_time_text)
-                self.clock_text_width = clock_bbox[2] - clock_bbox[0]
-            except AttributeError: 
-                self.clock_text_width, _ = self.clock_font.getsize(self.current_time_text)
+            self.clock_text_width = self._measure_clock_text(self.current_time_text)
             
             self.clock_x = (self.width - self.clock_text_width) // 2
             self.clock_y = int(self.height * 0.1)
@@ -1008,58 +1177,37 @@ class VideoClockScreenSaver:
                     custom_pic_path = config_pic_path
 
             loaded_custom_image = None
-            # GIF support
+            # Animated avatar support (GIF, animated WebP, APNG)
+            self._stop_profile_pic_stream()
             self.profile_pic_is_gif = False
             self.profile_pic_gif_frames = []
             self.profile_pic_gif_duration = 100
             if custom_pic_path and os.path.exists(custom_pic_path):
                 try:
-                    if custom_pic_path.lower().endswith('.gif'):
-                        gif = Image.open(custom_pic_path)
+                    is_animated, frame_count = probe_avatar(custom_pic_path)
+                    frame_budget = int(self.user_config.get("profile_pic_frame_budget", DEFAULT_FRAME_BUDGET))
+                    if is_animated and frame_count > frame_budget:
+                        # Long animation: decode ahead into a bounded ring instead of holding every frame
+                        self.profile_pic_stream = AvatarFrameStream(
+                            custom_pic_path, size, max_frames=frame_budget,
+                            palette=bool(self.user_config.get("profile_pic_palette_frames", False))
+                        ).start()
                         self.profile_pic_is_gif = True
-                        self.profile_pic_gif_frames = []
-                        durations = []
-                        try:
-                            while True:
-                                frame = gif.convert("RGBA")
-                                # Make square, but use transparent background (no black border)
-                                square_img = Image.new('RGBA', (max(frame.width, frame.height), max(frame.width, frame.height)), (0,0,0,0))
-                                paste_x = (square_img.width - frame.width) // 2
-                                paste_y = (square_img.height - frame.height) // 2
-                                square_img.paste(frame, (paste_x, paste_y))
-                                square_img = square_img.resize((size, size), Image.Resampling.LANCZOS)
-                                # Circular mask
-                                mask = Image.new('L', (size, size), 0)
-                                draw_mask = ImageDraw.Draw(mask)
-                                draw_mask.ellipse((0, 0, size, size), fill=255)
-                                circular_img = Image.new('RGBA', (size, size), (0,0,0,0))
-                                circular_img.paste(square_img, (0, 0))
-                                circular_img.putalpha(mask)
-                                self.profile_pic_gif_frames.append(circular_img)
-                                # Collect duration for each frame
-                                durations.append(gif.info.get('duration', 100))
-                                gif.seek(gif.tell() + 1)
-                        except EOFError:
-                            pass
-                        # Use the minimum duration for smoothest animation, but not less than 20ms
-                        if durations:
-                            self.profile_pic_gif_duration = max(min(durations), 20)
-                        if self.profile_pic_gif_frames:
-                            loaded_custom_image = self.profile_pic_gif_frames[0]
+                        self.profile_pic_gif_duration = self.profile_pic_stream.first_duration
+                        self.profile_pic_current_frame = self.profile_pic_stream.first_frame
+                        loaded_custom_image = self.profile_pic_stream.first_frame
+                        logger.info(f"Streaming {frame_count}-frame avatar with a {frame_budget}-frame budget")
                     else:
-                        img = Image.open(custom_pic_path).convert("RGBA")
-                        square_img = Image.new('RGBA', (max(img.width, img.height), max(img.width, img.height)), (0,0,0,0))
-                        paste_x = (square_img.width - img.width) // 2
-                        paste_y = (square_img.height - img.height) // 2
-                        square_img.paste(img, (paste_x, paste_y))
-                        square_img = square_img.resize((size, size), Image.Resampling.LANCZOS)
-                        mask = Image.new('L', (size, size), 0)
-                        draw_mask = ImageDraw.Draw(mask)
-                        draw_mask.ellipse((0, 0, size, size), fill=255)
-                        circular_img = Image.new('RGBA', (size, size), (0,0,0,0))
-                        circular_img.paste(square_img, (0, 0))
-                        circular_img.putalpha(mask)
-                        loaded_custom_image = circular_img
+                        # Processed frames come from the on-disk sprite cache when the source is unchanged
+                        frames, durations = load_avatar_frames(custom_pic_path, size, animate=is_animated)
+                        if is_animated:
+                            self.profile_pic_is_gif = True
+                            self.profile_pic_gif_frames = frames
+                            # Use the minimum duration for smoothest animation, but not less than 20ms
+                            if durations:
+                                self.profile_pic_gif_duration = max(min(durations), 20)
+                        if frames:
+                            loaded_custom_image = frames[0]
                 except Exception as e:
                     logger.error(f"Error loading or processing custom profile picture '{custom_pic_path}': {e}")
                     loaded_custom_image = None
@@ -1139,8 +1287,8 @@ class VideoClockScreenSaver:
         logger.debug("Called _process_frame_with_ui")
         try:
             """Optimized frame processing with minimal overhead"""
-            # Store the raw frame before adding UI elements
-            self.last_raw_frame = pil_img.copy()
+            # Store the raw frame before adding UI elements (into a preallocated ring slot)
+            self.frame_ring.write(pil_img)
 
             if not self.first_frame_received:
                 # This path is taken for the very first frame.
@@ -1150,13 +1298,7 @@ class VideoClockScreenSaver:
             frame = pil_img
 
             # Profile pic rendering (GIF support)
-            profile_pic_img = self.pre_rendered_profile_pic
-            if self.profile_pic_is_gif and self.profile_pic_gif_frames:
-                now_ms = int(time.time() * 1000)
-                if now_ms - self.profile_pic_gif_last_update >= self.profile_pic_gif_duration:
-                    self.profile_pic_gif_frame_index = (self.profile_pic_gif_frame_index + 1) % len(self.profile_pic_gif_frames)
-                    self.profile_pic_gif_last_update = now_ms
-                profile_pic_img = self.profile_pic_gif_frames[self.profile_pic_gif_frame_index]
+            profile_pic_img = self._advance_profile_pic_frame()
 
             if profile_pic_img and self.pre_rendered_username_label:
                 profile_pic_pos_int = (int(self.profile_pic_pos[0]), int(self.profile_pic_pos[1]))
@@ -1165,125 +1307,219 @@ class VideoClockScreenSaver:
                 frame.paste(self.pre_rendered_username_label, username_label_pos_int, self.pre_rendered_username_label)
 
             # Highly optimized clock rendering - update less frequently
-            current_time_ms = int(time.time() * 1000)
-            if current_time_ms - self.last_clock_update >= 1000:  # Update every second
-                new_time_text = time.strftime('%I:%M:%S %p')
-                if new_time_text != self.current_time_text:  # Only update if time actually changed
-                    self.current_time_text = new_time_text
-                    
-                    # Cache clock dimensions - ensure we have width and height before calculating position
-                    try: 
-                        clock_bbox = self.clock_font.getbbox(self.current_time_text)
-                        self.clock_text_width = clock_bbox[2] - clock_bbox[0]
-                    except AttributeError: 
-                        self.clock_text_width, _ = self.clock_font.getsize(self.current_time_text)
-                    
-                    # Only calculate position if we have valid frame dimensions
-                    # self.width and self.height should be correctly set by _initialize_ui_elements_after_first_frame
-                    if self.width > 0 and self.height > 0:
-                        self.clock_x = (self.width - self.clock_text_width) // 2
-                        self.clock_y = int(self.height * 0.1)
-                    # The else fallback for clock_x=50 is less likely to be needed now for initial positioning.
-                    # else:
-                    #     self.clock_x = 50 
-                    #     self.clock_y = 50
-                
-                self.last_clock_update = current_time_ms
+            self._update_clock_text()
             
             # Draw clock with cached positions - self.clock_x and self.clock_y should be correctly initialized
             # by _initialize_ui_elements_after_first_frame before this drawing part is reached for the first time with UI.
-            draw = ImageDraw.Draw(frame)
-            shadow_offset = 2
-            draw.text((int(self.clock_x + shadow_offset), int(self.clock_y + shadow_offset)), 
-                     self.current_time_text, font=self.clock_font, fill=(0,0,0,128))
-            draw.text((int(self.clock_x), int(self.clock_y)), 
-                     self.current_time_text, font=self.clock_font, fill=(255,255,255,220))
+            atlas = self._get_clock_atlas()
+            if atlas:
+                atlas.paste_onto(frame, (self.clock_x, self.clock_y), self.current_time_text)
+            else:
+                draw = ImageDraw.Draw(frame)
+                shadow_offset = 2
+                draw.text((int(self.clock_x + shadow_offset), int(self.clock_y + shadow_offset)), 
+                         self.current_time_text, font=self.clock_font, fill=(0,0,0,128))
+                draw.text((int(self.clock_x), int(self.clock_y)), 
+                         self.current_time_text, font=self.clock_font, fill=(255,255,255,220))
             
             return frame
         except Exception as e:
             logger.error(f"Exception in _process_frame_with_ui: {e}")
 
+    def _update_clock_text(self):
+        """Refresh the clock string when the wall-clock second changes and recompute its position."""
+        now = time.time()
+        current_second = int(now)
+        if current_second == self.last_clock_second:
+            return False
+        self.last_clock_second = current_second
+        self.last_clock_update = int(now * 1000)
+        new_time_text = time.strftime('%I:%M:%S %p')
+        if new_time_text == self.current_time_text:  # Only update if time actually changed
+            return False
+        self.current_time_text = new_time_text
+
+        # Cache clock dimensions - ensure we have width and height before calculating position
+        self.clock_text_width = self._measure_clock_text(self.current_time_text)
+
+        # self.width and self.height are set by _initialize_ui_elements_* before the first draw
+        if self.width > 0 and self.height > 0:
+            self.clock_x = (self.width - self.clock_text_width) // 2
+            self.clock_y = int(self.height * 0.1)
+        return True
+
+    def _profile_pic_is_animated(self):
+        return self.profile_pic_is_gif and (bool(self.profile_pic_gif_frames) or self.profile_pic_stream is not None)
+
+    def _stop_profile_pic_stream(self):
+        if self.profile_pic_stream is not None:
+            self.profile_pic_stream.stop()
+            self.profile_pic_stream = None
+
+    def _advance_profile_pic_frame(self):
+        """Return the profile picture to show now, stepping animated avatars by their frame duration."""
+        if self.profile_pic_stream is not None:
+            now_ms = int(time.time() * 1000)
+            if now_ms - self.profile_pic_gif_last_update >= self.profile_pic_gif_duration:
+                next_frame = self.profile_pic_stream.next_frame()
+                if next_frame is not None:  # Decoder behind: keep showing the current frame
+                    self.profile_pic_current_frame, self.profile_pic_gif_duration = next_frame
+                    self.profile_pic_gif_frame_index += 1
+                self.profile_pic_gif_last_update = now_ms
+            return self.profile_pic_current_frame
+        if self.profile_pic_is_gif and self.profile_pic_gif_frames:
+            now_ms = int(time.time() * 1000)
+            if now_ms - self.profile_pic_gif_last_update >= self.profile_pic_gif_duration:
+                self.profile_pic_gif_frame_index = (self.profile_pic_gif_frame_index + 1) % len(self.profile_pic_gif_frames)
+                self.profile_pic_gif_last_update = now_ms
+            return self.profile_pic_gif_frames[self.profile_pic_gif_frame_index]
+        return self.pre_rendered_profile_pic
+
+    def _get_clock_atlas(self):
+        """Glyph atlas for the clock font, built once per (font, size, colour)."""
+        if self.clock_atlas is None:
+            try:
+                self.clock_atlas = get_clock_atlas(self.clock_font)
+            except Exception as e:
+                logger.warning(f"Could not build clock glyph atlas, falling back to text rendering: {e}")
+                self.clock_atlas = False
+        return self.clock_atlas or None
+
+    def _measure_clock_text(self, text):
+        atlas = self._get_clock_atlas()
+        if atlas:
+            return atlas.measure(text)
+        try:
+            clock_bbox = self.clock_font.getbbox(text)
+            return clock_bbox[2] - clock_bbox[0]
+        except AttributeError:
+            return self.clock_font.getsize(text)[0]
+
+    def _render_clock_image(self):
+        """Render the current clock text (with drop shadow) to an RGBA image for the overlay canvas."""
+        atlas = self._get_clock_atlas()
+        if atlas:
+            return atlas.render(self.current_time_text)
+        clock_img = Image.new('RGBA', (self.clock_text_width+20, self.clock_font_size+20), (0,0,0,0))
+        draw = ImageDraw.Draw(clock_img)
+        shadow_offset = 2
+        draw.text((shadow_offset, shadow_offset), self.current_time_text, font=self.clock_font, fill=(0,0,0,128))
+        draw.text((0, 0), self.current_time_text, font=self.clock_font, fill=(255,255,255,220))
+        return clock_img
+
+    def _reassert_overlay_window(self):
+        """Keep the overlay window transparent, topmost and non-interactive (Windows only)."""
+        if self.overlay_win is not None and platform.system() == 'Windows':
+            self.overlay_win.config(bg=self.TRANSPARENT_KEY)
+            self.overlay_canvas.config(bg=self.TRANSPARENT_KEY)
+            self.overlay_win.attributes('-topmost', True)
+            self.overlay_win.wm_attributes("-disabled", False)
+
     def update_overlays(self):
         # logger.debug("Called update_overlays")
         try:
-            """Draw overlays (clock, profile, widgets) over VLC video using a transparent Canvas."""
-            # Ensure overlay window is properly configured and stays on top
-            if platform.system() == 'Windows':
-                self.overlay_win.config(bg=self.TRANSPARENT_KEY)
-                self.overlay_canvas.config(bg=self.TRANSPARENT_KEY)
-                # Ensure overlay stays on top and non-interactive
-                self.overlay_win.attributes('-topmost', True)
-                self.overlay_win.wm_attributes("-disabled", False)
-            
-            # Clear previous overlays
-            self.overlay_canvas.delete('all')
+            """Draw overlays (clock, profile, widgets) over VLC video using a transparent Canvas.
 
+            Canvas items are retained between ticks (see OverlayLayer); a tick only
+            touches Tk when the clock text, GIF frame or a position has changed.
+            """
+            tick_started = time.perf_counter()
             # Only proceed if UI elements are initialized
             if not self.first_frame_received:
-                self.master.after(30, self.update_overlays)
+                self._schedule_overlay_tick(30)
                 return
 
-            # Update clock text if needed
-            current_time_ms = int(time.time() * 1000)
-            if current_time_ms - self.last_clock_update >= 1000:
-                new_time_text = time.strftime('%I:%M:%S %p')
-                if new_time_text != self.current_time_text:
-                    self.current_time_text = new_time_text
-                    try:
-                        clock_bbox = self.clock_font.getbbox(self.current_time_text)
-                        self.clock_text_width = clock_bbox[2] - clock_bbox[0]
-                    except AttributeError:
-                        self.clock_text_width, _ = self.clock_font.getsize(self.current_time_text)
-                    if self.width > 0 and self.height > 0:
-                        self.clock_x = (self.width - self.clock_text_width) // 2
-                        self.clock_y = int(self.height * 0.1)
-                self.last_clock_update = current_time_ms
-
-            # Render clock with PIL and display on canvas
-            clock_img = Image.new('RGBA', (self.clock_text_width+20, self.clock_font_size+20), (0,0,0,0))
-            draw = ImageDraw.Draw(clock_img)
-            shadow_offset = 2
-            draw.text((shadow_offset, shadow_offset), self.current_time_text, font=self.clock_font, fill=(0,0,0,128))
-            draw.text((0, 0), self.current_time_text, font=self.clock_font, fill=(255,255,255,220))
-            self.clock_tk_img = ImageTk.PhotoImage(clock_img)
-            self.overlay_canvas.create_image(self.clock_x, self.clock_y, anchor='nw', image=self.clock_tk_img)
+            if self.overlay_layer is None:
+                if self.compositor is not None:
+                    # Same update() contract: sprites are blended into the video frames
+                    self.overlay_layer = self.compositor
+                else:
+                    self.overlay_canvas.delete('all')
+                    self.overlay_layer = OverlayLayer(self.overlay_canvas)
+                    self._reassert_overlay_window()
+
+            # Update clock text if needed; the image is only re-rendered when the text changes
+            self._update_clock_text()
+            atlas = self._get_clock_atlas()
+            clock_x = self.clock_x - atlas.left_pad if atlas else self.clock_x
+            self.overlay_layer.update('clock', (clock_x, self.clock_y),
+                                      self.current_time_text, self._render_clock_image)
 
             # Profile pic and username rendering
             if self.pre_rendered_profile_pic and self.pre_rendered_username_label:
                 # Handle GIF animation
-                profile_pic_img = self.pre_rendered_profile_pic
-                if self.profile_pic_is_gif and self.profile_pic_gif_frames:
-                    now_ms = int(time.time() * 1000)
-                    if now_ms - self.profile_pic_gif_last_update >= self.profile_pic_gif_duration:
-                        self.profile_pic_gif_frame_index = (self.profile_pic_gif_frame_index + 1) % len(self.profile_pic_gif_frames)
-                        self.profile_pic_gif_last_update = now_ms
-                    profile_pic_img = self.profile_pic_gif_frames[self.profile_pic_gif_frame_index]
-                
-                self.profile_pic_tk_img = ImageTk.PhotoImage(profile_pic_img)
-                self.overlay_canvas.create_image(self.profile_pic_pos[0], self.profile_pic_pos[1], anchor='nw', image=self.profile_pic_tk_img)
-                
-                self.username_label_tk_img = ImageTk.PhotoImage(self.pre_rendered_username_label)
-                self.overlay_canvas.create_image(self.username_label_pos[0], self.username_label_pos[1], anchor='nw', image=self.username_label_tk_img)
-
-            # Ensure main window maintains focus for key events
-            if not hasattr(self, '_focus_check_count'):
-                self._focus_check_count = 0
-            
-            # Reduce frequency of focus checks and only when focus management is active
-            if self._focus_check_count % 33 == 0 and self.focus_management_active:  # Check every ~1 second (33 * 30ms)
-                self._check_and_restore_focus()
-            self._focus_check_count += 1
-
-            # Schedule next overlay update
-            self.master.after(30, self.update_overlays)
+                profile_pic_img = self._advance_profile_pic_frame()
+                profile_pic_key = self.profile_pic_gif_frame_index if self.profile_pic_is_gif else 0
+                self.overlay_layer.update('profile_pic', self.profile_pic_pos,
+                                          profile_pic_key, lambda: profile_pic_img)
+                self.overlay_layer.update('username_label', self.username_label_pos,
+                                          self.username, lambda: self.pre_rendered_username_label)
+
+            if startup_trace.active:
+                # Idle callbacks run after Tk has redrawn the canvas, i.e. once the frame is composited
+                self.master.after_idle(startup_trace.finish)
+
+            # Ensure main window maintains focus for key events, about once a second
+            now_ms = int(time.time() * 1000)
+            if now_ms >= self._next_focus_check_ms:
+                self._reassert_overlay_window()
+                if self.focus_management_active:
+                    self._check_and_restore_focus()
+                # Align to a second boundary so the check shares a wakeup with the clock flip
+                next_check_ms = now_ms + self.OVERLAY_FOCUS_CHECK_INTERVAL_MS
+                self._next_focus_check_ms = (next_check_ms // 1000) * 1000 + self.OVERLAY_SECOND_GUARD_MS
+
+            self.overlay_timing.record(self._overlay_deadline, tick_started, time.perf_counter())
+            # Sleep until the next thing that can actually change on screen
+            self._schedule_overlay_tick(self._next_overlay_delay_ms())
         except Exception as e:
             logger.error(f"Exception in update_overlays: {e}")
 
-    def close(self):   
-        release_lock()
+    def _schedule_overlay_tick(self, delay_ms):
+        self._overlay_deadline = time.perf_counter() + delay_ms / 1000.0
+        self._overlay_after_id = self.master.after(delay_ms, self.update_overlays)
+
+    def get_overlay_timing(self):
+        """Overlay tick lateness and duration since start: p50/p95/p99/max (ms) and ticks over budget."""
+        return self.overlay_timing.summary()
+
+    def _next_overlay_delay_ms(self):
+        """Milliseconds until the nearest overlay deadline: next second, next GIF frame or next focus check."""
+        now = time.time()
+        now_ms = now * 1000
+        deadlines = [
+            (int(now) + 1) * 1000 + self.OVERLAY_SECOND_GUARD_MS,
+            self._next_focus_check_ms,
+        ]
+        if self._profile_pic_is_animated():
+            deadlines.append(self.profile_pic_gif_last_update + self.profile_pic_gif_duration)
+        delay = min(deadlines) - now_ms
+        return max(self.OVERLAY_MIN_DELAY_MS, int(math.ceil(delay)))
+
+    def close(self, release_app_lock=True):   
+        if release_app_lock:
+            release_lock()
         logger.debug("Called close")
         try:
             """Clean shutdown of the screensaver"""
+            if self._overlay_after_id is not None:
+                try:
+                    self.master.after_cancel(self._overlay_after_id)
+                except Exception:
+                    pass
+                self._overlay_after_id = None
+            self.overlay_timing.log_window()  # Short sessions never reach a full log interval
+            self.config_subscription.unsubscribe()
+            if self._present_after_id is not None:
+                try:
+                    self.master.after_cancel(self._present_after_id)
+                except Exception:
+                    pass
+                self._present_after_id = None
+            self._stop_profile_pic_stream()
+            if self.power_governor:
+                self.power_governor.stop()
+                self.power_governor = None
             logger.info("Closing VideoClockScreenSaver and its widgets...")
             # Clean up widgets        
             if hasattr(self, 'widgets'):
@@ -1299,6 +1535,9 @@ class VideoClockScreenSaver:
             # Non-blocking VLC cleanup with timeout
             def cleanup_vlc():
                 try:
+                    # A queued pause snapshot still uses the player
+                    if not image_exporter.flush(timeout=2.0):
+                        logger.warning("Image export still running while stopping VLC")
                     if hasattr(self, 'vlc_player') and self.vlc_player:
                         logger.info("Stopping VLC player...")
                         self.vlc_player.stop()
@@ -1345,6 +1584,18 @@ class VideoClockScreenSaver:
         logger.debug("Pausing VLC video playback")
         try:
             if hasattr(self, 'vlc_player') and self.vlc_player:
+                self.playback_paused = True
+                if getattr(self, 'compositor', None) is not None:
+                    # Clean and composited frames for the lock screen and the password dialog's glass blur
+                    clean_frame = self.compositor.frame_image()
+                    if clean_frame is not None:
+                        self.frame_ring.write(clean_frame)
+                    self.last_processed_frame = self.compositor.output_image().copy()
+                if getattr(self, 'power_profile', 'full') == 'poster':
+                    # Already paused by the power governor, so no Paused event will snapshot the frame
+                    if getattr(self, 'compositor', None) is None:
+                        handle_media_player_paused(None, self.vlc_player)
+                    return
                 self.vlc_player.set_pause(1)
         except Exception as e:
             logger.error(f"Exception in pause_video: {e}")
@@ -1355,6 +1606,16 @@ class VideoClockScreenSaver:
         logger.debug("Resuming VLC video playback")
         try:
             if hasattr(self, 'vlc_player') and self.vlc_player:
+                self.playback_paused = False
+                if getattr(self, 'compositor_surface', None) is not None:
+                    # The password dialog replaced the label image with the blurred frame
+                    self.label.config(image=self.compositor_surface.photo)
+                if getattr(self, 'power_profile', 'full') != getattr(self, 'applied_power_profile', 'full'):
+                    # The governor changed profile while the dialog was up
+                    self._apply_power_profile_now()
+                    return
+                if getattr(self, 'power_profile', 'full') == 'poster':
+                    return
                 self.vlc_player.set_pause(0)
         except Exception as e:
             logger.error(f"Exception in resume_video: {e}")
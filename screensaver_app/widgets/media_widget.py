@@ -23,6 +23,7 @@ if parent_dir not in sys.path:
 
 from screensaver_app.central_logger import get_logger, log_startup, log_shutdown, log_exception
 logger = get_logger('MediaWidget')
+poll_logger = get_logger('MediaWidget.poll')  # Rate-limited: call sites that run in loops or timers
 
 # Add imports for Windows SDK (only used on Windows)
 WINSDK_AVAILABLE = False
@@ -374,7 +375,7 @@ class MediaWidget:
                 result = self._check_macos_chrome_fast()
             
             # Debug output for troubleshooting            if result:
-                logger.debug(f"Detected media: {result}")
+                poll_logger.debug("Detected media: %s", result)
                 
             # Cache the result
             self.detection_cache = result
@@ -0,0 +1,138 @@
+"""
+On-disk cache of processed profile pictures.
+
+Processing an avatar (pad to square, LANCZOS resize, circular mask) for every
+frame of an animated GIF is expensive and used to happen on every screensaver
+start. The processed frames are stored as a single horizontal sprite-sheet PNG
+with the frame durations embedded as a text chunk, keyed by source path, mtime,
+size and target size, so later starts load them with one read.
+"""
+import hashlib
+import json
+import os
+
+from PIL import Image, ImageDraw, PngImagePlugin
+from screensaver_app.central_logger import get_logger
+from utils.config_utils import get_cache_dir
+logger = get_logger('utils.avatar_cache')
+
+CACHE_FORMAT_VERSION = 1
+MAX_CACHE_ENTRIES = 8
+DEFAULT_FRAME_DURATION_MS = 100
+_META_KEY = 'motionsaver-avatar'
+
+_mask_cache = {}
+
+
+def _circle_mask(size):
+    mask = _mask_cache.get(size)
+    if mask is None:
+        mask = Image.new('L', (size, size), 0)
+        ImageDraw.Draw(mask).ellipse((0, 0, size, size), fill=255)
+        _mask_cache[size] = mask
+    return mask
+
+
+def make_circular_avatar(img, size):
+    """Pad `img` to a transparent square, resize it to `size` and apply a circular mask."""
+    frame = img.convert('RGBA')
+    side = max(frame.width, frame.height)
+    square_img = Image.new('RGBA', (side, side), (0, 0, 0, 0))
+    square_img.paste(frame, ((side - frame.width) // 2, (side - frame.height) // 2))
+    square_img = square_img.resize((size, size), Image.Resampling.LANCZOS)
+    circular_img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    circular_img.paste(square_img, (0, 0))
+    circular_img.putalpha(_circle_mask(size))
+    return circular_img
+
+
+def _cache_path(source_path, size):
+    st = os.stat(source_path)
+    key = f"{CACHE_FORMAT_VERSION}|{os.path.abspath(source_path)}|{st.st_mtime_ns}|{st.st_size}|{size}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+    return os.path.join(get_cache_dir('avatars'), f"{digest}_{size}.png")
+
+
+def _decode_and_process(source_path, size, animate):
+    frames = []
+    durations = []
+    with Image.open(source_path) as src:
+        if not animate:
+            return [make_circular_avatar(src, size)], [DEFAULT_FRAME_DURATION_MS]
+        try:
+            while True:
+                frames.append(make_circular_avatar(src, size))
+                durations.append(src.info.get('duration', DEFAULT_FRAME_DURATION_MS) or DEFAULT_FRAME_DURATION_MS)
+                src.seek(src.tell() + 1)
+        except EOFError:
+            pass
+    return frames, durations
+
+
+def _read_sheet(path, size):
+    with Image.open(path) as sheet:
+        meta = json.loads(sheet.text.get(_META_KEY, '{}'))
+        sheet.load()
+        count = int(meta.get('frames', 0))
+        durations = meta.get('durations', [])
+        if count <= 0 or sheet.height != size or sheet.width != size * count or len(durations) != count:
+            raise ValueError("sprite sheet does not match its metadata")
+        rgba = sheet.convert('RGBA')
+    frames = [rgba.crop((i * size, 0, (i + 1) * size, size)) for i in range(count)]
+    return frames, durations
+
+
+def _write_sheet(path, frames, durations, size):
+    sheet = Image.new('RGBA', (size * len(frames), size), (0, 0, 0, 0))
+    for i, frame in enumerate(frames):
+        sheet.paste(frame, (i * size, 0))
+    info = PngImagePlugin.PngInfo()
+    info.add_text(_META_KEY, json.dumps({'frames': len(frames), 'durations': durations}))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    # Low compression: this is a local cache, decode speed matters more than size
+    sheet.save(tmp_path, format='PNG', pnginfo=info, compress_level=1)
+    os.replace(tmp_path, path)
+    _prune(os.path.dirname(path))
+
+
+def _prune(cache_dir):
+    try:
+        entries = [os.path.join(cache_dir, f) for f in os.listdir(cache_dir) if f.endswith('.png')]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for stale in entries[MAX_CACHE_ENTRIES:]:
+            os.remove(stale)
+    except OSError as e:
+        logger.debug(f"Avatar cache prune skipped: {e}")
+
+
+def load_avatar_frames(source_path, size, animate=None):
+    """
+    Return (frames, durations_ms) for the processed avatar at `source_path`.
+
+    `animate` defaults to True for .gif sources; otherwise only the first frame
+    is used. Frames come from the on-disk cache when the source is unchanged,
+    and are processed and cached otherwise. Cache failures are logged and never
+    prevent the avatar from loading.
+    """
+    if animate is None:
+        animate = source_path.lower().endswith('.gif')
+
+    cache_path = None
+    try:
+        cache_path = _cache_path(source_path, size)
+        if os.path.exists(cache_path):
+            frames, durations = _read_sheet(cache_path, size)
+            logger.debug(f"Loaded {len(frames)} avatar frame(s) from cache: {cache_path}")
+            return frames, durations
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable avatar cache entry {cache_path}: {e}")
+
+    frames, durations = _decode_and_process(source_path, size, animate)
+
+    if cache_path and frames:
+        try:
+            _write_sheet(cache_path, frames, durations, size)
+            logger.debug(f"Cached {len(frames)} avatar frame(s) to {cache_path}")
+        except Exception as e:
+            logger.warning(f"Could not write avatar cache {cache_path}: {e}")
+    return frames, durations
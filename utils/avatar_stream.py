@@ -0,0 +1,126 @@
+"""
+Bounded-memory streaming decoder for long animated profile pictures.
+
+Short animations are fully decoded (and cached on disk by utils.avatar_cache).
+Animations with more frames than the configured budget are instead decoded on
+a worker thread into a small ring of processed frames, so memory stays flat no
+matter how long the source is. GIF, animated WebP and APNG are supported via
+Pillow's common multi-frame API.
+"""
+import collections
+import threading
+
+from PIL import Image
+from screensaver_app.central_logger import get_logger
+from utils.avatar_cache import make_circular_avatar, DEFAULT_FRAME_DURATION_MS
+logger = get_logger('utils.avatar_stream')
+
+DEFAULT_FRAME_BUDGET = 64
+MIN_FRAME_DURATION_MS = 20
+
+
+def probe_avatar(source_path):
+    """Return (is_animated, frame_count) without decoding pixel data."""
+    try:
+        with Image.open(source_path) as img:
+            is_animated = bool(getattr(img, 'is_animated', False))
+            frame_count = getattr(img, 'n_frames', 1) if is_animated else 1
+            return is_animated, frame_count
+    except Exception as e:
+        logger.warning(f"Could not probe avatar '{source_path}': {e}")
+        return False, 1
+
+
+class AvatarFrameStream:
+    """
+    Decode-ahead ring of processed avatar frames.
+
+    The worker thread keeps at most `max_frames` processed frames queued and
+    loops back to the first frame at the end of the animation. The UI thread
+    calls next_frame(), which never blocks: if the worker has fallen behind it
+    returns None and the caller keeps showing the previous frame.
+    """
+
+    def __init__(self, source_path, size, max_frames=DEFAULT_FRAME_BUDGET, palette=False):
+        self.source_path = source_path
+        self.size = size
+        self.max_frames = max(2, int(max_frames))
+        self.palette = palette
+        self._ring = collections.deque()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = None
+
+        # Decode frame 0 synchronously so the first overlay has something to show
+        self._source = Image.open(source_path)
+        self.first_frame, self.first_duration = self._decode_current()
+        self._next_index = 1
+
+    def _decode_current(self):
+        frame = make_circular_avatar(self._source, self.size)
+        duration = self._source.info.get('duration', DEFAULT_FRAME_DURATION_MS) or DEFAULT_FRAME_DURATION_MS
+        return frame, max(int(duration), MIN_FRAME_DURATION_MS)
+
+    def _pack(self, frame):
+        if self.palette:
+            # Palette-indexed storage is ~4x smaller than RGBA; alpha is kept in the palette
+            return frame.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+        return frame
+
+    def _unpack(self, frame):
+        return frame.convert('RGBA') if frame.mode == 'P' else frame
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='AvatarFrameStream', daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            while True:
+                with self._cond:
+                    while not self._stopped and len(self._ring) >= self.max_frames:
+                        self._cond.wait()
+                    if self._stopped:
+                        return
+                try:
+                    self._source.seek(self._next_index)
+                    self._next_index += 1
+                except EOFError:
+                    # Loop the animation
+                    self._source.seek(0)
+                    self._next_index = 1
+                frame, duration = self._decode_current()
+                packed = self._pack(frame)
+                with self._cond:
+                    if self._stopped:
+                        return
+                    self._ring.append((packed, duration))
+        except Exception as e:
+            logger.error(f"Avatar stream decoder stopped for '{self.source_path}': {e}")
+        finally:
+            try:
+                self._source.close()
+            except Exception:
+                pass
+
+    def next_frame(self):
+        """Return (frame, duration_ms) for the next frame, or None if none is decoded yet."""
+        with self._cond:
+            if not self._ring:
+                return None
+            packed, duration = self._ring.popleft()
+            self._cond.notify()
+        return self._unpack(packed), duration
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._ring.clear()
+            self._cond.notify_all()
+        if self._thread is None:
+            try:
+                self._source.close()
+            except Exception:
+                pass
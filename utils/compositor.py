@@ -0,0 +1,320 @@
+"""
+In-process compositor for the `video_backend: "compositor"` setting.
+
+The default backend lets VLC draw into a window handle and puts the clock and
+avatar in a second full-screen Toplevel keyed on a transparent colour, which
+costs an extra composited window and fringes anti-aliased edges. Here libvlc
+decodes into preallocated NumPy buffers instead (video_set_callbacks +
+video_set_format 'RGBA'), the overlay sprites are alpha-blended into a
+preallocated output buffer, and that buffer is shown through a single Tk
+image.
+
+FrameCompositor has the same update(name, pos, content_key, render) contract
+as OverlayLayer, so the overlay loop drives either one. Any frame producer
+can feed it through acquire_write()/publish(); SyntheticFrameSource stands in
+for VLC so the compositor runs on machines without libvlc:
+
+    python -m utils.compositor [--seconds N] [--show]
+"""
+import argparse
+import threading
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from screensaver_app.central_logger import get_logger
+logger = get_logger('utils.compositor')
+
+BUFFER_COUNT = 3  # one being decoded into, one ready, one being composited
+VLC_CHROMA = 'RGBA'  # Byte order R, G, B, A: matches the output buffer and PIL's zero-copy 'RGBA' raw mode
+
+
+class FrameCompositor:
+    """
+    Decode buffers, overlay sprites and the composited output, all allocated
+    up front. Decoder threads call acquire_write()/publish(); the UI thread
+    calls update()/remove() and compose().
+    """
+
+    def __init__(self, width, height):
+        self.width = int(width)
+        self.height = int(height)
+        self.pitch = self.width * 4
+        self._buffers = [np.zeros((self.height, self.width, 4), dtype=np.uint8) for _ in range(BUFFER_COUNT)]
+        self.output = np.zeros((self.height, self.width, 4), dtype=np.uint8)
+        self.output[..., 3] = 255
+        self._lock = threading.Lock()
+        self._ready = None  # Index published by the decoder, not yet composited
+        self._current = None  # Index the output was last composited from (never handed to the decoder)
+        self._next_write = 0
+        self._layers = {}  # name -> {'key', 'pos', 'size', 'premul', 'inv_alpha', 'scratch'}
+        self._dirty = True
+        self.frames_published = 0
+        self.frames_composited = 0
+
+    # -- decoder side -----------------------------------------------------------
+
+    def acquire_write(self):
+        """Index of a buffer the decoder may fill (neither ready nor being composited)."""
+        with self._lock:
+            for _ in range(BUFFER_COUNT):
+                index = self._next_write
+                self._next_write = (self._next_write + 1) % BUFFER_COUNT
+                if index != self._ready and index != self._current:
+                    return index
+        return index  # Unreachable with three buffers
+
+    def buffer(self, index):
+        return self._buffers[index]
+
+    def buffer_address(self, index):
+        return self._buffers[index].ctypes.data
+
+    def publish(self, index):
+        """Mark buffer `index` as the newest decoded frame; an uncomposited older frame is dropped."""
+        with self._lock:
+            self._ready = index
+            self.frames_published += 1
+
+    # -- UI side ----------------------------------------------------------------
+
+    def update(self, name, pos, content_key, render):
+        """Place sprite `name` at `pos`; `render()` (an RGBA PIL image) only runs when `content_key` changes."""
+        pos = (int(pos[0]), int(pos[1]))
+        layer = self._layers.get(name)
+        changed = False
+        if layer is None or layer['key'] != content_key:
+            pil_img = render()
+            if pil_img is None:
+                return False
+            rgba = np.asarray(pil_img.convert('RGBA') if pil_img.mode != 'RGBA' else pil_img, dtype=np.uint16)
+            alpha = rgba[..., 3:4]
+            size = (rgba.shape[1], rgba.shape[0])
+            if layer is None or layer['size'] != size:
+                layer = self._layers[name] = {
+                    'size': size,
+                    'premul': np.empty((size[1], size[0], 3), dtype=np.uint16),
+                    'inv_alpha': np.empty((size[1], size[0], 1), dtype=np.uint16),
+                    'scratch': np.empty((size[1], size[0], 3), dtype=np.uint16),
+                }
+            # src * a + 127 (rounding), so blending is ((dst * (255 - a)) + premul) // 255 in uint16
+            np.multiply(rgba[..., :3], alpha, out=layer['premul'])
+            layer['premul'] += 127
+            np.subtract(255, alpha, out=layer['inv_alpha'])
+            layer['key'] = content_key
+            layer['pos'] = pos
+            changed = True
+        elif layer['pos'] != pos:
+            layer['pos'] = pos
+            changed = True
+        if changed:
+            self._dirty = True
+        return changed
+
+    def remove(self, name):
+        if self._layers.pop(name, None) is not None:
+            self._dirty = True
+
+    def clear(self):
+        self._layers.clear()
+        self._dirty = True
+
+    def compose(self):
+        """Blend the newest frame and all sprites into `output`. Returns False if nothing changed."""
+        with self._lock:
+            if self._ready is not None:
+                self._current, self._ready = self._ready, None
+                new_frame = True
+            else:
+                new_frame = False
+        if not new_frame and not self._dirty:
+            return False
+
+        if self._current is not None:
+            np.copyto(self.output, self._buffers[self._current])
+        for layer in self._layers.values():
+            self._blend(layer)
+        self._dirty = False
+        self.frames_composited += 1
+        return True
+
+    def _blend(self, layer):
+        x, y = layer['pos']
+        w, h = layer['size']
+        # Clip against the output; all slices below are views
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(self.width, x + w), min(self.height, y + h)
+        if x0 >= x1 or y0 >= y1:
+            return
+        sx, sy = x0 - x, y0 - y
+        sprite = (slice(sy, sy + y1 - y0), slice(sx, sx + x1 - x0))
+        dst = self.output[y0:y1, x0:x1, :3]
+        scratch = layer['scratch'][sprite]
+        np.multiply(dst, layer['inv_alpha'][sprite], out=scratch)
+        scratch += layer['premul'][sprite]
+        scratch //= 255
+        np.copyto(dst, scratch, casting='unsafe')
+
+    def frame_image(self):
+        """Zero-copy PIL view of the last composited clean frame (no overlays), or None. UI thread only."""
+        if self._current is None:
+            return None
+        return Image.frombuffer('RGBA', (self.width, self.height), self._buffers[self._current], 'raw', 'RGBA', 0, 1)
+
+    def output_image(self):
+        """Zero-copy PIL view of the composited output; reflects every later compose()."""
+        return Image.frombuffer('RGBA', (self.width, self.height), self.output, 'raw', 'RGBA', 0, 1)
+
+
+class TkSurface:
+    """Shows a compositor's output in a Tk label through one PhotoImage that is updated in place."""
+
+    def __init__(self, label, compositor):
+        from PIL import ImageTk
+        self.compositor = compositor
+        self._view = compositor.output_image()
+        self.photo = ImageTk.PhotoImage(self._view)
+        label.config(image=self.photo)
+
+    def present(self):
+        self.photo.paste(self._view)
+
+
+class VlcVideoCallbacks:
+    """Routes a libvlc media player's decoded frames into a FrameCompositor."""
+
+    def __init__(self, player, compositor):
+        import vlc
+        self.compositor = compositor
+        # Keep the ctypes callbacks referenced for as long as the player may call them
+        self._lock_cb = vlc.CallbackDecorators.VideoLockCb(self._lock)
+        self._unlock_cb = vlc.CallbackDecorators.VideoUnlockCb(self._unlock)
+        self._display_cb = vlc.CallbackDecorators.VideoDisplayCb(self._display)
+        player.video_set_callbacks(self._lock_cb, self._unlock_cb, self._display_cb, None)
+        # VLC scales to this size, which also replaces the aspect-ratio stretch of the window backend
+        player.video_set_format(VLC_CHROMA, compositor.width, compositor.height, compositor.pitch)
+
+    def _lock(self, opaque, planes):
+        index = self.compositor.acquire_write()
+        planes[0] = self.compositor.buffer_address(index)
+        return index + 1  # Picture handle passed back to display(); must not be NULL
+
+    def _unlock(self, opaque, picture, planes):
+        pass
+
+    def _display(self, opaque, picture):
+        if picture:
+            self.compositor.publish(picture - 1)
+
+
+def render_test_frame(buf, frame_number, gradient):
+    """Fill `buf` with a horizontally scrolling gradient without allocating."""
+    width = buf.shape[1]
+    shift = (frame_number * 8) % width
+    buf[:, :width - shift, 0] = gradient[shift:]
+    buf[:, width - shift:, 0] = gradient[:shift]
+    buf[..., 1] = (frame_number * 2) % 256
+    buf[..., 2] = 96
+    buf[..., 3] = 255
+
+
+class SyntheticFrameSource:
+    """Stands in for VLC: renders test frames into the compositor at `fps` on a background thread."""
+
+    def __init__(self, compositor, fps=30):
+        self.compositor = compositor
+        self.fps = fps
+        self._stop = threading.Event()
+        self._thread = None
+        self._gradient = np.linspace(0, 255, compositor.width).astype(np.uint8)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='SyntheticFrameSource', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        frame_number = 0
+        interval = 1.0 / self.fps
+        next_frame = time.perf_counter()
+        while not self._stop.is_set():
+            index = self.compositor.acquire_write()
+            render_test_frame(self.compositor.buffer(index), frame_number, self._gradient)
+            self.compositor.publish(index)
+            frame_number += 1
+            next_frame += interval
+            self._stop.wait(max(0.0, next_frame - time.perf_counter()))
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+
+def _test_sprite(text, size=(360, 96)):
+    sprite = Image.new('RGBA', size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sprite)
+    draw.rounded_rectangle((0, 0, size[0] - 1, size[1] - 1), radius=18, fill=(0, 0, 0, 110))
+    draw.text((20, size[1] // 3), text, fill=(255, 255, 255, 230))
+    return sprite
+
+
+def _demo():
+    parser = argparse.ArgumentParser(description="Run the compositor on synthetic frames")
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--show', action='store_true', help="present through a Tk window")
+    args = parser.parse_args()
+
+    compositor = FrameCompositor(args.width, args.height)
+    source = SyntheticFrameSource(compositor, args.fps).start()
+    timings = []
+
+    def tick(now):
+        text = time.strftime('%I:%M:%S %p', time.localtime(now))
+        compositor.update('clock', ((args.width - 360) // 2, int(args.height * 0.1)), text, lambda: _test_sprite(text))
+        compositor.update('avatar', ((args.width - 96) // 2, int(args.height * 0.75)), 0,
+                          lambda: _test_sprite('avatar', (96, 96)))
+        start = time.perf_counter()
+        changed = compositor.compose()
+        if changed:
+            timings.append((time.perf_counter() - start) * 1000.0)
+        return changed
+
+    if args.show:
+        import tkinter as tk
+        root = tk.Tk()
+        label = tk.Label(root, borderwidth=0, highlightthickness=0)
+        label.pack()
+        surface = TkSurface(label, compositor)
+        deadline = time.time() + args.seconds
+
+        def loop():
+            if tick(time.time()):
+                surface.present()
+            if time.time() < deadline:
+                root.after(max(1, 1000 // (args.fps * 2)), loop)
+            else:
+                root.destroy()
+        root.after(0, loop)
+        root.mainloop()
+    else:
+        deadline = time.time() + args.seconds
+        while time.time() < deadline:
+            tick(time.time())
+            time.sleep(1.0 / (args.fps * 2))
+    source.stop()
+
+    timings.sort()
+    if timings:
+        p50 = timings[len(timings) // 2]
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f"{args.width}x{args.height}: {compositor.frames_published} frames published, "
+              f"{compositor.frames_composited} composited; compose p50 {p50:.2f} ms, p95 {p95:.2f} ms")
+
+
+if __name__ == '__main__':
+    _demo()
@@ -6,6 +6,8 @@ import hashlib
 from screensaver_app.central_logger import get_logger, log_startup, log_shutdown, log_exception
 logger = get_logger('config_utils')
 import json 
+import copy
+import threading
 
 def find_user_config_path():
     """
@@ -33,12 +35,9 @@ def find_user_config_path():
     return os.path.join(start_dir, 'config', 'userconfig.json')
 
 
-def load_config():
-    """Load configuration from userconfig.json"""
-    config_path = find_user_config_path()
-    
+def _default_config():
     # Enhanced default configuration with GPU settings
-    default_config = {
+    return {
         "users": [
             {"username": DEFAULT_USERNAME, "password_hash": hashlib.sha256(DEFAULT_PASSWORD.encode()).hexdigest()}
         ],
@@ -55,63 +54,165 @@ def load_config():
         "gpu_acceleration": True,
         "video_backend": "auto"
     }
-    
-    if not os.path.exists(config_path):
-        save_config(default_config)
-        return default_config
-    
-    try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-            # Ensure essential keys exist with defaults
-            if "users" not in config or not isinstance(config["users"], list) or not config["users"]:
-                config["users"] = [{"username": DEFAULT_USERNAME, "password_hash": hashlib.sha256(DEFAULT_PASSWORD.encode()).hexdigest()}]
-            if "default_user_for_display" not in config:
-                config["default_user_for_display"] = config["users"][0].get("username", DEFAULT_USERNAME)
-            if "profile_pic_path" not in config: config["profile_pic_path"] = ""
-            if "profile_pic_path_crop" not in config: config["profile_pic_path_crop"] = config.get("profile_pic_path", "")
-            if "video_path" not in config: config["video_path"] = "video.mp4"
-            if "theme" not in config: config["theme"] = "light"
-            if "clock_font_family" not in config: config["clock_font_family"] = "Segoe UI Emoji"
-            if "clock_font_size" not in config: config["clock_font_size"] = 64
-            if "ui_font_family" not in config: config["ui_font_family"] = "Arial"
-            if "ui_font_size" not in config: config["ui_font_size"] = 18
-            # New GPU-related keys
-            if "preferred_gpu" not in config: config["preferred_gpu"] = "auto"
-            if "gpu_acceleration" not in config: config["gpu_acceleration"] = True
-            if "video_backend" not in config: config["video_backend"] = "auto"
-            return config    
-    except Exception as e:
-        logger.error(f"Error loading user config: {e}, returning hardcoded defaults.")
-        return default_config # Hardcoded fallback
+
+
+def _apply_defaults(config):
+    """Ensure essential keys exist with defaults (modifies and returns `config`)."""
+    if "users" not in config or not isinstance(config["users"], list) or not config["users"]:
+        config["users"] = [{"username": DEFAULT_USERNAME, "password_hash": hashlib.sha256(DEFAULT_PASSWORD.encode()).hexdigest()}]
+    if "default_user_for_display" not in config:
+        config["default_user_for_display"] = config["users"][0].get("username", DEFAULT_USERNAME)
+    if "profile_pic_path" not in config: config["profile_pic_path"] = ""
+    if "profile_pic_path_crop" not in config: config["profile_pic_path_crop"] = config.get("profile_pic_path", "")
+    if "video_path" not in config: config["video_path"] = "video.mp4"
+    if "theme" not in config: config["theme"] = "light"
+    if "clock_font_family" not in config: config["clock_font_family"] = "Segoe UI Emoji"
+    if "clock_font_size" not in config: config["clock_font_size"] = 64
+    if "ui_font_family" not in config: config["ui_font_family"] = "Arial"
+    if "ui_font_size" not in config: config["ui_font_size"] = 18
+    # New GPU-related keys
+    if "preferred_gpu" not in config: config["preferred_gpu"] = "auto"
+    if "gpu_acceleration" not in config: config["gpu_acceleration"] = True
+    if "video_backend" not in config: config["video_backend"] = "auto"
+    return config
+
+
+class ConfigStore:
+    """
+    Process-wide cache of userconfig.json.
+
+    The path is resolved once and the file parsed once; later reads only
+    stat() the file and re-parse it when its mtime or size changed (another
+    process, e.g. the GUI, saved it). Writes through save() update the cache
+    directly. snapshot() returns a private copy callers may modify; get() and
+    the typed getters read from memory.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._path = None
+        self._stamp = None  # (st_mtime_ns, st_size) of the parsed file
+        self._raw = None  # File contents as parsed
+        self._config = None  # File contents with defaults applied
+        self.load_error = None  # Why the last parse failed (defaults are being served), else None
+
+    @property
+    def path(self):
+        if self._path is None:
+            self._path = find_user_config_path()
+        return self._path
+
+    def file_stamp(self):
+        """(st_mtime_ns, st_size) of userconfig.json, or None if it does not exist."""
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _refresh(self):
+        stamp = self.file_stamp()
+        if self._config is not None and stamp is not None and stamp == self._stamp:
+            return
+        if stamp is None:
+            if not self.save(_default_config()):
+                self._raw, self._config = {}, _default_config()
+            return
+        try:
+            with open(self.path, 'r') as f:
+                raw = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading user config: {e}, returning hardcoded defaults.")
+            self.load_error = str(e)
+            # Not cached: the next read retries the file
+            self._raw, self._config, self._stamp = {}, _default_config(), None
+            return
+        self._raw = raw
+        self._config = _apply_defaults(copy.deepcopy(raw))
+        self._stamp = stamp
+        self.load_error = None
+
+    def snapshot(self, defaults=True):
+        """A copy of the configuration, with defaults applied unless `defaults` is False."""
+        with self._lock:
+            self._refresh()
+            return copy.deepcopy(self._config if defaults else self._raw)
+
+    def get(self, key, default=None):
+        """Read one key from memory. Lists and dicts are copied."""
+        with self._lock:
+            self._refresh()
+            value = self._config.get(key, default)
+        return copy.deepcopy(value) if isinstance(value, (list, dict)) else value
+
+    def get_str(self, key, default=''):
+        value = self.get(key, default)
+        return value if isinstance(value, str) else default
+
+    def get_int(self, key, default=0):
+        try:
+            return int(self.get(key, default))
+        except (TypeError, ValueError):
+            return default
+
+    def get_float(self, key, default=0.0):
+        try:
+            return float(self.get(key, default))
+        except (TypeError, ValueError):
+            return default
+
+    def get_bool(self, key, default=False):
+        value = self.get(key, default)
+        if isinstance(value, str):
+            return value.strip().lower() in ('1', 'true', 'yes', 'on')
+        return bool(value)
+
+    def save(self, config_data):
+        """Write `config_data` to userconfig.json and make it the cached configuration."""
+        with self._lock:
+            config_path = self.path
+            config_dir = os.path.dirname(config_path)
+            try:
+                # Ensure the config directory exists
+                os.makedirs(config_dir, exist_ok=True)
+                # Attempt to write to the file
+                with open(config_path, 'w') as f:
+                    json.dump(config_data, f, indent=2)
+                # Verify by trying to read it back (optional, but good for diagnostics)
+                try:
+                    with open(config_path, 'r') as f:
+                        json.load(f)
+                except Exception as e_readback:
+                    logger.critical(f"CRITICAL ERROR: Config saved to {config_path}, but failed to read back immediately: {e_readback}")
+                    logger.critical(f"This could indicate a problem with file corruption or very intermittent write issues.")
+                self._raw = copy.deepcopy(config_data)
+                self._config = _apply_defaults(copy.deepcopy(config_data))
+                self._stamp = self.file_stamp()
+                self.load_error = None
+                return True
+            except IOError as e_io:
+                logger.error(f"IOError saving user config to {config_path}: {e_io}")
+                logger.error(f"Please check file permissions and path.")
+                self._stamp = None
+                return False
+            except Exception as e:
+                logger.error(f"Unexpected error saving user config to {config_path}: {e}")
+                import traceback
+                traceback.print_exc()
+                self._stamp = None
+                return False
+
+
+config_store = ConfigStore()
+
+
+def load_config():
+    """Load configuration from userconfig.json (served from the process-wide ConfigStore)"""
+    return config_store.snapshot()
 
 def save_config(config_data):
     """Save entire configuration data to userconfig.json (using unified search logic)"""
-    config_path = find_user_config_path()
-    config_dir = os.path.dirname(config_path)
-    try:
-        # Ensure the config directory exists
-        os.makedirs(config_dir, exist_ok=True)
-        # Attempt to write to the file
-        with open(config_path, 'w') as f:
-            json.dump(config_data, f, indent=2)
-        # Verify by trying to read it back (optional, but good for diagnostics)
-        try:
-            with open(config_path, 'r') as f:
-                json.load(f)
-        except Exception as e_readback:
-            logger.critical(f"CRITICAL ERROR: Config saved to {config_path}, but failed to read back immediately: {e_readback}")
-            logger.critical(f"This could indicate a problem with file corruption or very intermittent write issues.")
-        return True
-    except IOError as e_io:
-        logger.error(f"IOError saving user config to {config_path}: {e_io}")
-        logger.error(f"Please check file permissions and path.")
-        return False
-    except Exception as e:
-        logger.error(f"Unexpected error saving user config to {config_path}: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    return config_store.save(config_data)
 
 
 
@@ -127,4 +228,21 @@ def update_config(key, value):
         logger.info(f"Updated '{key}' in config to: {value}")
     else:
         logger.error(f"Failed to update '{key}' in config.")
-    return success
\ No newline at end of file
+    return success
+
+def get_cache_dir(name):
+    """
+    Return (and create) a named cache directory stored next to userconfig.json,
+    e.g. config/cache/<name>. Falls back to the system temp directory if the
+    config directory is not writable.
+    """
+    config_dir = os.path.dirname(config_store.path)
+    cache_dir = os.path.join(config_dir, 'cache', name)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError as e:
+        import tempfile
+        logger.warning(f"Cannot create cache directory {cache_dir}: {e}. Using temp directory instead.")
+        cache_dir = os.path.join(tempfile.gettempdir(), 'MotionSaver', 'cache', name)
+        os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
@@ -0,0 +1,129 @@
+"""
+Live reload of userconfig.json into running components.
+
+Settings saved from the GUI used to take effect only after
+restart_application() spawned a new process and rebuilt everything.
+ConfigWatcher notices when the file changes and pushes only the keys whose
+values changed to the subscribers that asked for them, so a font, widget
+toggle or video path can be applied in place.
+
+The file is watched by polling os.stat() (mtime and size) on a background
+thread. The interval starts at `interval` and doubles while nothing changes,
+up to `max_interval`, and drops back after a change; a stat call every few
+seconds costs nothing and works the same on every platform and file system.
+The watcher is only a change trigger: the new contents are read through the
+shared ConfigStore, which re-parses the file for the same stamp change.
+
+Callbacks run on the watcher thread. Tk and Qt subscribers must hand the
+changes over to their UI thread (master.after(), a queued Qt signal).
+"""
+import threading
+
+from screensaver_app.central_logger import get_logger
+from utils.config_utils import config_store
+logger = get_logger('utils.config_watcher')
+
+DEFAULT_INTERVAL_SEC = 1.0
+DEFAULT_MAX_INTERVAL_SEC = 8.0
+
+_MISSING = object()
+
+
+def diff_config(old, new):
+    """Keys whose values differ between two configurations -> new value (None for removed keys)."""
+    changes = {}
+    for key in set(old) | set(new):
+        value = new.get(key, _MISSING)
+        if value != old.get(key, _MISSING):
+            changes[key] = None if value is _MISSING else value
+    return changes
+
+
+class ConfigSubscription:
+    def __init__(self, watcher, callback, keys):
+        self._watcher = watcher
+        self.callback = callback
+        self.keys = frozenset(keys) if keys is not None else None
+
+    def unsubscribe(self):
+        if self._watcher is not None:
+            self._watcher._remove(self)
+            self._watcher = None
+
+
+class ConfigWatcher:
+    def __init__(self, interval=DEFAULT_INTERVAL_SEC, max_interval=DEFAULT_MAX_INTERVAL_SEC):
+        self.interval = interval
+        self.max_interval = max_interval
+        self._subscriptions = []
+        self._lock = threading.Lock()
+        self._stop = None  # Event of the running watcher thread
+        self._thread = None
+        self._stamp = None
+        self._config = None
+
+    def subscribe(self, callback, keys=None):
+        """
+        Call `callback(changes)` with the changed keys (restricted to `keys` if given)
+        whenever userconfig.json changes. Returns a subscription with unsubscribe().
+        """
+        subscription = ConfigSubscription(self, callback, keys)
+        with self._lock:
+            self._subscriptions.append(subscription)
+            if self._thread is None:
+                self._stamp = config_store.file_stamp()
+                self._config = config_store.snapshot()
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(self._stop,), name='ConfigWatcher', daemon=True)
+                self._thread.start()
+        return subscription
+
+    def _remove(self, subscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+            if not self._subscriptions and self._thread is not None:
+                self._stop.set()
+                self._thread = None
+
+    def _run(self, stop):
+        delay = self.interval
+        while not stop.wait(delay):
+            try:
+                changed = self.check()
+            except Exception as e:
+                logger.error(f"Config watcher check failed: {e}")
+                changed = False
+            delay = self.interval if changed else min(self.max_interval, delay * 2)
+
+    def check(self):
+        """Poll once; notify subscribers and return True if the configuration changed."""
+        stamp = config_store.file_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+        config = config_store.snapshot()
+        if config_store.load_error is not None:
+            return False  # Probably caught mid-write; the next poll sees a new stamp
+        self._stamp = stamp
+        changes = diff_config(self._config, config)
+        self._config = config
+        if not changes:
+            return False
+        logger.info(f"userconfig.json changed: {', '.join(sorted(changes))}")
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            if subscription.keys is None:
+                relevant = changes
+            else:
+                relevant = {k: v for k, v in changes.items() if k in subscription.keys}
+            if not relevant:
+                continue
+            try:
+                subscription.callback(relevant)
+            except Exception as e:
+                logger.error(f"Config change subscriber {subscription.callback} failed: {e}")
+        return True
+
+
+config_watcher = ConfigWatcher()
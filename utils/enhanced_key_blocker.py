@@ -15,8 +15,9 @@ from utils.key_blocker import KeyBlocker
 import inspect
 
 # Initialize central logging
-from screensaver_app.central_logger import get_logger, log_startup, log_shutdown, log_exception
+from screensaver_app.central_logger import get_logger, log_startup, log_shutdown, log_exception, flush_logs
 logger = get_logger('EnhancedKeyBlocker')
+poll_logger = get_logger('EnhancedKeyBlocker.poll')  # Rate-limited: call sites that run in loops or timers
 
 class EnhancedKeyBlocker:
     """
@@ -34,7 +35,7 @@ class EnhancedKeyBlocker:
         self._print_debug("EnhancedKeyBlocker initialized")
 
     def _print_debug(self, message):
-        logger.info("_print_debug")
+        poll_logger.info("_print_debug")
         if self.debug_print:
             try:
                 # Get the name of the calling function for detailed logging
@@ -147,7 +148,7 @@ class EnhancedKeyBlocker:
     
     def is_blocking_active(self):
         """Check if Python blocking is active."""
-        logger.info("is_blocking_active")
+        poll_logger.info("is_blocking_active")
         python_active = self.python_blocker and self.python_blocker.hooks_active
         full_blocking_active = self.python_blocker and getattr(self.python_blocker, 'full_blocking_active', False)
         self._print_debug(f"Blocking active status: hooks={python_active}, full_blocking={full_blocking_active}")
@@ -155,7 +156,7 @@ class EnhancedKeyBlocker:
 
     def get_status(self):
         """Get detailed status of Python blocking."""
-        logger.info("get_status")
+        poll_logger.info("get_status")
         status = {
             'python_hooks_active': False,
             'python_registry_active': False,
@@ -218,7 +219,7 @@ class EnhancedKeyBlocker:
     
     def _check_winlogon_activity(self):
         """Check for winlogon.exe activity which might indicate Ctrl+Alt+Del."""
-        logger.info("_check_winlogon_activity")
+        poll_logger.info("_check_winlogon_activity")
         try:
             for proc in psutil.process_iter(['name', 'cpu_percent']):
                 if proc.info['name'] and 'winlogon' in proc.info['name'].lower():
@@ -233,7 +234,7 @@ class EnhancedKeyBlocker:
     
     def _check_secure_desktop_processes(self):
         """Check for processes that indicate secure desktop mode."""
-        logger.info("_check_secure_desktop_processes")
+        poll_logger.info("_check_secure_desktop_processes")
         secure_desktop_indicators = [
             'logonui.exe',      # Windows login UI
             'lsass.exe',        # Local Security Authority (high activity)
@@ -313,7 +314,7 @@ class EnhancedKeyBlocker:
 
             self._print_debug("New application instance started, exiting current process in 2 seconds.")
 
-            threading.Timer(2.0, lambda: os._exit(0)).start()
+            threading.Timer(2.0, lambda: (flush_logs(), os._exit(0))).start()
 
         except Exception as e:
             self._print_debug(f"Error restarting application: {e}")
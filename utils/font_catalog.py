@@ -0,0 +1,278 @@
+"""
+Persistent font catalog used to resolve a font family name to a font file.
+
+find_font_path used to os.walk every system and user font directory (and then
+glob them again) on each lookup, several times per screensaver start. The
+catalog scans once, reads each font's family name from its 'name' table, and
+persists the result in config/cache/fonts. It is refreshed only when one of the
+scanned directories' mtimes changes (a font was installed or removed), and
+unchanged files are not re-parsed.
+"""
+import bisect
+import json
+import os
+import platform
+import struct
+import threading
+import time
+
+from screensaver_app.central_logger import get_logger
+from utils.config_utils import get_cache_dir
+logger = get_logger('utils.font_catalog')
+
+CATALOG_VERSION = 1
+FONT_EXTENSIONS = ('.ttf', '.otf')
+
+
+def normalize_font_name(name):
+    """Normalise a family or file name for matching: no spaces, dashes or underscores, lower case."""
+    return name.replace(" ", "").replace("-", "").replace("_", "").lower()
+
+
+def default_font_dirs():
+    """System and user font directories for the current platform."""
+    system = platform.system()
+    if system == "Windows":
+        font_dirs = [os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts")]
+        # Also check user fonts directory (Windows 10+)
+        user_fonts = os.path.expandvars(r"%LOCALAPPDATA%\Microsoft\Windows\Fonts")
+        if os.path.isdir(user_fonts):
+            font_dirs.append(user_fonts)
+    elif system == "Darwin":
+        font_dirs = ["/System/Library/Fonts", "/Library/Fonts", os.path.expanduser("~/Library/Fonts")]
+    else:  # Linux/Unix
+        font_dirs = ["/usr/share/fonts", "/usr/local/share/fonts", os.path.expanduser("~/.fonts")]
+    return font_dirs
+
+
+def read_font_names(path):
+    """
+    Return (family, subfamily) from a TrueType/OpenType 'name' table, or (None, None).
+    Only the table directory and the name table are read; glyph data is never touched.
+    """
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(12)
+            if len(header) < 12:
+                return None, None
+            num_tables = struct.unpack('>H', header[4:6])[0]
+            directory = f.read(16 * num_tables)
+            name_offset = name_length = None
+            for i in range(num_tables):
+                tag, _checksum, offset, length = struct.unpack('>4sIII', directory[16 * i:16 * i + 16])
+                if tag == b'name':
+                    name_offset, name_length = offset, length
+                    break
+            if name_offset is None:
+                return None, None
+            f.seek(name_offset)
+            table = f.read(name_length)
+    except (OSError, struct.error):
+        return None, None
+
+    try:
+        _fmt, count, string_offset = struct.unpack('>HHH', table[:6])
+        names = {}
+        for i in range(count):
+            platform_id, encoding_id, language_id, name_id, length, offset = struct.unpack(
+                '>HHHHHH', table[6 + 12 * i:18 + 12 * i])
+            # Prefer typographic family/subfamily (16/17) over legacy (1/2)
+            if name_id not in (1, 2, 16, 17):
+                continue
+            raw = table[string_offset + offset:string_offset + offset + length]
+            if platform_id == 3 or platform_id == 0:
+                value = raw.decode('utf-16-be', errors='ignore')
+                rank = 0 if language_id in (0x409, 0) else 1
+            elif platform_id == 1:
+                value = raw.decode('mac_roman', errors='ignore')
+                rank = 2
+            else:
+                continue
+            if name_id not in names or rank < names[name_id][0]:
+                names[name_id] = (rank, value.strip('\x00 '))
+    except (struct.error, UnicodeDecodeError):
+        return None, None
+
+    family = (names.get(16) or names.get(1) or (None, None))[1]
+    subfamily = (names.get(17) or names.get(2) or (None, None))[1]
+    return family or None, subfamily or None
+
+
+class FontCatalog:
+    """Maps normalised family names and file names to font file paths."""
+
+    def __init__(self, font_dirs=None, index_path=None):
+        self.font_dirs = font_dirs if font_dirs is not None else default_font_dirs()
+        self.index_path = index_path or os.path.join(get_cache_dir('fonts'), 'font_index.json')
+        self._lock = threading.Lock()
+        self._files = {}      # path -> {'mtime_ns', 'size', 'family', 'subfamily'}
+        self._dir_mtimes = {}  # directory -> mtime_ns at last scan
+        self._by_family = {}
+        self._by_stem = {}
+        self._sorted_keys = []
+        self._loaded = False
+
+    # -- persistence -----------------------------------------------------
+
+    def _load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CATALOG_VERSION and data.get('font_dirs') == self.font_dirs:
+                self._files = data.get('files', {})
+                self._dir_mtimes = data.get('dir_mtimes', {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable font index {self.index_path}: {e}")
+
+    def _save(self):
+        data = {
+            'version': CATALOG_VERSION,
+            'font_dirs': self.font_dirs,
+            'dir_mtimes': self._dir_mtimes,
+            'files': self._files,
+        }
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.warning(f"Could not write font index {self.index_path}: {e}")
+
+    # -- scanning ----------------------------------------------------------
+
+    def _dirs_changed(self):
+        if not self._dir_mtimes:
+            return True
+        for directory, mtime_ns in self._dir_mtimes.items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime_ns:
+                    return True
+            except OSError:
+                return True
+        # A top-level font directory that did not exist at the last scan may exist now
+        return any(os.path.isdir(d) and d not in self._dir_mtimes for d in self.font_dirs)
+
+    def _scan(self):
+        files = {}
+        dir_mtimes = {}
+        for font_dir in self.font_dirs:
+            if not os.path.isdir(font_dir):
+                continue
+            for root, dirs, filenames in os.walk(font_dir):
+                try:
+                    dir_mtimes[root] = os.stat(root).st_mtime_ns
+                except OSError:
+                    continue
+                for filename in filenames:
+                    if not filename.lower().endswith(FONT_EXTENSIONS):
+                        continue
+                    path = os.path.join(root, filename)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    previous = self._files.get(path)
+                    if previous and previous.get('mtime_ns') == st.st_mtime_ns and previous.get('size') == st.st_size:
+                        files[path] = previous  # Unchanged: skip re-reading the name table
+                        continue
+                    family, subfamily = read_font_names(path)
+                    files[path] = {
+                        'mtime_ns': st.st_mtime_ns,
+                        'size': st.st_size,
+                        'family': family,
+                        'subfamily': subfamily,
+                    }
+        self._files = files
+        self._dir_mtimes = dir_mtimes
+
+    def _build_lookup(self):
+        by_family = {}
+        by_stem = {}
+
+        def prefer(existing, candidate):
+            # Prefer the Regular style, then the shortest file name, when several files share a key
+            if existing is None:
+                return candidate
+            def rank(path):
+                sub = (self._files[path].get('subfamily') or '').lower()
+                return (sub not in ('regular', 'normal', 'book', 'roman', ''), len(os.path.basename(path)), path)
+            return min(existing, candidate, key=rank)
+
+        for path, info in self._files.items():
+            stem = normalize_font_name(os.path.splitext(os.path.basename(path))[0])
+            by_stem[stem] = prefer(by_stem.get(stem), path)
+            if info.get('family'):
+                key = normalize_font_name(info['family'])
+                by_family[key] = prefer(by_family.get(key), path)
+        self._by_family = by_family
+        self._by_stem = by_stem
+        self._sorted_keys = sorted(set(by_family) | set(by_stem))
+
+    def refresh(self, force=False):
+        """Load the persisted index and rescan if any font directory changed. Returns self."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            rescanned = False
+            if force or self._dirs_changed():
+                start = time.perf_counter()
+                self._scan()
+                self._save()
+                rescanned = True
+                logger.info(f"Font catalog rebuilt: {len(self._files)} fonts in {(time.perf_counter() - start) * 1000:.0f} ms")
+            if rescanned or not self._loaded:
+                self._build_lookup()
+            self._loaded = True
+        return self
+
+    # -- lookup --------------------------------------------------------------
+
+    def lookup(self, font_family):
+        """Return the font file for `font_family` (exact family, exact file name, then prefix match) or None."""
+        if not font_family:
+            return None
+        if not self._loaded:
+            self.refresh()
+        key = normalize_font_name(font_family)
+        path = self._by_family.get(key) or self._by_stem.get(key)
+        if path:
+            return path
+
+        # Prefix match, e.g. "dominobrick" -> "dominobrickayy39"
+        i = bisect.bisect_left(self._sorted_keys, key)
+        if i < len(self._sorted_keys) and self._sorted_keys[i].startswith(key):
+            match = self._sorted_keys[i]
+            return self._by_family.get(match) or self._by_stem.get(match)
+
+        # Last resort, matching the old behaviour: substring of a file name
+        lowered = font_family.lower()
+        for stem in self._by_stem:
+            if key in stem:
+                return self._by_stem[stem]
+        for path in self._files:
+            if lowered in os.path.basename(path).lower():
+                return path
+        return None
+
+    def families(self):
+        """Sorted list of family names found in the catalog."""
+        if not self._loaded:
+            self.refresh()
+        return sorted({info['family'] for info in self._files.values() if info.get('family')})
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_font_catalog():
+    """Process-wide font catalog, refreshed on first use and whenever font directories change."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = FontCatalog()
+        catalog = _catalog
+    return catalog.refresh()
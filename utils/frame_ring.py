@@ -0,0 +1,98 @@
+"""
+Preallocated ring of clean video frames for the lock screen and glass blur.
+
+The frame path used to keep `last_raw_frame = pil_img.copy()`, allocating a
+full frame on every frame so the password dialog could grab a clean one later.
+FrameRing keeps a few image buffers that are allocated once (and again only
+when the frame size or mode changes). The producer pastes each frame into a
+free slot and publishes it with a new generation number. Consumers borrow the
+latest slot: while a lease is held that slot is never overwritten, so no copy
+is needed to read it.
+
+Leased images are shared buffers: read them, never modify them, and release
+the lease when done (it is a context manager).
+"""
+import threading
+
+from PIL import Image
+
+from screensaver_app.central_logger import get_logger
+logger = get_logger('utils.frame_ring')
+
+DEFAULT_SLOTS = 3  # latest + one being written + one borrowed
+
+_WRITING = -1
+
+
+class FrameLease:
+    """A borrowed, read-only frame. `generation` increases with every published frame."""
+
+    def __init__(self, ring, index, image, generation):
+        self._ring = ring
+        self._index = index
+        self.image = image
+        self.generation = generation
+
+    def release(self):
+        if self._ring is not None:
+            self._ring._release(self._index)
+            self._ring = None
+            self.image = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class FrameRing:
+    def __init__(self, slots=DEFAULT_SLOTS):
+        self._images = [None] * slots
+        self._generations = [0] * slots
+        self._readers = [0] * slots  # Lease count, or _WRITING while the producer fills the slot
+        self._latest = None
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.dropped = 0  # Frames not stored because every other slot was leased
+
+    def write(self, image):
+        """Copy `image` into a free slot and publish it. Returns its generation, or None if dropped."""
+        with self._lock:
+            free = [i for i in range(len(self._images)) if i != self._latest and self._readers[i] == 0]
+            if not free:
+                self.dropped += 1
+                return None
+            index = min(free, key=lambda i: self._generations[i])
+            self._readers[index] = _WRITING
+
+        buf = self._images[index]
+        try:
+            if buf is None or buf.size != image.size or buf.mode != image.mode:
+                logger.debug(f"Allocating frame ring slot {index}: {image.mode} {image.size[0]}x{image.size[1]}")
+                buf = self._images[index] = Image.new(image.mode, image.size)
+            buf.paste(image)  # In place; no new frame allocation
+        except Exception:
+            with self._lock:
+                self._readers[index] = 0
+            raise
+
+        with self._lock:
+            self.generation += 1
+            self._generations[index] = self.generation
+            self._readers[index] = 0
+            self._latest = index
+            return self.generation
+
+    def borrow_latest(self):
+        """Lease the most recently published frame, or None if nothing was published yet."""
+        with self._lock:
+            index = self._latest
+            if index is None:
+                return None
+            self._readers[index] += 1
+            return FrameLease(self, index, self._images[index], self._generations[index])
+
+    def _release(self, index):
+        with self._lock:
+            self._readers[index] -= 1
@@ -0,0 +1,158 @@
+"""
+Overlay loop timing telemetry: how late each tick ran and how long it took.
+
+LatencyHistogram is a fixed-size HDR-style histogram of microsecond values:
+values below SUB_BUCKETS are exact, and each power-of-two range above that is
+split into SUB_BUCKETS linear buckets, so the relative error stays under
+1/SUB_BUCKETS from 1 us to over a minute with a few hundred integer counters
+and no allocation per record.
+
+TickTimer keeps one window of lateness and duration histograms (logged and
+folded into the running totals every `log_interval_s`) plus those totals;
+summary() reports window + totals at any time.
+"""
+import time
+
+from screensaver_app.central_logger import get_logger
+logger = get_logger('utils.frame_timing')
+
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS  # 16 buckets per power of two: about 6% resolution
+MAX_GROUP = 23  # Group g >= 1 covers [16 << (g - 1), 32 << (g - 1)) us; group 23 ends near 134 s
+BUCKET_COUNT = (MAX_GROUP + 1) * SUB_BUCKETS
+DEFAULT_BUDGET_MS = 16.0  # One 60 Hz frame
+DEFAULT_LOG_INTERVAL_S = 60.0
+
+
+def _bucket_index(value_us):
+    if value_us < SUB_BUCKETS:
+        return value_us
+    shift = value_us.bit_length() - SUB_BUCKET_BITS - 1
+    group = shift + 1
+    if group > MAX_GROUP:
+        return BUCKET_COUNT - 1
+    return group * SUB_BUCKETS + (value_us >> shift) - SUB_BUCKETS
+
+
+def _bucket_upper(index):
+    group, sub = divmod(index, SUB_BUCKETS)
+    if group == 0:
+        return sub
+    return ((SUB_BUCKETS + sub + 1) << (group - 1)) - 1
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.max_us = 0
+        self.total_us = 0
+
+    def record(self, value_us):
+        value_us = max(0, int(value_us))
+        self.counts[_bucket_index(value_us)] += 1
+        self.count += 1
+        self.total_us += value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def merge(self, other):
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.count += other.count
+        self.total_us += other.total_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def reset(self):
+        for i in range(BUCKET_COUNT):
+            self.counts[i] = 0
+        self.count = self.max_us = self.total_us = 0
+
+    def percentile(self, fraction):
+        """Upper bound (us) of the bucket holding the `fraction` quantile, capped at the recorded max."""
+        if not self.count:
+            return 0
+        target = max(1, int(round(fraction * self.count)))
+        seen = 0
+        for index, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return min(_bucket_upper(index), self.max_us)
+        return self.max_us
+
+    def summary(self):
+        """p50/p95/p99/max in milliseconds, plus count and mean."""
+        return {
+            'count': self.count,
+            'mean_ms': self.total_us / self.count / 1000.0 if self.count else 0.0,
+            'p50_ms': self.percentile(0.50) / 1000.0,
+            'p95_ms': self.percentile(0.95) / 1000.0,
+            'p99_ms': self.percentile(0.99) / 1000.0,
+            'max_ms': self.max_us / 1000.0,
+        }
+
+
+class TickTimer:
+    """
+    Records, per tick, how late it started against its intended deadline and
+    how long it ran. A tick is over budget when lateness + duration exceeds
+    `budget_ms`, i.e. what it drew reached the screen more than a frame late.
+    """
+
+    def __init__(self, name, budget_ms=DEFAULT_BUDGET_MS, log_interval_s=DEFAULT_LOG_INTERVAL_S):
+        self.name = name
+        self.budget_us = int(budget_ms * 1000)
+        self.log_interval_s = log_interval_s
+        self.lateness = LatencyHistogram()
+        self.duration = LatencyHistogram()
+        self.over_budget = 0
+        self.total_lateness = LatencyHistogram()
+        self.total_duration = LatencyHistogram()
+        self.total_over_budget = 0
+        self._window_start = time.perf_counter()
+
+    def record(self, deadline, started, finished):
+        """Record one tick from perf_counter() seconds. `deadline` may be None (tick not scheduled by time)."""
+        late_us = int((started - deadline) * 1e6) if deadline is not None else 0
+        run_us = int((finished - started) * 1e6)
+        self.lateness.record(late_us)
+        self.duration.record(run_us)
+        if max(0, late_us) + run_us > self.budget_us:
+            self.over_budget += 1
+        if finished - self._window_start >= self.log_interval_s:
+            self.log_window(finished)
+
+    def log_window(self, now=None):
+        """Log the current window's summary and fold it into the totals."""
+        now = time.perf_counter() if now is None else now
+        if self.lateness.count:
+            late, run = self.lateness.summary(), self.duration.summary()
+            logger.info(
+                f"{self.name} timing over {now - self._window_start:.0f}s, {late['count']} ticks: "
+                f"late p50 {late['p50_ms']:.1f} / p95 {late['p95_ms']:.1f} / p99 {late['p99_ms']:.1f} / "
+                f"max {late['max_ms']:.1f} ms; run p50 {run['p50_ms']:.2f} / p95 {run['p95_ms']:.2f} / "
+                f"p99 {run['p99_ms']:.2f} / max {run['max_ms']:.2f} ms; "
+                f"{self.over_budget} over the {self.budget_us / 1000.0:.0f} ms budget")
+        self.total_lateness.merge(self.lateness)
+        self.total_duration.merge(self.duration)
+        self.total_over_budget += self.over_budget
+        self.lateness.reset()
+        self.duration.reset()
+        self.over_budget = 0
+        self._window_start = now
+
+    def summary(self):
+        """Totals since start including the current window, as plain dicts (ms)."""
+        lateness = LatencyHistogram()
+        lateness.merge(self.total_lateness)
+        lateness.merge(self.lateness)
+        duration = LatencyHistogram()
+        duration.merge(self.total_duration)
+        duration.merge(self.duration)
+        return {
+            'lateness': lateness.summary(),
+            'duration': duration.summary(),
+            'over_budget': self.total_over_budget + self.over_budget,
+            'budget_ms': self.budget_us / 1000.0,
+        }
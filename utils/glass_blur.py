@@ -0,0 +1,89 @@
+"""
+Fast frosted-glass blur for the password dialog background.
+
+ImageFilter.GaussianBlur(radius=15) on a full-screen frame runs on the Tk
+thread between the keypress and the login box, and costs hundreds of ms at
+4K. A blur this wide removes all detail the downsampled image cannot carry,
+so glass_blur() shrinks the frame, blurs it with a proportionally smaller
+radius and scales it back up. The resize and blur use OpenCV when it is
+installed, and Pillow's C filters on the reduced frame otherwise (a NumPy
+cumulative-sum box blur measured about 3x slower than Pillow at that size).
+
+Benchmark against the full-resolution PIL filter:
+    python -m utils.glass_blur
+"""
+import time
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+from screensaver_app.central_logger import get_logger
+logger = get_logger('utils.glass_blur')
+
+MAX_DOWNSAMPLE = 8
+MIN_SMALL_SIGMA = 2.0  # Below this the upscaled result shows the low-resolution grid
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+
+def downsample_factor(radius):
+    """Largest integer factor that keeps at least MIN_SMALL_SIGMA of blur at the reduced size."""
+    return max(1, min(MAX_DOWNSAMPLE, int(radius / MIN_SMALL_SIGMA)))
+
+
+def glass_blur(image, radius=15):
+    """
+    Return `image` (PIL) blurred like ImageFilter.GaussianBlur(radius), computed
+    at reduced resolution. Mode and size are preserved.
+    """
+    if radius <= 0:
+        return image.copy()
+    mode = image.mode
+    if mode not in ('RGB', 'RGBA', 'L'):
+        image = image.convert('RGB')
+    size = image.size
+    factor = downsample_factor(radius)
+    small_sigma = radius / factor
+
+    if cv2 is not None:
+        a = np.asarray(image)
+        small = cv2.resize(a, (max(1, size[0] // factor), max(1, size[1] // factor)), interpolation=cv2.INTER_AREA)
+        small = cv2.GaussianBlur(small, (0, 0), sigmaX=small_sigma, borderType=cv2.BORDER_REPLICATE)
+        result = Image.fromarray(cv2.resize(small, size, interpolation=cv2.INTER_LINEAR), image.mode)
+    else:
+        small = image.reduce(factor) if factor > 1 else image
+        result = small.filter(ImageFilter.GaussianBlur(radius=small_sigma)).resize(size, Image.BILINEAR)
+    return result if result.mode == mode else result.convert(mode)
+
+
+def _benchmark(radius=15, repeats=3):
+    """Time glass_blur against the full-resolution PIL filter and report the mean pixel difference."""
+    backend = 'opencv' if cv2 is not None else 'pillow'
+    print(f"Glass blur benchmark, radius {radius}, backend {backend}, downsample x{downsample_factor(radius)}")
+    rng = np.random.default_rng(0)
+    for label, (w, h) in (('1080p', (1920, 1080)), ('1440p', (2560, 1440)), ('4K', (3840, 2160))):
+        # Smooth gradients plus noise: closer to a video frame than flat colour or pure noise
+        yy, xx = np.mgrid[0:h, 0:w]
+        base = np.stack([xx * 255 // w, yy * 255 // h, (xx + yy) * 255 // (w + h)], axis=-1)
+        frame = Image.fromarray(np.clip(base + rng.integers(-40, 40, base.shape), 0, 255).astype(np.uint8), 'RGB')
+
+        def best_of(fn):
+            best = float('inf')
+            for _ in range(repeats):
+                start = time.perf_counter()
+                out = fn()
+                best = min(best, time.perf_counter() - start)
+            return best * 1000.0, out
+
+        pil_ms, reference = best_of(lambda: frame.filter(ImageFilter.GaussianBlur(radius=radius)))
+        fast_ms, fast = best_of(lambda: glass_blur(frame, radius))
+        diff = np.abs(np.asarray(reference, dtype=np.int16) - np.asarray(fast, dtype=np.int16)).mean()
+        print(f"  {label:>5} {w}x{h}: PIL {pil_ms:7.1f} ms | glass_blur {fast_ms:6.1f} ms | "
+              f"x{pil_ms / fast_ms:5.1f} | mean abs diff {diff:.2f}/255")
+
+
+if __name__ == '__main__':
+    _benchmark()
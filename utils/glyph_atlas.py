@@ -0,0 +1,241 @@
+"""
+Glyph atlas for the screensaver clock.
+
+The clock only ever shows digits, ':', ' ' and AM/PM, so instead of running
+two ImageDraw.text calls (shadow + foreground) at up to 140 px for every
+update, each token is rasterised once with its drop shadow baked in and a
+time string is assembled by compositing those sprites side by side.
+
+Run this module directly for a before/after microbenchmark:
+    python -m utils.glyph_atlas [font_path] [font_size]
+"""
+import math
+import threading
+
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+from screensaver_app.central_logger import get_logger
+logger = get_logger('utils.glyph_atlas')
+
+CLOCK_TOKENS = tuple('0123456789') + (':', ' ', 'AM', 'PM')
+
+DEFAULT_FILL = (255, 255, 255, 220)
+DEFAULT_SHADOW_FILL = (0, 0, 0, 128)
+DEFAULT_SHADOW_OFFSET = 2
+
+
+class ClockGlyphAtlas:
+    """Pre-rendered, pre-shadowed sprites for one (font, size, colour) combination."""
+
+    def __init__(self, font, fill=DEFAULT_FILL, shadow_fill=DEFAULT_SHADOW_FILL,
+                 shadow_offset=DEFAULT_SHADOW_OFFSET, tokens=CLOCK_TOKENS):
+        self.font = font
+        self.fill = tuple(fill)
+        self.shadow_fill = tuple(shadow_fill)
+        self.shadow_offset = int(shadow_offset)
+        self._lock = threading.Lock()
+        # token -> (sprite, advance); sprite origin is the text origin shifted right by left_pad
+        self._sprites = {}
+
+        # Common vertical extent so every sprite shares the same baseline
+        sample = ''.join(tokens) or '0'
+        bbox = self._bbox(sample)
+        self.height = max(1, int(math.ceil(bbox[3]))) + self.shadow_offset
+        self.left_pad = max(0, -int(math.floor(bbox[0])))
+
+        for token in tokens:
+            self._sprite(token)
+        # Compose cache for the most recent string (clock changes once a second)
+        self._last_text = None
+        self._last_image = None
+        self._opaque = None  # Twin with fully opaque colours, see paste_onto()
+
+    def _bbox(self, text):
+        try:
+            return self.font.getbbox(text)
+        except AttributeError:  # Pillow < 8 / bitmap fonts
+            w, h = self.font.getsize(text)
+            return (0, 0, w, h)
+
+    def _advance(self, text):
+        try:
+            return self.font.getlength(text)
+        except AttributeError:
+            return self._bbox(text)[2]
+
+    def _sprite(self, token):
+        """Return (sprite, advance) for `token`, rasterising it on first use."""
+        entry = self._sprites.get(token)
+        if entry is not None:
+            return entry
+        with self._lock:
+            entry = self._sprites.get(token)
+            if entry is not None:
+                return entry
+            advance = self._advance(token)
+            bbox = self._bbox(token)
+            width = max(int(math.ceil(max(bbox[2], advance))), 1) + self.left_pad + self.shadow_offset
+            sprite = Image.new('RGBA', (width, self.height), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(sprite)
+            draw.text((self.left_pad + self.shadow_offset, self.shadow_offset), token,
+                      font=self.font, fill=self.shadow_fill)
+            draw.text((self.left_pad, 0), token, font=self.font, fill=self.fill)
+            entry = (sprite, advance)
+            self._sprites[token] = entry
+            return entry
+
+    def _tokenize(self, text):
+        tokens = []
+        i = 0
+        while i < len(text):
+            pair = text[i:i + 2]
+            if pair in ('AM', 'PM'):
+                tokens.append(pair)
+                i += 2
+            else:
+                tokens.append(text[i])
+                i += 1
+        return tokens
+
+    def measure(self, text):
+        """Width in pixels of `text` as laid out by render(), excluding shadow and padding."""
+        return int(round(sum(self._sprite(t)[1] for t in self._tokenize(text))))
+
+    def render(self, text):
+        """
+        Compose `text` from cached sprites into a new RGBA image.
+
+        The text origin sits at (left_pad, 0) of the returned image, i.e. the
+        image should be placed at (x - left_pad, y) to match draw.text((x, y)).
+        """
+        if text == self._last_text and self._last_image is not None:
+            return self._last_image
+        placements = []
+        x = 0.0
+        width = 1
+        for token in self._tokenize(text):
+            sprite, advance = self._sprite(token)
+            left = int(round(x))
+            placements.append((sprite, left))
+            width = max(width, left + sprite.width)  # Last glyph may overhang its advance
+            x += advance
+        image = Image.new('RGBA', (width, self.height), (0, 0, 0, 0))
+        for sprite, left in placements:
+            image.alpha_composite(sprite, (left, 0))
+        self._last_text = text
+        self._last_image = image
+        return image
+
+    def _opaque_twin(self):
+        if self._opaque is None:
+            with self._lock:
+                if self._opaque is None:
+                    self._opaque = ClockGlyphAtlas(self.font, self.fill[:3] + (255,), self.shadow_fill[:3] + (255,),
+                                                   self.shadow_offset, tuple(self._sprites))
+        return self._opaque
+
+    def paste_onto(self, frame, xy, text):
+        """Blend `text` onto `frame` with its origin at `xy` (same placement and look as draw.text)."""
+        # draw.text ignores the fill alpha on frames without an alpha channel (video frames are
+        # RGB), so those get the opaque colours; RGBA frames get the translucent ones
+        atlas = self if frame.mode == 'RGBA' else self._opaque_twin()
+        image = atlas.render(text)
+        frame.paste(image, (int(xy[0]) - atlas.left_pad, int(xy[1])), image)
+
+
+_atlases = {}
+_atlases_lock = threading.Lock()
+
+
+def _font_key(font):
+    path = getattr(font, 'path', None)
+    size = getattr(font, 'size', None)
+    if path is not None and size is not None:
+        return (str(path), size, getattr(font, 'index', 0))
+    return ('id', id(font))
+
+
+def get_clock_atlas(font, fill=DEFAULT_FILL, shadow_fill=DEFAULT_SHADOW_FILL,
+                    shadow_offset=DEFAULT_SHADOW_OFFSET):
+    """Return the shared atlas for (font, size, colour), building it on first request."""
+    key = (_font_key(font), tuple(fill), tuple(shadow_fill), int(shadow_offset))
+    atlas = _atlases.get(key)
+    if atlas is None:
+        with _atlases_lock:
+            atlas = _atlases.get(key)
+            if atlas is None:
+                atlas = ClockGlyphAtlas(font, fill, shadow_fill, shadow_offset)
+                _atlases[key] = atlas
+                logger.debug(f"Built clock glyph atlas for {key[0]}")
+    return atlas
+
+
+def _benchmark(font_path=None, font_size=140, seconds=300, fps=30):
+    """Compare per-second clock cost of ImageDraw.text against the atlas."""
+    import os
+    import time
+
+    if font_path is None:
+        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        font_path = os.path.join(repo_root, 'fonts', 'DominoBrick-aYy39.ttf')
+    font = ImageFont.truetype(font_path, font_size)
+    texts = [time.strftime('%I:%M:%S %p', time.localtime(1_700_000_000 + i)) for i in range(seconds)]
+
+    def draw_text_clock(text):
+        width = font.getbbox(text)[2]
+        img = Image.new('RGBA', (width + 20, font_size + 20), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        draw.text((2, 2), text, font=font, fill=DEFAULT_SHADOW_FILL)
+        draw.text((0, 0), text, font=font, fill=DEFAULT_FILL)
+        return img
+
+    t0 = time.perf_counter()
+    atlas = ClockGlyphAtlas(font)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    for text in texts:
+        draw_text_clock(text)
+    old_ms = (time.perf_counter() - t0) * 1000 / len(texts)
+
+    t0 = time.perf_counter()
+    for text in texts:
+        atlas.render(text)
+    new_ms = (time.perf_counter() - t0) * 1000 / len(texts)
+
+    # _process_frame_with_ui draws onto every video frame; the text changes once per simulated second
+    frame = Image.new('RGB', (1920, 1080), (40, 40, 40))
+    frames = fps * min(seconds, 10)
+    frame_texts = [texts[(i // fps) % len(texts)] for i in range(frames)]
+    t0 = time.perf_counter()
+    for text in frame_texts:
+        draw = ImageDraw.Draw(frame)
+        draw.text((602, 110), text, font=font, fill=DEFAULT_SHADOW_FILL)
+        draw.text((600, 108), text, font=font, fill=DEFAULT_FILL)
+    old_frame_ms = (time.perf_counter() - t0) * 1000 / frames
+
+    t0 = time.perf_counter()
+    for text in frame_texts:
+        atlas.paste_onto(frame, (600, 108), text)
+    new_frame_ms = (time.perf_counter() - t0) * 1000 / frames
+
+    # Difference from draw.text on an RGB frame (only antialiased glyph edges should differ)
+    reference = Image.new('RGB', (1920, 1080), (40, 40, 40))
+    draw = ImageDraw.Draw(reference)
+    draw.text((602, 110), texts[0], font=font, fill=DEFAULT_SHADOW_FILL)
+    draw.text((600, 108), texts[0], font=font, fill=DEFAULT_FILL)
+    composed = Image.new('RGB', (1920, 1080), (40, 40, 40))
+    atlas.paste_onto(composed, (600, 108), texts[0])
+    difference = ImageChops.difference(reference, composed).convert('L')
+    max_diff = difference.getextrema()[1]
+    edge_pixels = sum(difference.histogram()[11:])
+
+    print(f"Font: {os.path.basename(font_path)} @ {font_size}px, atlas build {build_ms:.2f} ms")
+    print(f"update_overlays (1 render/s):          draw.text {old_ms:.3f} ms/s   atlas {new_ms:.3f} ms/s   ({old_ms / max(new_ms, 1e-9):.1f}x)")
+    print(f"_process_frame_with_ui ({fps} frames/s): draw.text {old_frame_ms * fps:.3f} ms/s   atlas {new_frame_ms * fps:.3f} ms/s   ({old_frame_ms / max(new_frame_ms, 1e-9):.1f}x)")
+    print(f"RGB frame vs draw.text: {edge_pixels} pixels differ by more than 10/255 (max {max_diff})")
+
+
+if __name__ == '__main__':
+    import sys
+    _benchmark(sys.argv[1] if len(sys.argv) > 1 else None,
+               int(sys.argv[2]) if len(sys.argv) > 2 else 140)
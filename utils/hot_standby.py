@@ -0,0 +1,208 @@
+"""
+Hot-standby hand-off between the tray and a pre-built, hidden screensaver.
+
+In tray mode the screensaver (Tk root, overlay window, VLC instance and media,
+fonts, avatar) can be built ahead of time on its own thread and kept withdrawn
+and stopped. Activation then only has to show the windows and start playback.
+
+The standby is torn down (and activation falls back to a cold start) when:
+  - building it cost more resident memory than the configured budget,
+  - system available memory drops below the configured floor,
+  - the user configuration changed since it was built.
+The build cost is measured once, as the process RSS growth between warming()
+and attach(). Later growth belongs to whatever else shares the process (the
+live wallpaper decodes video in it), so the periodic check only looks at
+system available memory. After a teardown for low memory the standby thread
+waits until memory has recovered and builds it again.
+All Tk work happens on the standby thread; other threads only set flags that
+the standby thread polls.
+"""
+import threading
+import time
+
+from screensaver_app.central_logger import get_logger
+logger = get_logger('utils.hot_standby')
+
+DEFAULT_MEMORY_BUDGET_MB = 300
+DEFAULT_MIN_AVAILABLE_MB = 1024
+POLL_INTERVAL_MS = 50
+PRESSURE_CHECK_INTERVAL_S = 5.0
+# Available memory needed above the floor before a standby torn down for low memory is rebuilt
+REARM_HEADROOM_MB = 256
+# Keys that change while the standby waits without making it stale
+VOLATILE_CONFIG_KEYS = ('last_video_timestamp',)
+
+_MB = 1024 * 1024
+
+
+def _process_rss():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+def _system_available():
+    try:
+        import psutil
+        return psutil.virtual_memory().available
+    except Exception:
+        return None
+
+
+def _config_snapshot(config):
+    return {k: v for k, v in (config or {}).items() if k not in VOLATILE_CONFIG_KEYS}
+
+
+class HotStandby:
+    """
+    State machine: idle -> warming -> ready -> active, or -> torn_down.
+
+    Standby thread: warming(config), attach(root, activate, teardown), finished(),
+    wait_for_rearm().
+    Tray thread: request_activation(config), wait_until_finished(),
+    cold_start_finished().
+    """
+
+    def __init__(self, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, min_available_mb=DEFAULT_MIN_AVAILABLE_MB):
+        self.memory_budget = int(memory_budget_mb) * _MB
+        self.min_available = int(min_available_mb) * _MB
+        self.state = 'idle'
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._pending = None  # 'activate' or ('teardown', reason), consumed by the standby thread
+        self._config = None
+        self._baseline_rss = None
+        self._root = None
+        self._activate = None
+        self._teardown = None
+        self._next_pressure_check = 0.0
+        self._rearm = False  # Torn down for low memory; rebuild once memory recovers
+        self._cold_start = threading.Event()  # Set while the tray runs a cold-started screensaver
+
+    # -- standby thread ------------------------------------------------------
+
+    def warming(self, config):
+        """Record the configuration and memory baseline before the standby is built."""
+        with self._lock:
+            self.state = 'warming'
+            self._config = _config_snapshot(config)
+            self._baseline_rss = _process_rss()
+            self._rearm = False
+            self._finished.clear()
+
+    def attach(self, root, activate, teardown):
+        """
+        Called on the standby thread once the hidden screensaver is built.
+        `activate()` shows it and starts playback; `teardown(reason)` releases it.
+        """
+        self._root = root
+        self._activate = activate
+        self._teardown = teardown
+
+        cost = self._build_cost()
+        if cost is not None:
+            logger.info(f"Hot standby ready, built with {cost / _MB:.0f} MB (budget {self.memory_budget / _MB:.0f} MB)")
+        with self._lock:
+            if self._pending is None and cost is not None and cost > self.memory_budget:
+                self._pending = ('teardown', f"standby uses {cost / _MB:.0f} MB, over the {self.memory_budget / _MB:.0f} MB budget")
+            if self.state == 'warming':
+                self.state = 'ready'
+        self._next_pressure_check = time.monotonic() + PRESSURE_CHECK_INTERVAL_S
+        root.after(0, self._poll)
+
+    def finished(self):
+        """Called on the standby thread when its Tk main loop has exited."""
+        with self._lock:
+            if self.state != 'active':
+                self.state = 'torn_down'
+            self._root = self._activate = self._teardown = None
+        self._finished.set()
+
+    def wait_for_rearm(self):
+        """
+        Called on the standby thread after finished(). Returns True once the standby
+        should be built again (it was torn down for low memory and memory has
+        recovered, with no cold-started screensaver running); False if it should not.
+        """
+        if not self._rearm:
+            return False
+        threshold = self.min_available + REARM_HEADROOM_MB * _MB
+        while True:
+            time.sleep(PRESSURE_CHECK_INTERVAL_S)
+            if self._cold_start.is_set():
+                continue
+            available = _system_available()
+            if available is None or available >= threshold:
+                logger.info("System memory recovered, rebuilding hot standby")
+                return True
+
+    def _build_cost(self):
+        rss = _process_rss()
+        if rss is None or self._baseline_rss is None:
+            return None
+        return max(0, rss - self._baseline_rss)
+
+    def _pressure_reason(self):
+        available = _system_available()
+        if available is not None and available < self.min_available:
+            return f"system available memory {available / _MB:.0f} MB is below {self.min_available / _MB:.0f} MB"
+        return None
+
+    def _poll(self):
+        with self._lock:
+            pending, self._pending = self._pending, None
+            if pending == 'activate':
+                self.state = 'active'
+
+        if pending == 'activate':
+            logger.info("Activating hot-standby screensaver")
+            self._activate()
+            return  # The screensaver now owns the main loop
+        if pending is None and time.monotonic() >= self._next_pressure_check:
+            self._next_pressure_check = time.monotonic() + PRESSURE_CHECK_INTERVAL_S
+            reason = self._pressure_reason()
+            if reason:
+                pending = ('teardown', reason)
+                self._rearm = True
+        if pending is not None:
+            with self._lock:
+                self.state = 'torn_down'
+            logger.warning(f"Tearing down hot standby: {pending[1]}")
+            self._teardown(pending[1])
+            return
+        self._root.after(POLL_INTERVAL_MS, self._poll)
+
+    # -- tray thread ----------------------------------------------------------
+
+    def request_activation(self, config):
+        """
+        Ask the standby thread to show the prepared screensaver. Returns False if
+        the caller should cold-start instead (no standby, torn down or stale).
+        """
+        with self._lock:
+            if self.state not in ('warming', 'ready') or self._pending is not None:
+                self._cold_start.set()
+                return False
+            if _config_snapshot(config) != self._config:
+                self._pending = ('teardown', "configuration changed since the standby was built")
+                stale = True
+            else:
+                # While warming, attach() leaves this pending so the first poll activates
+                self._pending = 'activate'
+                stale = False
+        if stale:
+            self._cold_start.set()
+            # Let the stale standby release its windows before a cold start builds new ones
+            self._finished.wait(timeout=5.0)
+            return False
+        return True
+
+    def cold_start_finished(self):
+        """Called by the tray when the screensaver it cold-started (request_activation() was False) exits."""
+        self._cold_start.clear()
+
+    def wait_until_finished(self, timeout=None):
+        """Block until the standby thread's main loop has exited (session ended or torn down)."""
+        return self._finished.wait(timeout)
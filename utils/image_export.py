@@ -0,0 +1,144 @@
+"""
+Background export of wallpaper snapshots and lock-screen images.
+
+The VLC pause snapshot used to be taken and applied inside VLC's event
+thread, and the lock-screen frame was PNG-encoded on the Tk thread before the
+password dialog could open. Both now go through one worker thread:
+
+  - requests are keyed by destination path; a new request for a path that is
+    still queued replaces the queued one instead of adding a second write,
+  - at most `max_pending` requests are queued; beyond that the oldest is dropped,
+  - files are written to a temporary name and moved into place with
+    os.replace, so the wallpaper never points at a half-written image,
+  - images are encoded with a fast format (`image_export_format`: 'bmp',
+    'png' at compression level 1, or 'jpeg').
+
+`on_done(path)` runs on the worker thread after a successful write.
+`release()` runs once the request is finished with its image (written,
+failed, replaced or dropped), for images borrowed from a FrameRing.
+"""
+import collections
+import os
+import threading
+
+from screensaver_app.central_logger import get_logger
+logger = get_logger('utils.image_export')
+
+DEFAULT_FORMAT = 'bmp'
+DEFAULT_MAX_PENDING = 4
+# Format name -> (PIL format, file extension, save options)
+EXPORT_FORMATS = {
+    'bmp': ('BMP', '.bmp', {}),
+    'png': ('PNG', '.png', {'compress_level': 1}),
+    'jpeg': ('JPEG', '.jpg', {'quality': 90}),
+}
+
+
+def export_extension(fmt):
+    """File extension for an export format name, falling back to the default format."""
+    return EXPORT_FORMATS.get(fmt, EXPORT_FORMATS[DEFAULT_FORMAT])[1]
+
+
+def _partial_path(path):
+    base, ext = os.path.splitext(path)
+    return f"{base}.{os.getpid()}.part{ext}"  # Keep the extension: VLC and PIL both look at it
+
+
+class ImageExporter:
+    def __init__(self, max_pending=DEFAULT_MAX_PENDING):
+        self.max_pending = max_pending
+        self._pending = collections.OrderedDict()  # path -> (write(partial_path) -> bool, on_done, release)
+        self._cond = threading.Condition()
+        self._busy = False
+        self._thread = None
+
+    def save_image(self, image, path, fmt=DEFAULT_FORMAT, on_done=None, release=None):
+        """Queue `image` (a PIL image that is not modified until `release`) to be written to `path`."""
+        pil_format, _ext, options = EXPORT_FORMATS.get(fmt, EXPORT_FORMATS[DEFAULT_FORMAT])
+
+        def write(partial_path):
+            img = image
+            if pil_format in ('BMP', 'JPEG') and img.mode not in ('RGB', 'L'):
+                img = img.convert('RGB')
+            img.save(partial_path, format=pil_format, **options)
+            return True
+
+        self._submit(path, write, on_done, release)
+
+    def take_snapshot(self, player, path, on_done=None):
+        """Queue a VLC snapshot of `player`'s current frame to `path`."""
+        def write(partial_path):
+            # Returns 0 on success; libvlc blocks until the video output has written the file
+            return player.video_take_snapshot(0, partial_path, 0, 0) == 0 and os.path.exists(partial_path)
+
+        self._submit(path, write, on_done)
+
+    def _submit(self, path, write, on_done, release=None):
+        superseded = None
+        with self._cond:
+            if path in self._pending:
+                logger.debug(f"Coalescing export request for {path}")
+                superseded = self._pending.pop(path)
+            elif len(self._pending) >= self.max_pending:
+                dropped, superseded = self._pending.popitem(last=False)
+                logger.warning(f"Image export queue full, dropped pending export of {dropped}")
+            self._pending[path] = (write, on_done, release)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='ImageExport', daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+        if superseded is not None:
+            self._release(superseded[2])
+
+    @staticmethod
+    def _release(release):
+        if release:
+            try:
+                release()
+            except Exception as e:
+                logger.error(f"Image export release failed: {e}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._busy = False
+                    self._cond.notify_all()
+                    self._cond.wait()
+                path, (write, on_done, release) = self._pending.popitem(last=False)
+                self._busy = True
+            try:
+                self._export(path, write, on_done)
+            finally:
+                self._release(release)
+
+    def _export(self, path, write, on_done):
+        partial_path = _partial_path(path)
+        try:
+            if not write(partial_path):
+                logger.warning(f"Image export to {path} produced no file")
+                return
+            os.replace(partial_path, path)
+            logger.debug(f"Exported image to {path}")
+        except Exception as e:
+            logger.error(f"Image export to {path} failed: {e}")
+            return
+        finally:
+            if os.path.exists(partial_path):
+                try:
+                    os.remove(partial_path)
+                except OSError:
+                    pass
+        if on_done:
+            try:
+                on_done(path)
+            except Exception as e:
+                logger.error(f"Image export callback for {path} failed: {e}")
+
+    def flush(self, timeout=None):
+        """Wait until every queued export has finished. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+
+image_exporter = ImageExporter()
@@ -0,0 +1,103 @@
+"""
+In-process import timing report, similar to `python -X importtime`.
+
+Enabled with the --import-report command-line flag. builtins.__import__ is
+wrapped so that every module imported for the first time records its self and
+cumulative import time. report() writes the timings in -X importtime layout to
+the logs folder and logs the slowest imports plus the current RSS, so tray
+cold start can be compared before and after changes to the import graph.
+"""
+import builtins
+import importlib.util
+import os
+import sys
+import threading
+import time
+
+REPORT_FLAG = '--import-report'
+TOP_N = 15
+
+
+class ImportProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.records = []  # (name, depth, self_us, cumulative_us) in completion order, like -X importtime
+        self._local = threading.local()
+        self._original_import = None
+
+    def install(self):
+        if self.enabled:
+            return self
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+        self.enabled = True
+        return self
+
+    def uninstall(self):
+        if self.enabled:
+            builtins.__import__ = self._original_import
+            self.enabled = False
+
+    def _resolve(self, name, globals, level):
+        if level == 0:
+            return name
+        try:
+            package = (globals or {}).get('__package__') or (globals or {}).get('__name__', '').rpartition('.')[0]
+            return importlib.util.resolve_name('.' * level + name, package)
+        except (ImportError, ValueError):
+            return name
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        resolved = self._resolve(name, globals, level)
+        if resolved in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0)
+        start = time.perf_counter_ns()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed_us = (time.perf_counter_ns() - start) // 1000
+            children_us = stack.pop()
+            if stack:
+                stack[-1] += elapsed_us
+            self.records.append((resolved, len(stack), elapsed_us - children_us, elapsed_us))
+
+    def report(self, stage):
+        """Write import_report_<stage>.txt to the logs folder and log a summary. No-op when disabled."""
+        if not self.enabled:
+            return None
+        from screensaver_app.central_logger import get_logger, get_logs_dir
+        logger = get_logger('ImportReport')
+        records = list(self.records)
+
+        report_path = os.path.join(get_logs_dir(), f"import_report_{stage}.txt")
+        try:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                f.write("import time: self [us] | cumulative | imported package\n")
+                for name, depth, self_us, cumulative_us in records:
+                    f.write(f"import time: {self_us:>9} | {cumulative_us:>10} | {'  ' * depth}{name}\n")
+        except OSError as e:
+            logger.warning(f"Could not write import report to {report_path}: {e}")
+            report_path = None
+
+        top_level_ms = sum(r[3] for r in records if r[1] == 0) / 1000.0
+        logger.info(f"=== Import report ({stage}): {len(records)} modules, {top_level_ms:.0f} ms in top-level imports ===")
+        for name, depth, self_us, cumulative_us in sorted(records, key=lambda r: r[3], reverse=True)[:TOP_N]:
+            logger.info(f"  {cumulative_us / 1000.0:8.1f} ms cumulative  {self_us / 1000.0:7.1f} ms self  {name}")
+        try:
+            import psutil
+            logger.info(f"Resident memory at {stage}: {psutil.Process().memory_info().rss / (1024 * 1024):.1f} MB")
+        except Exception:
+            pass
+        if report_path:
+            logger.info(f"Import report written to {report_path}")
+        return report_path
+
+
+profiler = ImportProfiler()
+if REPORT_FLAG in sys.argv:
+    profiler.install()
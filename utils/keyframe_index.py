@@ -0,0 +1,170 @@
+"""
+Per-video keyframe index used to resume playback at last_video_timestamp.
+
+Seeking to an arbitrary time makes VLC decode forward from the previous
+keyframe, which stalls (and, when done with set_time() after play(), shows
+frame 0 first) on long-GOP files. The keyframe timestamps are demuxed once in
+the background with PyAV (packets only, nothing is decoded) and stored in the
+shared video metadata index (utils.video_probe). Resume then starts the media
+at the keyframe at or before the saved position via VLC's start-time option,
+so the first displayed frame is the resume frame.
+
+OpenCV does not expose keyframe flags, so without PyAV no index is built and
+resume starts at the exact saved time (still via start-time, without the
+frame-0 flash).
+
+keyframe_at_or_before() runs in VLC event callbacks and on the Tk thread, so
+it only reads keyframe lists held in memory. ensure_keyframe_index() loads
+them when playback starts (and build_keyframe_index() once it has scanned),
+keyed by the file's path, size and mtime; lookups never touch the disk.
+"""
+import bisect
+import os
+import threading
+
+from screensaver_app.central_logger import get_logger
+from utils.video_probe import get_video_metadata, store_video_metadata
+logger = get_logger('utils.keyframe_index')
+
+# All-intra or near all-intra files gain nothing from an index; don't bloat video_index.json with them
+MAX_STORED_KEYFRAMES = 20000
+
+# Keyframe lists kept in memory, one per recently played video
+MAX_LOADED_VIDEOS = 4
+
+_building = set()
+_building_lock = threading.Lock()
+_loaded = {}  # absolute path -> ((size, mtime_ns), keyframes_ms)
+_loaded_lock = threading.Lock()
+
+
+def _file_stamp(video_path):
+    try:
+        st = os.stat(video_path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _remember(video_path, stamp, keyframes):
+    abs_path = os.path.abspath(video_path)
+    with _loaded_lock:
+        _loaded.pop(abs_path, None)
+        _loaded[abs_path] = (stamp, keyframes)
+        while len(_loaded) > MAX_LOADED_VIDEOS:
+            del _loaded[next(iter(_loaded))]
+
+
+def scan_keyframes(video_path):
+    """Demux `video_path` and return the sorted keyframe times in milliseconds, or None without PyAV."""
+    try:
+        import av
+    except ImportError:
+        return None
+    keyframes = []
+    with av.open(video_path) as container:
+        stream = container.streams.video[0]
+        time_base = stream.time_base
+        start = stream.start_time or 0
+        for packet in container.demux(stream):
+            if packet.is_keyframe and packet.pts is not None:
+                keyframes.append(int((packet.pts - start) * time_base * 1000))
+    return sorted(set(keyframes))
+
+
+def build_keyframe_index(video_path):
+    """Scan `video_path` and store its keyframes in the metadata index. Returns the stored list or None."""
+    try:
+        keyframes = scan_keyframes(video_path)
+    except Exception as e:
+        logger.warning(f"Keyframe scan failed for '{video_path}': {e}")
+        return None
+    if keyframes is None:
+        logger.debug("PyAV is not installed; keyframe index not built")
+        return None
+
+    gaps = sorted(b - a for a, b in zip(keyframes, keyframes[1:]))
+    interval = gaps[len(gaps) // 2] / 1000.0 if gaps else None
+    stored = keyframes if len(keyframes) <= MAX_STORED_KEYFRAMES else []
+    store_video_metadata(video_path, {'keyframes_ms': stored, 'keyframe_interval': interval})
+    _remember(video_path, _file_stamp(video_path), stored)
+    interval_text = f"{interval:.2f}s" if interval else "n/a"
+    logger.info(f"Keyframe index built for {video_path}: {len(keyframes)} keyframes, median interval {interval_text}")
+    return stored
+
+
+def ensure_keyframe_index(video_path):
+    """
+    Load the stored keyframes of `video_path` into memory for keyframe_at_or_before(),
+    or start building them on a background thread if the index has none yet.
+    Call when playback starts, before resume_media().
+    """
+    stamp = _file_stamp(video_path)
+    if stamp is None:
+        return
+    with _loaded_lock:
+        loaded = _loaded.get(os.path.abspath(video_path))
+    if loaded is not None and loaded[0] == stamp:
+        return
+    meta = get_video_metadata(video_path)
+    if meta is None:
+        return
+    if 'keyframes_ms' in meta:
+        _remember(video_path, stamp, meta['keyframes_ms'])
+        return
+    with _building_lock:
+        if video_path in _building:
+            return
+        _building.add(video_path)
+
+    def run():
+        try:
+            build_keyframe_index(video_path)
+        finally:
+            with _building_lock:
+                _building.discard(video_path)
+
+    threading.Thread(target=run, name='KeyframeIndex', daemon=True).start()
+
+
+def keyframe_at_or_before(video_path, seconds):
+    """
+    Return the time in seconds of the keyframe at or before `seconds`, or
+    `seconds` unchanged when no index is loaded (or every frame is a keyframe).
+    Only reads memory; see ensure_keyframe_index().
+    """
+    if seconds <= 0:
+        return 0.0
+    with _loaded_lock:
+        loaded = _loaded.get(os.path.abspath(video_path))
+    keyframes = loaded[1] if loaded else None
+    if not keyframes:
+        return seconds
+    i = bisect.bisect_right(keyframes, int(seconds * 1000))
+    return keyframes[i - 1] / 1000.0 if i > 0 else 0.0
+
+
+def resume_media(instance, video_path, seconds):
+    """
+    Create a VLC media for `video_path` that starts at the keyframe at or
+    before `seconds`. Returns (media, start_seconds).
+    """
+    media = instance.media_new(video_path)
+    start = keyframe_at_or_before(video_path, seconds)
+    if start > 0:
+        media.add_option(f"start-time={start:.3f}")
+    return media, start
+
+
+def replace_loop_media(media_list, media):
+    """
+    Replace the only item of a one-item loop list. Used to put the start-time
+    media in before play() and a plain one back afterwards, so later loops
+    start from the beginning.
+    """
+    media_list.lock()
+    try:
+        media_list.remove_index(0)
+        media_list.add_media(media)
+    finally:
+        media_list.unlock()
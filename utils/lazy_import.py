@@ -0,0 +1,54 @@
+"""
+Deferred imports for heavy subsystems.
+
+The tray process only needs pystray and a small icon until the user actually
+opens the screensaver, the GUI or the live wallpaper. Modules wrapped with
+lazy_import() are imported on first attribute access instead of at startup,
+and the time each one takes to load is logged.
+"""
+import importlib
+import threading
+import time
+
+from screensaver_app.central_logger import get_logger
+logger = get_logger('utils.lazy_import')
+
+
+class LazyModule:
+    """Module proxy that imports `name` the first time one of its attributes is used."""
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+        self.__dict__['_lock'] = threading.Lock()
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            with self._lock:
+                module = self._module
+                if module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    self.__dict__['_module'] = module
+                    logger.info(f"Loaded {self._name} on first use in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return module
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """Return a LazyModule for `name`; the import happens on first attribute access."""
+    return LazyModule(name)
@@ -0,0 +1,366 @@
+"""
+Headless benchmark for the screensaver's overlay rendering paths.
+
+Drives draw_rounded_rectangle, _create_pre_rendered_username_label,
+_process_frame_with_ui and update_overlays (canvas and compositor backends)
+on a VideoClockScreenSaver built without Tk or libvlc: the vlc module, the Tk
+root, the overlay canvas, ImageTk.PhotoImage and (off Windows) the key
+blocker are replaced by stubs, frames are synthetic, and fonts come from the
+bundled fonts/ folder. A fake clock
+drives the wall time, so "steady" cases measure a tick where nothing changes
+and "tick" cases a clock-second change.
+
+For each case it reports per-call latency percentiles and, from a separate
+pass, allocations per call: the Python-heap peak (tracemalloc, includes NumPy)
+and the PIL images created with their pixel memory (Pillow allocates pixels
+outside tracemalloc's view). Tk and VLC costs are not included.
+
+    python -m utils.overlay_benchmark [--calls N] [--resolutions 1080p,4K]
+                                      [--json OUT] [--baseline IN --tolerance 0.25]
+
+With --baseline the run exits non-zero if any case's p50 is slower than the
+baseline by more than the tolerance.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+import types
+
+from PIL import Image, ImageDraw, ImageFont
+
+RESOLUTIONS = {'1080p': (1920, 1080), '1440p': (2560, 1440), '4K': (3840, 2160)}
+DEFAULT_CALLS = 200
+ALLOC_CALLS = 20
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONTS_DIR = os.path.join(PROJECT_ROOT, 'fonts')
+
+
+class _Stub:
+    """Accepts any attribute access or call; stands in for VLC objects and Tk widgets."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        return _Stub()
+
+    def __call__(self, *args, **kwargs):
+        return _Stub()
+
+
+class _StubTkRoot(_Stub):
+    def __init__(self):
+        self._next_id = 0
+
+    def after(self, ms, func=None, *args):
+        self._next_id += 1
+        return f"after#{self._next_id}"  # Never run: the benchmark calls each tick itself
+
+    def after_idle(self, func, *args):
+        return self.after(0, func)
+
+    def after_cancel(self, after_id):
+        pass
+
+
+class _StubCanvas(_Stub):
+    def __init__(self):
+        self.calls = 0
+        self._next_id = 0
+
+    def create_image(self, *args, **kwargs):
+        self.calls += 1
+        self._next_id += 1
+        return self._next_id
+
+    def coords(self, *args):
+        self.calls += 1
+
+    def itemconfigure(self, *args, **kwargs):
+        self.calls += 1
+
+    def delete(self, *args):
+        self.calls += 1
+
+
+class _StubPhotoImage:
+    def __init__(self, image=None, **kwargs):
+        self.size = image.size if image is not None else (0, 0)
+
+    def paste(self, image):
+        pass
+
+
+class _FakeClock:
+    """Replaces the `time` module in video_player so the clock second only changes when advance() is called."""
+
+    def __init__(self):
+        self.now = float(int(time.time()))
+
+    def advance(self, seconds=1.0):
+        self.now += seconds
+
+    def time(self):
+        return self.now
+
+    def strftime(self, fmt, t=None):
+        return time.strftime(fmt, time.localtime(self.now) if t is None else t)
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+class _PilAllocationCounter:
+    """Counts PIL images created (and their approximate pixel bytes) while installed."""
+
+    def __init__(self):
+        self.images = 0
+        self.pixel_bytes = 0
+        self._original = None
+
+    def __enter__(self):
+        self._original = original = Image.Image._new
+        counter = self
+
+        def counting_new(image_self, im):
+            counter.images += 1
+            counter.pixel_bytes += im.size[0] * im.size[1] * max(1, len(im.mode))
+            return original(image_self, im)
+
+        Image.Image._new = counting_new
+        return self
+
+    def __exit__(self, *exc):
+        Image.Image._new = self._original
+
+
+def _import_video_player():
+    """Import screensaver_app.video_player with libvlc and ImageTk replaced by stubs."""
+    stub_vlc = types.ModuleType('vlc')
+    stub_vlc.__getattr__ = lambda name: _Stub()
+    sys.modules['vlc'] = stub_vlc
+    try:
+        import utils.enhanced_key_blocker  # noqa: F401
+    except ImportError:
+        # Windows-only (winreg and keyboard hooks); the overlay paths never use the key blocker
+        stub_blocker = types.ModuleType('utils.enhanced_key_blocker')
+        stub_blocker.EnhancedKeyBlocker = _Stub
+        sys.modules['utils.enhanced_key_blocker'] = stub_blocker
+    import utils.overlay_layer as overlay_layer
+    overlay_layer.ImageTk = types.SimpleNamespace(PhotoImage=_StubPhotoImage)
+    import screensaver_app.video_player as video_player
+    return video_player
+
+
+def _bundled_fonts():
+    fonts = sorted(os.path.join(FONTS_DIR, f) for f in os.listdir(FONTS_DIR) if f.lower().endswith(('.ttf', '.otf')))
+    if not fonts:
+        raise SystemExit(f"No bundled fonts found in {FONTS_DIR}")
+    return fonts
+
+
+def build_screensaver(video_player, width, height, clock, font_path, backend='canvas'):
+    """A VideoClockScreenSaver with the attributes the overlay paths use, and no Tk or VLC behind it."""
+    cls = video_player.VideoClockScreenSaver
+    ss = cls.__new__(cls)
+    clock_font_size, ui_font_size = 64, 30
+    ss.master = _StubTkRoot()
+    ss.user_config = {}
+    ss.username = ss.username_to_display = 'Benchmark'
+    ss.width, ss.height = width, height
+    ss.screen_width, ss.screen_height = width, height
+    ss.clock_font_family, ss.clock_font_size = font_path, clock_font_size
+    ss.ui_font_family, ss.ui_font_size = font_path, ui_font_size
+    ss.clock_font = ImageFont.truetype(font_path, clock_font_size)
+    ss.profile_name_font = ImageFont.truetype(font_path, ui_font_size)
+    ss.profile_initial_font = ImageFont.truetype(font_path, ui_font_size * 2)
+    ss.profile_pic_size = 80
+    ss.pre_rendered_profile_pic = ss.pre_rendered_username_label = None
+    ss.profile_pic_pos = ss.username_label_pos = (0, 0)
+    ss.profile_pic_is_gif = False
+    ss.profile_pic_gif_frames = []
+    ss.profile_pic_gif_frame_index = 0
+    ss.profile_pic_gif_last_update = 0
+    ss.profile_pic_gif_duration = 100
+    ss.profile_pic_stream = None
+    ss.profile_pic_current_frame = None
+    ss.power_governor = None
+    ss.power_profile = ss.applied_power_profile = 'full'
+    ss.playback_paused = False
+    ss.frame_ring = video_player.FrameRing()
+    ss.current_time_text = clock.strftime('%I:%M:%S %p')
+    ss.last_clock_update = 0
+    ss.last_clock_second = None
+    ss._next_focus_check_ms = 0
+    ss._overlay_after_id = None
+    ss._present_after_id = None
+    ss.clock_x = ss.clock_y = ss.clock_text_width = 0
+    ss.overlay_layer = None
+    ss.clock_atlas = None
+    ss.overlay_timing = video_player.TickTimer('Overlay benchmark', log_interval_s=float('inf'))
+    ss._overlay_deadline = None
+    ss.first_frame_received = False
+    ss.widgets = []
+    ss.focus_management_active = False
+    ss.video_backend = backend
+    ss.overlay_win = None
+    ss.overlay_canvas = _StubCanvas()
+    ss.compositor = None
+    ss.compositor_surface = None
+    if backend == 'compositor':
+        from utils.compositor import FrameCompositor
+        ss.compositor = FrameCompositor(width, height)
+    ss._initialize_ui_elements_after_first_frame(width, height)
+    return ss
+
+
+def _synthetic_frame(width, height):
+    """A gradient video frame; detail does not affect the overlay paths' cost, size does."""
+    gradient = Image.linear_gradient('L').resize((width, height))
+    return Image.merge('RGB', (gradient, gradient.transpose(Image.FLIP_LEFT_RIGHT), gradient.transpose(Image.FLIP_TOP_BOTTOM)))
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def measure(call, calls, setup=None):
+    """Time `calls` invocations of `call` (with untimed `setup` before each), then measure allocations."""
+    for _ in range(min(5, calls)):  # Warm caches (glyph atlas, layer items)
+        if setup:
+            setup()
+        call()
+    timings = []
+    for _ in range(calls):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000.0)
+    timings.sort()
+
+    peaks = []
+    pil = _PilAllocationCounter()
+    tracemalloc.start()
+    for _ in range(ALLOC_CALLS):
+        if setup:
+            setup()
+        baseline, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        with pil:
+            call()
+        _current, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - baseline)
+    tracemalloc.stop()
+    return {
+        'calls': calls,
+        'p50_ms': _percentile(timings, 0.50),
+        'p90_ms': _percentile(timings, 0.90),
+        'p99_ms': _percentile(timings, 0.99),
+        'max_ms': timings[-1],
+        'py_peak_kb': sorted(peaks)[len(peaks) // 2] / 1024.0,
+        'pil_images': pil.images / ALLOC_CALLS,
+        'pil_kb': pil.pixel_bytes / ALLOC_CALLS / 1024.0,
+    }
+
+
+def run_cases(video_player, resolutions, calls, font_path):
+    results = {}
+    clock = _FakeClock()
+    video_player.time = clock
+
+    scratch = Image.new('RGBA', (420, 120), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(scratch)
+    results['draw_rounded_rectangle'] = measure(
+        lambda: video_player.draw_rounded_rectangle(draw, (0, 0, 419, 119), radius=12, fill=(0, 0, 0, 128)), calls)
+
+    for label in resolutions:
+        width, height = RESOLUTIONS[label]
+        ss = build_screensaver(video_player, width, height, clock, font_path)
+        results[f'{label} username_label'] = measure(ss._create_pre_rendered_username_label, calls)
+
+        base = _synthetic_frame(width, height)
+        frame = base.copy()
+        reset_frame = lambda: frame.paste(base)  # _process_frame_with_ui draws into the frame it is given
+        results[f'{label} process_frame steady'] = measure(lambda: ss._process_frame_with_ui(frame), calls, reset_frame)
+        results[f'{label} process_frame tick'] = measure(
+            lambda: ss._process_frame_with_ui(frame), calls, lambda: (reset_frame(), clock.advance()))
+
+        results[f'{label} update_overlays steady'] = measure(ss.update_overlays, calls)
+        results[f'{label} update_overlays tick'] = measure(ss.update_overlays, calls, clock.advance)
+
+        cs = build_screensaver(video_player, width, height, clock, font_path, backend='compositor')
+        compositor = cs.compositor
+        frame_index = [0]
+
+        def publish_frame():
+            # A new decoded frame arrives every tick, as during playback
+            clock.advance(1.0 / 30)
+            index = compositor.acquire_write()
+            compositor.buffer(index)[..., 0] = frame_index[0] % 256
+            frame_index[0] += 1
+            compositor.publish(index)
+
+        def overlay_and_compose():
+            cs.update_overlays()
+            compositor.compose()
+        results[f'{label} compositor frame'] = measure(overlay_and_compose, calls, publish_frame)
+    return results
+
+
+def print_results(results):
+    print(f"{'case':<34}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}{'py KB':>9}{'PIL img':>9}{'PIL KB':>10}")
+    for name, r in results.items():
+        print(f"{name:<34}{r['p50_ms']:>9.3f}{r['p90_ms']:>9.3f}{r['p99_ms']:>9.3f}{r['max_ms']:>9.3f}"
+              f"{r['py_peak_kb']:>9.1f}{r['pil_images']:>9.1f}{r['pil_kb']:>10.1f}")
+
+
+def compare(results, baseline, tolerance):
+    """Return the cases whose p50 regressed by more than `tolerance` against `baseline`."""
+    regressions = []
+    for name, r in results.items():
+        before = baseline.get(name)
+        if before and before['p50_ms'] > 0 and r['p50_ms'] > before['p50_ms'] * (1.0 + tolerance):
+            regressions.append(f"{name}: p50 {before['p50_ms']:.3f} -> {r['p50_ms']:.3f} ms")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless overlay-render benchmark")
+    parser.add_argument('--calls', type=int, default=DEFAULT_CALLS, help="timed calls per case")
+    parser.add_argument('--resolutions', default=','.join(RESOLUTIONS), help="comma-separated, from " + ', '.join(RESOLUTIONS))
+    parser.add_argument('--font', default=None, help="font file (default: first font in fonts/)")
+    parser.add_argument('--json', dest='json_out', default=None, help="write results to this file")
+    parser.add_argument('--baseline', default=None, help="results JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed p50 slowdown vs baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    resolutions = [r.strip() for r in args.resolutions.split(',') if r.strip()]
+    unknown = [r for r in resolutions if r not in RESOLUTIONS]
+    if unknown:
+        parser.error(f"unknown resolution(s): {', '.join(unknown)}")
+    font_path = args.font or _bundled_fonts()[0]
+
+    video_player = _import_video_player()
+    video_player.find_font_path = lambda family: family if os.path.isfile(family) else font_path
+    print(f"Overlay benchmark: {args.calls} calls per case, font {os.path.basename(font_path)}")
+    results = run_cases(video_player, resolutions, args.calls, font_path)
+    print_results(results)
+
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("Regressions:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
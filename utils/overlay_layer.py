@@ -0,0 +1,80 @@
+from PIL import ImageTk
+from screensaver_app.central_logger import get_logger
+logger = get_logger('utils.overlay_layer')
+
+
+class OverlayLayer:
+    """
+    Retained set of image items on a Tk canvas.
+
+    Each named item is created once and afterwards only moved or image-swapped
+    when its position or content key actually changes, so a tick where nothing
+    changed costs a couple of tuple comparisons and no Tk calls.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        # name -> {'id', 'key', 'pos', 'photo', 'size'}
+        self._items = {}
+
+    def update(self, name, pos, content_key, render):
+        """
+        Show item `name` at `pos` (top-left, canvas coordinates).
+
+        `render` is a zero-argument callable returning the PIL image for the
+        item; it is only invoked when `content_key` differs from the key the
+        item was last rendered with. Returns True if any Tk call was made.
+        """
+        pos = (int(pos[0]), int(pos[1]))
+        item = self._items.get(name)
+
+        if item is None:
+            pil_img = render()
+            if pil_img is None:
+                return False
+            photo = ImageTk.PhotoImage(pil_img)
+            item_id = self.canvas.create_image(pos[0], pos[1], anchor='nw', image=photo)
+            self._items[name] = {
+                'id': item_id,
+                'key': content_key,
+                'pos': pos,
+                'photo': photo,
+                'size': pil_img.size,
+            }
+            return True
+
+        changed = False
+        if item['key'] != content_key:
+            pil_img = render()
+            if pil_img is not None:
+                if pil_img.size == item['size']:
+                    # Same geometry: write the pixels into the existing Tk image
+                    item['photo'].paste(pil_img)
+                else:
+                    photo = ImageTk.PhotoImage(pil_img)
+                    self.canvas.itemconfigure(item['id'], image=photo)
+                    item['photo'] = photo  # Keep reference so Tk image isn't collected
+                    item['size'] = pil_img.size
+                item['key'] = content_key
+                changed = True
+
+        if item['pos'] != pos:
+            self.canvas.coords(item['id'], pos[0], pos[1])
+            item['pos'] = pos
+            changed = True
+
+        return changed
+
+    def remove(self, name):
+        """Delete a single item from the canvas."""
+        item = self._items.pop(name, None)
+        if item is not None:
+            try:
+                self.canvas.delete(item['id'])
+            except Exception as e:
+                logger.debug(f"Could not delete overlay item '{name}': {e}")
+
+    def clear(self):
+        """Delete all items owned by this layer."""
+        for name in list(self._items):
+            self.remove(name)
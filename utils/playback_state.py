@@ -0,0 +1,151 @@
+"""
+Volatile playback state (the resume position), kept out of userconfig.json.
+
+The live wallpaper saved last_video_timestamp every few seconds from VLC's
+time-changed event by rewriting and re-reading the whole userconfig.json,
+and the password dialog did the same on the Tk thread. A crash in the middle
+of one of those writes could truncate the user configuration.
+
+The position now lives in config/playback_state.json next to the config:
+
+  - set() only updates memory and wakes the flusher thread; callers never
+    touch the disk,
+  - the flusher waits `flush_delay` seconds so a burst of updates becomes one
+    write, then writes a temporary file and moves it into place with
+    os.replace, so the file is always either the old or the new state,
+  - flush() writes pending state synchronously (shutdown and exit paths).
+
+Values missing from the state file fall back to userconfig.json, where older
+versions stored them.
+"""
+import atexit
+import json
+import os
+import threading
+
+from screensaver_app.central_logger import get_logger
+from utils.config_utils import config_store
+logger = get_logger('utils.playback_state')
+
+STATE_VERSION = 1
+DEFAULT_FLUSH_DELAY_SEC = 2.0
+
+
+def get_state_path():
+    """Path of the playback state file, stored next to userconfig.json."""
+    return os.path.join(os.path.dirname(config_store.path), 'playback_state.json')
+
+
+class PlaybackState:
+    def __init__(self, flush_delay=DEFAULT_FLUSH_DELAY_SEC):
+        self.flush_delay = flush_delay
+        self._cond = threading.Condition()
+        self._state = None  # Loaded lazily
+        self._dirty = False
+        self._urgent = False
+        self._write_lock = threading.Lock()  # Serialises flusher and flush() writes
+        self._thread = None
+        self.writes = 0
+
+    def _load(self):
+        if self._state is not None:
+            return
+        path = get_state_path()
+        state = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == STATE_VERSION and isinstance(data.get('state'), dict):
+                state = data['state']
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable playback state {path}: {e}")
+        self._state = state
+
+    def get(self, key, default=None):
+        """Value of `key`, falling back to userconfig.json and then `default`."""
+        with self._cond:
+            self._load()
+            if key in self._state:
+                return self._state[key]
+        return config_store.get(key, default)
+
+    def get_float(self, key, default=0.0):
+        try:
+            return float(self.get(key, default))
+        except (TypeError, ValueError):
+            return default
+
+    def set(self, key, value, urgent=False):
+        """Update `key` in memory; the flusher persists it (immediately if `urgent`)."""
+        with self._cond:
+            self._load()
+            if self._state.get(key) == value and not self._dirty:
+                return
+            self._state[key] = value
+            self._dirty = True
+            self._urgent = self._urgent or urgent
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='PlaybackStateFlush', daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty:
+                    self._cond.wait()
+                # Coalesce: let more updates arrive unless one asked to be written now
+                if not self._urgent:
+                    self._cond.wait_for(lambda: self._urgent, self.flush_delay)
+            self._write_pending()
+
+    def _write_pending(self):
+        with self._write_lock:
+            return self._write_pending_locked()
+
+    def _write_pending_locked(self):
+        with self._cond:
+            if not self._dirty:
+                return True
+            data = {'version': STATE_VERSION, 'state': dict(self._state)}
+            self._dirty = self._urgent = False
+        if self._write(data):
+            return True
+        with self._cond:
+            self._dirty = True  # Retried on the next set() or flush()
+        return False
+
+    def _write(self, data):
+        path = get_state_path()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            self.writes += 1
+            return True
+        except OSError as e:
+            logger.warning(f"Could not write playback state {path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+
+    def flush(self, timeout=None):
+        """Write any pending state now. Returns False if it could not be written in time."""
+        if not self._write_lock.acquire(timeout=-1 if timeout is None else timeout):
+            return False
+        try:
+            return self._write_pending_locked()
+        finally:
+            self._write_lock.release()
+
+
+playback_state = PlaybackState()
+atexit.register(playback_state.flush, 1.0)
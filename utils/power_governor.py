@@ -0,0 +1,234 @@
+"""
+Power-aware playback governor for the screensaver and the live wallpaper.
+
+Samples battery state, system CPU load and (where psutil exposes it) thermal
+state, and steps playback through four profiles:
+
+    full         source frame rate and resolution
+    reduced_fps  non-reference frames skipped and output capped at REDUCED_FPS
+    downscaled   additionally low-resolution decode without the loop filter
+    poster       playback paused on the current frame; the clock keeps running
+
+GovernorPolicy is a pure function of (sample, time) with hysteresis: stepping
+down uses stricter thresholds than stepping back up, and a new profile must be
+wanted continuously for a dwell time before it is applied. Sensors are any
+object with read() -> PowerSample, so the policy can be driven by
+ScriptedSensor instead of psutil:
+
+    python -m utils.power_governor
+"""
+import collections
+import threading
+import time
+
+from screensaver_app.central_logger import get_logger
+logger = get_logger('utils.power_governor')
+
+PROFILES = ('full', 'reduced_fps', 'downscaled', 'poster')
+REDUCED_FPS = 15
+DEFAULT_INTERVAL_SEC = 5.0
+DEFAULT_STOP_TIMEOUT_SEC = 2.0
+
+# VLC media options per profile; poster is applied by pausing, not with options
+PROFILE_MEDIA_OPTIONS = {
+    'full': [],
+    'reduced_fps': [':avcodec-skip-frame=1', ':video-filter=fps', f':fps-fps={REDUCED_FPS}'],
+    'downscaled': [':avcodec-skip-frame=1', ':video-filter=fps', f':fps-fps={REDUCED_FPS}',
+                   ':avcodec-lowres=1', ':avcodec-skiploopfilter=4'],
+    'poster': [],
+}
+
+PowerSample = collections.namedtuple('PowerSample', ['on_battery', 'battery_percent', 'cpu_percent', 'thermal_throttled'])
+
+
+class PsutilSensor:
+    """Reads battery, CPU and thermal state through psutil (missing sensors read as None/False)."""
+
+    def __init__(self):
+        import psutil
+        self._psutil = psutil
+        psutil.cpu_percent(interval=None)  # Prime: the first non-blocking call always returns 0.0
+
+    def read(self):
+        psutil = self._psutil
+        on_battery = None
+        battery_percent = None
+        try:
+            battery = psutil.sensors_battery()
+            if battery is not None:
+                on_battery = not battery.power_plugged
+                battery_percent = battery.percent
+        except Exception:
+            pass
+        thermal_throttled = False
+        try:
+            temperatures = getattr(psutil, 'sensors_temperatures', lambda: {})() or {}
+            thermal_throttled = any(t.high and t.current >= t.high for entries in temperatures.values() for t in entries)
+        except Exception:
+            pass
+        return PowerSample(on_battery, battery_percent, psutil.cpu_percent(interval=None), thermal_throttled)
+
+
+class ScriptedSensor:
+    """Replays a list of PowerSample values (the last one repeats), for tests and tuning."""
+
+    def __init__(self, samples):
+        self._samples = list(samples)
+        self._index = 0
+
+    def read(self):
+        sample = self._samples[min(self._index, len(self._samples) - 1)]
+        self._index += 1
+        return sample
+
+
+class GovernorPolicy:
+    """
+    Maps samples to a profile index with hysteresis.
+
+    A level is entered when its `enter` condition holds and only left (towards
+    'full') once the looser `exit` condition no longer holds. Degrading waits
+    `degrade_dwell_s`, recovering waits `recover_dwell_s` and moves one step.
+    """
+
+    def __init__(self, degrade_dwell_s=10.0, recover_dwell_s=60.0):
+        self.degrade_dwell_s = degrade_dwell_s
+        self.recover_dwell_s = recover_dwell_s
+        self.level = 0
+        self._candidate = None
+        self._candidate_since = None
+
+    @staticmethod
+    def _wanted_level(sample, battery_margin=0, cpu_margin=0):
+        on_battery = bool(sample.on_battery)
+        percent = sample.battery_percent if sample.battery_percent is not None else 100
+        cpu = sample.cpu_percent or 0
+        if (on_battery and percent <= 20 + battery_margin) or cpu >= 90 - cpu_margin:
+            return 3
+        if (on_battery and percent <= 40 + battery_margin) or cpu >= 75 - cpu_margin or sample.thermal_throttled:
+            return 2
+        if on_battery or cpu >= 60 - cpu_margin:
+            return 1
+        return 0
+
+    def update(self, sample, now):
+        """Feed one sample; returns the profile name in effect after it."""
+        enter_level = self._wanted_level(sample)
+        # Stay at a level until conditions are clearly better: 10 points of battery, 15 of CPU
+        hold_level = self._wanted_level(sample, battery_margin=10, cpu_margin=15)
+
+        if enter_level > self.level:
+            candidate, dwell = enter_level, self.degrade_dwell_s
+        elif hold_level < self.level:
+            candidate, dwell = self.level - 1, self.recover_dwell_s
+        else:
+            candidate, dwell = self.level, 0
+
+        if candidate == self.level:
+            self._candidate = self._candidate_since = None
+        elif candidate != self._candidate:
+            self._candidate, self._candidate_since = candidate, now
+        if self._candidate is not None and now - self._candidate_since >= dwell:
+            self.level = self._candidate
+            self._candidate = self._candidate_since = None
+        return PROFILES[self.level]
+
+    @property
+    def profile(self):
+        return PROFILES[self.level]
+
+
+class PowerGovernor:
+    """Samples `sensor` every `interval` seconds on a daemon thread and calls `on_change(profile)` on changes."""
+
+    def __init__(self, on_change, sensor=None, policy=None, interval=DEFAULT_INTERVAL_SEC):
+        self.on_change = on_change
+        self.sensor = sensor
+        self.policy = policy or GovernorPolicy()
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.sensor is None:
+            try:
+                self.sensor = PsutilSensor()
+            except Exception as e:
+                logger.warning(f"Power governor disabled, no sensor available: {e}")
+                return self
+        self._thread = threading.Thread(target=self._run, name='PowerGovernor', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                previous = self.policy.profile
+                sample = self.sensor.read()
+                profile = self.policy.update(sample, time.monotonic())
+                if profile != previous:
+                    logger.info(f"Playback profile {previous} -> {profile} (battery={sample.battery_percent}, "
+                                f"on_battery={sample.on_battery}, cpu={sample.cpu_percent:.0f}%)")
+                    self.on_change(profile)
+            except Exception as e:
+                logger.error(f"Power governor tick failed: {e}")
+
+    def stop(self, timeout=DEFAULT_STOP_TIMEOUT_SEC):
+        """
+        Stop sampling and wait for a profile change in progress to finish, so the
+        caller can release the player afterwards. Returns False if it is still running.
+        """
+        self._stop.set()
+        thread = self._thread
+        if thread is None or thread is threading.current_thread():
+            return True
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning(f"Power governor still applying a profile after {timeout:.1f}s")
+            return False
+        return True
+
+
+def apply_vlc_profile(profile, instance, media_list, list_player, player, video_path):
+    """
+    Apply `profile` to a running looping VLC player (media list with one item).
+
+    Frame-rate and decode options only take effect on a new input, so the media
+    is reopened at the keyframe at or before the current position with the new
+    options; later loops keep them. 'poster' pauses on the current frame.
+    """
+    from utils.keyframe_index import resume_media, replace_loop_media
+    if profile == 'poster':
+        player.set_pause(1)
+        return
+    options = PROFILE_MEDIA_OPTIONS[profile]
+    position = max(0, player.get_time()) / 1000.0
+    start_media, _start = resume_media(instance, video_path, position)
+    for option in options:
+        start_media.add_option(option)
+    replace_loop_media(media_list, start_media)
+    list_player.play_item_at_index(0)
+    loop_media = instance.media_new(video_path)
+    for option in options:
+        loop_media.add_option(option)
+    replace_loop_media(media_list, loop_media)
+
+
+def _demo():
+    """Replay a discharge/recharge trace and print profile changes (one sample per simulated 5 s)."""
+    trace = ([PowerSample(False, 100, 20, False)] * 10 + [PowerSample(True, 60, 20, False)] * 10 +
+             [PowerSample(True, 35, 30, False)] * 10 + [PowerSample(True, 42, 30, False)] * 20 +
+             [PowerSample(True, 15, 30, False)] * 10 + [PowerSample(False, 16, 30, False)] * 60)
+    sensor = ScriptedSensor(trace)
+    policy = GovernorPolicy()
+    previous = policy.profile
+    for i in range(len(trace)):
+        sample = sensor.read()
+        profile = policy.update(sample, i * DEFAULT_INTERVAL_SEC)
+        if profile != previous:
+            print(f"t={i * DEFAULT_INTERVAL_SEC:5.0f}s  {previous:>11} -> {profile:<11}  {sample}")
+            previous = profile
+
+
+if __name__ == '__main__':
+    _demo()
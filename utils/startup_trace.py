@@ -0,0 +1,114 @@
+"""
+Startup timeline tracing, from process start / lock acquisition to the first
+composited overlay frame.
+
+Enabled with the --trace-startup command-line flag. Each phase is recorded
+with monotonic timestamps and written as a Chrome trace-event JSON file
+(open it in chrome://tracing or https://ui.perfetto.dev) in the logs
+directory, and a per-phase summary is written to the log. When tracing is
+disabled every call is a cheap no-op.
+"""
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+TRACE_FLAG = '--trace-startup'
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class StartupTrace:
+    """Collects Chrome trace 'complete' (X) and 'instant' (i) events."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._origin_ns = time.perf_counter_ns()
+        self._events = []
+        self._open = {}
+        self._lock = threading.Lock()
+        self._finished = False
+
+    @property
+    def active(self):
+        """True while events are still being recorded."""
+        return self.enabled and not self._finished
+
+    def _now_us(self):
+        return (time.perf_counter_ns() - self._origin_ns) / 1000.0
+
+    def _append(self, event):
+        event.setdefault('pid', os.getpid())
+        event.setdefault('tid', threading.get_ident())
+        with self._lock:
+            if not self._finished:
+                self._events.append(event)
+
+    @contextlib.contextmanager
+    def _phase(self, name, args):
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            self._append({'name': name, 'cat': 'startup', 'ph': 'X', 'ts': start,
+                          'dur': self._now_us() - start, 'args': args})
+
+    def phase(self, name, **args):
+        """Context manager timing a named startup phase."""
+        if not self.active:
+            return _NULL_CONTEXT
+        return self._phase(name, args)
+
+    def begin(self, name):
+        """Start a phase that cannot be wrapped in a with-block (ended by end())."""
+        if self.active:
+            self._open[name] = (self._now_us(), threading.get_ident())
+
+    def end(self, name, **args):
+        started = self._open.pop(name, None) if self.enabled else None
+        if started is not None:
+            start, tid = started
+            self._append({'name': name, 'cat': 'startup', 'ph': 'X', 'ts': start,
+                          'dur': self._now_us() - start, 'tid': tid, 'args': args})
+
+    def mark(self, name, **args):
+        """Record an instant event."""
+        if self.active:
+            self._append({'name': name, 'cat': 'startup', 'ph': 'i', 's': 'p',
+                          'ts': self._now_us(), 'args': args})
+
+    def finish(self, name='first_composited_frame'):
+        """Record the final mark, write the trace file and log a summary. Only the first call has an effect."""
+        if not self.active:
+            return None
+        self.mark(name)
+        with self._lock:
+            self._finished = True
+            events = sorted(self._events, key=lambda e: e['ts'])
+
+        from screensaver_app.central_logger import get_logger, get_logs_dir
+        logger = get_logger('StartupTrace')
+        trace_path = os.path.join(get_logs_dir(), time.strftime('startup_trace_%Y%m%d_%H%M%S.json'))
+        try:
+            with open(trace_path, 'w', encoding='utf-8') as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        except OSError as e:
+            logger.warning(f"Could not write startup trace to {trace_path}: {e}")
+            trace_path = None
+
+        end_ms = events[-1]['ts'] / 1000.0 if events else 0.0
+        logger.info(f"=== Startup trace: first composited frame at +{end_ms:.1f} ms ===")
+        activation = next((e for e in reversed(events) if e['name'] == 'screensaver_activation'), None)
+        if activation is not None:
+            logger.info(f"Activation to first frame: {end_ms - activation['ts'] / 1000.0:.1f} ms")
+        for event in events:
+            if event['ph'] == 'X':
+                logger.info(f"  {event['name']:<28} {event['dur'] / 1000.0:8.1f} ms  (at +{event['ts'] / 1000.0:.1f} ms)")
+        if trace_path:
+            logger.info(f"Startup trace written to {trace_path}")
+        return trace_path
+
+
+trace = StartupTrace(enabled=TRACE_FLAG in sys.argv)
@@ -0,0 +1,166 @@
+"""
+Persistent video metadata index shared by the screensaver and the live wallpaper.
+
+Both players used to open a full cv2.VideoCapture on every start just to read
+the FPS, and asked VLC for the frame size before decoding had begun (which
+usually returns 0x0). Metadata is now probed once per file and stored in
+config/video_index.json, keyed by absolute path, size and mtime.
+"""
+import json
+import os
+import threading
+import time
+
+from screensaver_app.central_logger import get_logger
+from utils.config_utils import config_store
+logger = get_logger('utils.video_probe')
+
+INDEX_VERSION = 1
+MAX_INDEX_ENTRIES = 32
+
+# Above these limits timestamp resume and snapshot wallpaper are disabled
+RESUME_MAX_WIDTH = 1920
+RESUME_MAX_HEIGHT = 1080
+RESUME_MAX_FPS = 30
+
+_index_lock = threading.RLock()
+
+
+def get_index_path():
+    """Path of the metadata index, stored next to userconfig.json."""
+    return os.path.join(os.path.dirname(config_store.path), 'video_index.json')
+
+
+def _file_key(video_path):
+    st = os.stat(video_path)
+    return os.path.abspath(video_path), st.st_size, st.st_mtime_ns
+
+
+def _read_index():
+    path = get_index_path()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == INDEX_VERSION and isinstance(data.get('videos'), dict):
+            return data
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable video index {path}: {e}")
+    return {'version': INDEX_VERSION, 'videos': {}}
+
+
+def _write_index(data):
+    path = get_index_path()
+    videos = data['videos']
+    if len(videos) > MAX_INDEX_ENTRIES:
+        # Drop the least recently probed entries
+        keep = sorted(videos.items(), key=lambda kv: kv[1].get('probed_at', 0), reverse=True)[:MAX_INDEX_ENTRIES]
+        data['videos'] = dict(keep)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            # Compact: keyframe lists run to thousands of numbers per video
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write video index {path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _probe(video_path):
+    """Open the file once and read its stream properties."""
+    import cv2
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            return None
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
+        fps = float(cap.get(cv2.CAP_PROP_FPS) or 0.0)
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC) or 0)
+        codec = ''.join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)).strip('\x00 ') if fourcc else ''
+    finally:
+        cap.release()
+    return {
+        'width': width,
+        'height': height,
+        'fps': fps,
+        'frame_count': frame_count,
+        'duration': (frame_count / fps) if fps > 0 else 0.0,
+        'codec': codec,
+        'keyframe_interval': None,  # Filled in once a keyframe index has been built
+    }
+
+
+def get_video_metadata(video_path, probe_if_missing=True):
+    """
+    Return cached metadata for `video_path`:
+    {width, height, fps, frame_count, duration, codec, keyframe_interval}.
+
+    On a cache miss the file is probed once (unless `probe_if_missing` is
+    False) and the result stored. Returns None if the file cannot be read.
+    """
+    try:
+        abs_path, size, mtime_ns = _file_key(video_path)
+    except OSError as e:
+        logger.warning(f"Cannot stat video '{video_path}': {e}")
+        return None
+
+    with _index_lock:
+        entry = _read_index()['videos'].get(abs_path)
+    if entry and entry.get('size') == size and entry.get('mtime_ns') == mtime_ns:
+        return entry['meta']
+    if not probe_if_missing:
+        return None
+
+    try:
+        meta = _probe(video_path)
+    except Exception as e:
+        logger.warning(f"Failed to probe video '{video_path}': {e}")
+        meta = None
+    if meta is None:
+        return None
+    logger.info(f"Probed video metadata for {abs_path}: {meta['width']}x{meta['height']} @ {meta['fps']:.2f} fps, codec={meta['codec'] or 'unknown'}")
+    store_video_metadata(video_path, meta)
+    return meta
+
+
+def store_video_metadata(video_path, meta):
+    """Merge `meta` into the index entry for `video_path` (used by later probes, e.g. keyframe indexing)."""
+    try:
+        abs_path, size, mtime_ns = _file_key(video_path)
+    except OSError:
+        return
+    with _index_lock:
+        data = _read_index()
+        entry = data['videos'].get(abs_path)
+        if entry and entry.get('size') == size and entry.get('mtime_ns') == mtime_ns:
+            merged = dict(entry['meta'])
+            merged.update(meta)
+        else:
+            merged = dict(meta)
+        data['videos'][abs_path] = {
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'probed_at': time.time(),
+            'meta': merged,
+        }
+        _write_index(data)
+
+
+def within_resume_limits(meta):
+    """
+    True if timestamp resume is allowed for a video with this metadata.
+    Unknown metadata keeps the previous behaviour (VLC reported 0x0 => allowed).
+    """
+    if not meta:
+        return True
+    return (meta.get('width', 0) <= RESUME_MAX_WIDTH and
+            meta.get('height', 0) <= RESUME_MAX_HEIGHT and
+            meta.get('fps', 0) <= RESUME_MAX_FPS)
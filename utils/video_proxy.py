@@ -0,0 +1,211 @@
+"""
+Opt-in screen-resolution proxies for high-resolution or high-frame-rate videos.
+
+Videos above 1920x1080 or 30 fps cost far more to decode than the screen
+needs, and disable timestamp resume and the snapshot wallpaper. With
+`video_proxy_enabled` set, the configured video is transcoded once with
+cv2.VideoWriter, in a low-priority background process, to a proxy that fits
+the screen (capped at 1920x1080) at no more than 30 fps. Proxies live in
+config/cache/proxies, bounded by `video_proxy_cache_mb`. Both players call
+resolve_playback_path() and switch to the proxy once it is complete.
+
+The proxy keeps the source timeline (frames are dropped, not retimed), so
+last_video_timestamp is valid for both files.
+
+Run as a module to transcode one file:
+    python -m utils.video_proxy SRC DST WIDTH HEIGHT FPS [CACHE_MB]
+"""
+import hashlib
+import os
+import subprocess
+import sys
+import threading
+
+from screensaver_app.central_logger import get_logger
+from utils.config_utils import get_cache_dir
+from utils.video_probe import get_video_metadata, RESUME_MAX_WIDTH, RESUME_MAX_HEIGHT, RESUME_MAX_FPS
+logger = get_logger('utils.video_proxy')
+
+PROXY_FORMAT_VERSION = 1
+DEFAULT_CACHE_MB = 4096
+PROXY_EXTENSION = '.mp4'
+PARTIAL_SUFFIX = '.part' + PROXY_EXTENSION  # OpenCV picks the container from the extension
+FOURCC_CANDIDATES = ('avc1', 'mp4v')  # H.264 when OpenCV has an encoder for it, MPEG-4 Part 2 otherwise
+
+_jobs = {}  # proxy path -> Popen or Thread
+_jobs_lock = threading.Lock()
+
+
+def needs_proxy(meta):
+    """True if a video with this metadata is above the resolution/fps the players handle well."""
+    if not meta:
+        return False
+    return (meta.get('width', 0) > RESUME_MAX_WIDTH or
+            meta.get('height', 0) > RESUME_MAX_HEIGHT or
+            meta.get('fps', 0) > RESUME_MAX_FPS + 0.5)
+
+
+def proxy_geometry(meta, screen_width, screen_height):
+    """(width, height, fps) of the proxy: fit within the screen and 1080p, keep aspect, even sizes."""
+    max_w = min(screen_width or RESUME_MAX_WIDTH, RESUME_MAX_WIDTH)
+    max_h = min(screen_height or RESUME_MAX_HEIGHT, RESUME_MAX_HEIGHT)
+    src_w, src_h = meta['width'], meta['height']
+    scale = min(1.0, max_w / src_w, max_h / src_h)
+    width = max(2, int(src_w * scale) // 2 * 2)
+    height = max(2, int(src_h * scale) // 2 * 2)
+    fps = min(meta.get('fps') or RESUME_MAX_FPS, RESUME_MAX_FPS)
+    return width, height, fps
+
+
+def proxy_path_for(video_path, width, height, fps):
+    st = os.stat(video_path)
+    key = f"{PROXY_FORMAT_VERSION}|{os.path.abspath(video_path)}|{st.st_mtime_ns}|{st.st_size}|{width}x{height}@{fps:.3f}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+    return os.path.join(get_cache_dir('proxies'), f"{digest}_{width}x{height}_{round(fps)}{PROXY_EXTENSION}")
+
+
+def resolve_playback_path(video_path, config, screen_width, screen_height):
+    """
+    Return the path the players should open: the finished proxy for `video_path`
+    if there is one, otherwise `video_path` itself. When proxies are enabled and
+    the video needs one, a background transcode is started if not already running.
+    """
+    if not config.get('video_proxy_enabled', False):
+        return video_path
+    try:
+        meta = get_video_metadata(video_path)
+        if not needs_proxy(meta):
+            return video_path
+        width, height, fps = proxy_geometry(meta, screen_width, screen_height)
+        proxy_path = proxy_path_for(video_path, width, height, fps)
+    except Exception as e:
+        logger.warning(f"Could not resolve a proxy for '{video_path}': {e}")
+        return video_path
+
+    if os.path.exists(proxy_path):
+        try:
+            os.utime(proxy_path)  # Most recently used survives pruning
+        except OSError:
+            pass
+        logger.info(f"Playing proxy {proxy_path} ({width}x{height} @ {fps:.0f} fps) for {video_path}")
+        return proxy_path
+
+    _start_transcode(video_path, proxy_path, width, height, fps,
+                     config.get('video_proxy_cache_mb', DEFAULT_CACHE_MB))
+    return video_path
+
+
+def _start_transcode(video_path, proxy_path, width, height, fps, cache_mb):
+    with _jobs_lock:
+        job = _jobs.get(proxy_path)
+        if job is not None and (job.poll() is None if isinstance(job, subprocess.Popen) else job.is_alive()):
+            return
+        args = [video_path, proxy_path, str(width), str(height), f"{fps:.3f}"]
+        if getattr(sys, 'frozen', False):
+            # A frozen build cannot run `-m`; cv2 releases the GIL while encoding, so a thread is acceptable
+            job = threading.Thread(target=_transcode_and_prune, args=(video_path, proxy_path, width, height, fps, cache_mb),
+                                   name='VideoProxy', daemon=True)
+            job.start()
+        else:
+            creationflags = 0
+            if sys.platform == 'win32':
+                creationflags = subprocess.BELOW_NORMAL_PRIORITY_CLASS | subprocess.CREATE_NO_WINDOW
+            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            job = subprocess.Popen(
+                [sys.executable, '-m', 'utils.video_proxy', *args, str(cache_mb)],
+                cwd=project_root,
+                creationflags=creationflags,
+                preexec_fn=(lambda: os.nice(10)) if sys.platform != 'win32' else None,
+            )
+        _jobs[proxy_path] = job
+    logger.info(f"Started background proxy transcode of {video_path} to {width}x{height} @ {fps:.0f} fps")
+
+
+def transcode(video_path, proxy_path, width, height, fps):
+    """Transcode `video_path` to `proxy_path`, dropping frames to cap the rate at `fps`. Returns True on success."""
+    import cv2
+    partial_path = os.path.splitext(proxy_path)[0] + PARTIAL_SUFFIX
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        logger.error(f"Cannot open '{video_path}' for proxy transcoding")
+        return False
+    writer = None
+    try:
+        for fourcc in FOURCC_CANDIDATES:
+            writer = cv2.VideoWriter(partial_path, cv2.VideoWriter_fourcc(*fourcc), fps, (width, height))
+            if writer.isOpened():
+                break
+            writer.release()
+            writer = None
+        if writer is None:
+            logger.error("No usable OpenCV video encoder for proxy transcoding")
+            return False
+
+        src_fps = cap.get(cv2.CAP_PROP_FPS) or fps
+        step = src_fps / fps  # Source frames per proxy frame (>= 1)
+        next_keep = 0.0
+        index = 0
+        written = 0
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            if index + 1e-6 >= next_keep:
+                if frame.shape[1] != width or frame.shape[0] != height:
+                    frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+                writer.write(frame)
+                written += 1
+                next_keep += step
+            index += 1
+    finally:
+        cap.release()
+        if writer is not None:
+            writer.release()
+
+    if written == 0:
+        logger.error(f"Proxy transcode of '{video_path}' produced no frames")
+        return False
+    os.replace(partial_path, proxy_path)
+    logger.info(f"Proxy ready: {proxy_path} ({written} frames)")
+    return True
+
+
+def prune_cache(cache_mb, keep=None):
+    """Delete least recently used proxies until the cache is within `cache_mb`."""
+    cache_dir = get_cache_dir('proxies')
+    budget = int(cache_mb) * 1024 * 1024
+    try:
+        entries = [os.path.join(cache_dir, f) for f in os.listdir(cache_dir)
+                   if f.endswith(PROXY_EXTENSION) and not f.endswith(PARTIAL_SUFFIX)]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        total = 0
+        for path in entries:
+            size = os.path.getsize(path)
+            total += size
+            if total > budget and path != keep:
+                os.remove(path)
+                total -= size
+                logger.info(f"Pruned proxy {path} to stay within {cache_mb} MB")
+    except OSError as e:
+        logger.debug(f"Proxy cache prune skipped: {e}")
+
+
+def _transcode_and_prune(video_path, proxy_path, width, height, fps, cache_mb):
+    try:
+        if transcode(video_path, proxy_path, width, height, fps):
+            prune_cache(cache_mb, keep=proxy_path)
+    except Exception as e:
+        logger.error(f"Proxy transcode failed for '{video_path}': {e}")
+    finally:
+        partial = os.path.splitext(proxy_path)[0] + PARTIAL_SUFFIX
+        if os.path.exists(partial):
+            try:
+                os.remove(partial)
+            except OSError:
+                pass
+
+
+if __name__ == '__main__':
+    src, dst, w, h, rate = sys.argv[1:6]
+    budget_mb = int(sys.argv[6]) if len(sys.argv) > 6 else DEFAULT_CACHE_MB
+    _transcode_and_prune(src, dst, int(w), int(h), float(rate), budget_mb)